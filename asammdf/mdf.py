@@ -6,7 +6,7 @@ import os
 
 from .mdf3 import MDF3
 from .mdf4 import MDF4
-from .signal import Signal
+from .utils import DATA_CACHE_SIZE
 from .v3constants import CHANNEL_TYPE_MASTER as V3_MASTER
 from .v4constants import CHANNEL_TYPE_MASTER as V4_MASTER
 from .v4constants import CHANNEL_TYPE_VIRTUAL_MASTER as V4_VIRTUAL_MASTER
@@ -33,25 +33,42 @@ class MDF(object):
         * if *False* the channel data is read from disk on request
 
     compression : bool
-        compression option for data group binary data block; default *False*
+        compression option for data group binary data block; the data is
+        compressed in independent chunks of records so time range reads only
+        decompress the chunks they need; default *False*
     version : string
         mdf file version ('3.00', '3.10', '3.20', '3.30', '4.00', '4.10', '4.11'); default '3.20'
+    use_index : bool
+        keep the parsed metadata in a sidecar index file (*name* + '.idx') and
+        reuse it when the file is opened again; the index is rebuilt if the
+        file was modified; default *False*
+    lazy_metadata : bool
+        only used for mdf version 4 files: read the channel conversion,
+        source and text blocks on first access instead of at file open;
+        default *False*
+    memory_map : bool
+        only used if *load_measured_data* is *False*: keep the file memory
+        mapped and return the channels of contiguous data blocks as read-only
+        zero-copy views into the file; default *False*
+    data_cache_size : int
+        only used if *compression* is *True*: byte budget of the least
+        recently used cache of decompressed data blocks; default 256MB
 
     """
-    def __init__(self, name=None, load_measured_data=True, compression=False, version='3.20'):
+    def __init__(self, name=None, load_measured_data=True, compression=False, version='3.20', use_index=False, lazy_metadata=False, memory_map=False, data_cache_size=DATA_CACHE_SIZE):
         if name and os.path.isfile(name):
             with open(name, 'rb') as file_stream:
                 file_stream.read(8)
                 version = file_stream.read(4).decode('ascii')
             if version in MDF3_VERSIONS:
-                self.file = MDF3(name, load_measured_data, compression=compression)
+                self.file = MDF3(name, load_measured_data, compression=compression, use_index=use_index, memory_map=memory_map, data_cache_size=data_cache_size)
             elif version in MDF4_VERSIONS:
-                self.file = MDF4(name, load_measured_data, compression=compression)
+                self.file = MDF4(name, load_measured_data, compression=compression, use_index=use_index, lazy_metadata=lazy_metadata, memory_map=memory_map, data_cache_size=data_cache_size)
         else:
             if version in MDF3_VERSIONS:
-                self.file = MDF3(name, compression=compression, version=version)
+                self.file = MDF3(name, compression=compression, version=version, data_cache_size=data_cache_size)
             elif version in MDF4_VERSIONS:
-                self.file = MDF4(name, compression=compression, version=version)
+                self.file = MDF4(name, compression=compression, version=version, data_cache_size=data_cache_size)
 
     def __setattr__(self, attr, value):
         if attr == 'file':
@@ -65,6 +82,24 @@ class MDF(object):
         else:
             return getattr(self.file, attr)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ release the file handle kept by the underlying MDF3 or MDF4
+        object
+
+        Examples
+        --------
+        >>> with MDF('test.mf4', load_measured_data=False) as mdf:
+        ...     s = mdf.get('Speed')
+
+        """
+        self.file.close()
+
     def convert(self, to, compression=False):
         """convert MDF to other versions
 
@@ -91,16 +126,9 @@ class MDF(object):
             else:
                 master_type = (V4_MASTER, V4_VIRTUAL_MASTER)
             for i, gp in enumerate(self.groups):
-                sigs = []
-                t = self.get_master_data(group=i)
-                for j, ch in enumerate(gp['channels']):
-                    if not ch['channel_type'] in master_type:
-                        vals, name, conversion, unit = self.get_channel_data(group=i, index=j, return_info=True)
-                        sigs.append(Signal(samples=vals,
-                                           timestamps=t,
-                                           unit=unit,
-                                           name=name,
-                                           conversion=conversion))
+                # the group data is decoded only once for all its channels
+                sigs = self.select([(i, j) for j, ch in enumerate(gp['channels'])
+                                    if not ch['channel_type'] in master_type])
                 out.append(sigs, 'Converted from {} to {}'.format(self.version, to))
             return out
 
@@ -7,19 +7,24 @@ import sys
 PYVERSION = sys.version_info[0]
 
 import os
+import threading
 import time
 import warnings
 
-from collections import defaultdict
+from collections import OrderedDict
 from functools import reduce
 
-from numpy import (interp, linspace, dtype, amin, amax, array_equal,
-                   array, searchsorted, log, exp, clip, union1d, float64,
-                   uint8, frombuffer)
-from numpy.core.records import fromstring, fromarrays
-from numexpr import evaluate
-
-from .utils import MdfException, get_fmt, pair, fmt_to_datatype
+from numpy import (linspace, dtype, amin, amax, array_equal,
+                   array, union1d, float64,
+                   uint8, frombuffer, ndarray)
+from numpy.core.records import fromarrays
+
+from .utils import (MdfException, get_fmt, pair, fmt_to_datatype, map_file,
+                    get_index_key, load_index, save_index, split_records,
+                    get_record_offsets, gather_records, shift_mask,
+                    get_bitfield_values, get_packed_values, RecordLayout,
+                    FileReader, MASTER_CACHE_SIZE,
+                    DataCache, DATA_CACHE_SIZE, search_records)
 from .signal import Signal
 from .v3constants import *
 from .v3blocks import (Channel, ChannelConversion, ChannelDependency,
@@ -49,9 +54,22 @@ class MDF3(object):
         * if *False* the channel data is read from disk on request
 
     compression : bool
-        compression option for data group binary data block; default *False*
+        compression option for data group binary data block; the data is
+        compressed in independent chunks of records so time range reads only
+        decompress the chunks they need; default *False*
     version : string
         mdf file version ('3.00', '3.10', '3.20' or '3.30'); default '3.20'
+    use_index : bool
+        keep the parsed metadata in a sidecar index file (*name* + '.idx') and
+        reuse it when the file is opened again; the index is rebuilt if the
+        file was modified; default *False*
+    memory_map : bool
+        only used if *load_measured_data* is *False*; the file is kept memory
+        mapped and the channels of contiguous data blocks are returned as
+        read-only zero-copy views into the file; default *False*
+    data_cache_size : int
+        only used if *compression* is *True*; byte budget of the least
+        recently used cache of decompressed data blocks; default 256MB
 
     Attributes
     ----------
@@ -67,6 +85,13 @@ class MDF3(object):
         load measured data option
     compression : bool
         measured data compression option
+    use_index : bool
+        sidecar index option
+    memory_map : bool
+        memory mapped data option
+    data_cache : DataCache
+        decompressed data cache; *data_cache.stats()* returns the cache hit
+        and miss statistics
     version : int
         mdf version
     channels_db : dict
@@ -75,7 +100,7 @@ class MDF3(object):
         used for fast master channel access; for each group index key the value is the master channel index
 
     """
-    def __init__(self, name=None, load_measured_data=True, compression=False, version='3.20'):
+    def __init__(self, name=None, load_measured_data=True, compression=False, version='3.20', use_index=False, memory_map=False, data_cache_size=DATA_CACHE_SIZE):
         self.groups = []
         self.header = None
         self.identification = None
@@ -83,8 +108,16 @@ class MDF3(object):
         self.name = name
         self.load_measured_data = load_measured_data
         self.compression = compression
+        self.use_index = use_index
+        self.memory_map = memory_map
         self.channels_db = {}
         self.masters_db = {}
+        self._block_cache = {}
+        self._mapped = None
+        self._file = None
+        self._master_channel_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.data_cache = DataCache(data_cache_size)
 
         if name and os.path.isfile(name):
             self._read()
@@ -99,172 +132,453 @@ class MDF3(object):
 
     def _read(self):
         with open(self.name, 'rb') as file_stream:
+            # the memory map is kept for the channel data requests in the
+            # memory mapped data mode
+            keep_mapped = self.memory_map and not self.load_measured_data
+            data_groups = None
+            mapped = None
+            if self.use_index:
+                index_key = get_index_key(self.name,
+                                          load_measured_data=self.load_measured_data,
+                                          compression=self.compression,
+                                          memory_map=self.memory_map)
+                state = load_index(self.name, index_key)
+                if state is not None:
+                    data_groups = self._set_index_state(state)
+                    if keep_mapped:
+                        mapped = map_file(file_stream)
+
+            if data_groups is None:
+                # the metadata blocks are parsed directly from a memory map of the
+                # file; fall back to the file handle if the file cannot be mapped
+                stream_kargs = {'file_stream': file_stream}
+                mapped = map_file(file_stream)
+                if mapped is not None:
+                    stream_kargs['buffer'] = mapped
+                try:
+                    data_groups = self._read_blocks(stream_kargs)
+                    if not self.load_measured_data:
+                        # unsorted data groups are scanned once to build the
+                        # record offsets of each channel group
+                        for gp, new_groups in data_groups:
+                            if len(new_groups) > 1:
+                                self._index_data_group(stream_kargs, gp, new_groups)
+                finally:
+                    self._block_cache = {}
+                    if mapped is not None and not keep_mapped:
+                        mapped.close()
+                        mapped = None
+
+                if self.use_index:
+                    save_index(self.name, index_key, self._get_index_state(data_groups))
+
+            for gp, new_groups in data_groups:
+                if self.load_measured_data:
+                    self._read_data_group(file_stream, gp, new_groups)
+                for grp in new_groups:
+                    grp['record_layout'] = self._get_record_layout(grp)
+                self.groups.extend(new_groups)
 
-            # performance optimization
-            read = file_stream.read
-            seek = file_stream.seek
-
-            dg_cntr = 0
-            seek(0, SEEK_START)
-
-            self.identification = FileIdentificationBlock(file_stream=file_stream)
-            self.header = HeaderBlock(file_stream=file_stream)
-
-            self.byteorder = '<' if self.identification['byte_order'] == 0 else '>'
-
-            self.version = self.identification['version_str'].decode('latin-1').strip('\x00').strip(' ')
-
-            self.file_history = TextBlock(address=self.header['comment_addr'], file_stream=file_stream)
-
-            # go to first date group
-            dg_addr = self.header['first_dg_addr']
-            # read each data group sequentially
-            while dg_addr:
-                gp = DataGroup(address=dg_addr, file_stream=file_stream)
-                cg_nr = gp['cg_nr']
-                cg_addr = gp['first_cg_addr']
-                data_addr = gp['data_block_addr']
-                new_groups = []
-                for i in range(cg_nr):
-
-                    new_groups.append({})
-                    grp = new_groups[-1]
-                    grp['channels'] = []
-                    grp['channel_conversions'] = []
-                    grp['channel_extensions'] = []
-                    grp['data_block'] = []
-                    grp['texts'] = {'channels': [], 'conversion_tab': [], 'channel_group': []}
-
-                    kargs = {'first_cg_addr': cg_addr,
-                             'data_block_addr': data_addr}
-                    if self.version in ('3.20', '3.30'):
-                        kargs['block_len'] = DG32_BLOCK_SIZE
-                    else:
-                        kargs['block_len'] = DG31_BLOCK_SIZE
+            self._mapped = mapped
 
-                    grp['data_group'] = DataGroup(**kargs)
+        if not self.load_measured_data:
+            # the file is kept open for the channel data requests; use *close*
+            # or the context manager to release it
+            self._file = open(self.name, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # objects that are not closed release the kept file handle and
+        # memory map when they are garbage collected
+        if getattr(self, '_file', None) is not None or getattr(self, '_mapped', None) is not None:
+            self.close()
+
+    def close(self):
+        """ release the file handle and the memory map kept for the channel
+        data requests when the file was opened with *load_measured_data*
+        *False*; the channel data cannot be read after the file is closed """
+        if self._mapped is not None:
+            if PYVERSION == 3:
+                try:
+                    self._mapped.close()
+                except BufferError:
+                    # zero-copy channel views still reference the memory map;
+                    # it is released with the last of them
+                    pass
+            self._mapped = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
+
+    def _file_reader(self):
+        """ file like object for positional reads from the kept file handle """
+        if self._file is None:
+            raise MdfException('The file "{}" is closed'.format(self.name))
+        return FileReader(self._file, self._lock)
+
+    def _get_index_state(self, data_groups):
+        """ metadata that is stored in the sidecar index file """
+        return {'identification': self.identification,
+                'header': self.header,
+                'file_history': self.file_history,
+                'version': self.version,
+                'byteorder': self.byteorder,
+                'channels_db': self.channels_db,
+                'masters_db': self.masters_db,
+                'data_groups': data_groups}
+
+    def _set_index_state(self, state):
+        """ restore the metadata loaded from the sidecar index file """
+        self.identification = state['identification']
+        self.header = state['header']
+        self.file_history = state['file_history']
+        self.version = state['version']
+        self.byteorder = state['byteorder']
+        self.channels_db = state['channels_db']
+        self.masters_db = state['masters_db']
+        return state['data_groups']
+
+    def _get_block(self, cls, address, stream_kargs):
+        """ read the block at *address* only once; conversion, source and
+        text blocks are usually shared by many channels and the same object
+        is returned for every reference """
+        try:
+            return self._block_cache[address]
+        except KeyError:
+            block = self._block_cache[address] = cls(address=address, **stream_kargs)
+            return block
+
+    def _read_blocks(self, stream_kargs):
+        """ parse the metadata blocks
 
-                    # read each channel group sequentially
-                    grp['channel_group'] = ChannelGroup(address=cg_addr, file_stream=file_stream)
+        Returns
+        -------
+        data_groups : list
+            (data group block, list of groups) pair for each data group
+            found in the file
 
-                    # read acquisition name and comment for current channel group
-                    grp['texts']['channel_group'].append({})
+        """
+        data_groups = []
+        dg_cntr = 0
+
+        self.identification = FileIdentificationBlock(**stream_kargs)
+        self.header = HeaderBlock(**stream_kargs)
+
+        self.byteorder = '<' if self.identification['byte_order'] == 0 else '>'
+
+        self.version = self.identification['version_str'].decode('latin-1').strip('\x00').strip(' ')
+
+        self.file_history = TextBlock(address=self.header['comment_addr'], **stream_kargs)
+
+        # go to first date group
+        dg_addr = self.header['first_dg_addr']
+        # read each data group sequentially
+        while dg_addr:
+            gp = DataGroup(address=dg_addr, **stream_kargs)
+            cg_nr = gp['cg_nr']
+            cg_addr = gp['first_cg_addr']
+            data_addr = gp['data_block_addr']
+            new_groups = []
+            for i in range(cg_nr):
+
+                new_groups.append({})
+                grp = new_groups[-1]
+                grp['channels'] = []
+                grp['channel_conversions'] = []
+                grp['channel_extensions'] = []
+                grp['data_block'] = []
+                grp['texts'] = {'channels': [], 'conversion_tab': [], 'channel_group': []}
+
+                kargs = {'first_cg_addr': cg_addr,
+                         'data_block_addr': data_addr}
+                if self.version in ('3.20', '3.30'):
+                    kargs['block_len'] = DG32_BLOCK_SIZE
+                else:
+                    kargs['block_len'] = DG31_BLOCK_SIZE
 
-                    address = grp['channel_group']['comment_addr']
-                    if address:
-                        grp['texts']['channel_group'][-1]['comment_addr'] = TextBlock(address=address, file_stream=file_stream)
-
-                    # go to first channel of the current channel group
-                    ch_addr = grp['channel_group']['first_ch_addr']
-                    ch_cntr = 0
-                    grp_chs = grp['channels']
-                    grp_conv = grp['channel_conversions']
-                    grp_ch_texts = grp['texts']['channels']
-                    while ch_addr:
-                        # read channel block and create channel object
-                        new_ch = Channel(address=ch_addr, file_stream=file_stream)
-
-                        # read conversion block and create channel conversion object
-                        address = new_ch['conversion_addr']
-                        if address:
-                            new_conv = ChannelConversion(address=address, file_stream=file_stream)
-                            grp_conv.append(new_conv)
-                        else:
-                            new_conv = None
-                            grp_conv.append(None)
+                grp['data_group'] = DataGroup(**kargs)
+
+                # read each channel group sequentially
+                grp['channel_group'] = ChannelGroup(address=cg_addr, **stream_kargs)
 
-                        vtab_texts = {}
-                        if new_conv and new_conv['conversion_type'] == CONVERSION_TYPE_VTABR:
-                            for idx in range(new_conv['ref_param_nr']):
-                                address = new_conv['text_{}'.format(idx)]
-                                if address:
-                                    vtab_texts['text_{}'.format(idx)] = TextBlock(address=address, file_stream=file_stream)
-                        grp['texts']['conversion_tab'].append(vtab_texts)
+                # read acquisition name and comment for current channel group
+                grp['texts']['channel_group'].append({})
 
+                address = grp['channel_group']['comment_addr']
+                if address:
+                    grp['texts']['channel_group'][-1]['comment_addr'] = TextBlock(address=address, **stream_kargs)
 
-                        if self.load_measured_data:
-                            # read source block and create source infromation object
-                            address = new_ch['source_depend_addr']
+                # go to first channel of the current channel group
+                ch_addr = grp['channel_group']['first_ch_addr']
+                ch_cntr = 0
+                grp_chs = grp['channels']
+                grp_conv = grp['channel_conversions']
+                grp_ch_texts = grp['texts']['channels']
+                while ch_addr:
+                    # read channel block and create channel object
+                    new_ch = Channel(address=ch_addr, **stream_kargs)
+
+                    # read conversion block and create channel conversion object
+                    address = new_ch['conversion_addr']
+                    if address:
+                        new_conv = self._get_block(ChannelConversion, address, stream_kargs)
+                        grp_conv.append(new_conv)
+                    else:
+                        new_conv = None
+                        grp_conv.append(None)
+
+                    vtab_texts = {}
+                    if new_conv and new_conv['conversion_type'] == CONVERSION_TYPE_VTABR:
+                        for idx in range(new_conv['ref_param_nr']):
+                            address = new_conv['text_{}'.format(idx)]
                             if address:
-                                grp['channel_extensions'].append(ChannelExtension(address=address, file_stream=file_stream))
-                            else:
-                                grp['channel_extensions'].append(None)
+                                vtab_texts['text_{}'.format(idx)] = self._get_block(TextBlock, address, stream_kargs)
+                    grp['texts']['conversion_tab'].append(vtab_texts)
+
+
+                    if self.load_measured_data:
+                        # read source block and create source infromation object
+                        address = new_ch['source_depend_addr']
+                        if address:
+                            grp['channel_extensions'].append(self._get_block(ChannelExtension, address, stream_kargs))
                         else:
                             grp['channel_extensions'].append(None)
+                    else:
+                        grp['channel_extensions'].append(None)
 
-                        # read text fields for channel
-                        ch_texts = {}
-                        for key in ('long_name_addr', 'comment_addr', 'display_name_addr'):
-                            address = new_ch[key]
-                            if address:
-                                ch_texts[key] = TextBlock(address=address, file_stream=file_stream)
-                        grp_ch_texts.append(ch_texts)
+                    # read text fields for channel
+                    ch_texts = {}
+                    for key in ('long_name_addr', 'comment_addr', 'display_name_addr'):
+                        address = new_ch[key]
+                        if address:
+                            ch_texts[key] = self._get_block(TextBlock, address, stream_kargs)
+                    grp_ch_texts.append(ch_texts)
 
-                        # update channel object name and block_size attributes
-                        if new_ch['long_name_addr']:
-                            new_ch.name = ch_texts['long_name_addr'].text_str
-                        else:
-                            new_ch.name = new_ch['short_name'].decode('latin-1').strip('\x00')
+                    # update channel object name and block_size attributes
+                    if new_ch['long_name_addr']:
+                        new_ch.name = ch_texts['long_name_addr'].text_str
+                    else:
+                        new_ch.name = new_ch['short_name'].decode('latin-1').strip('\x00')
+
+                    self.channels_db[new_ch.name] = (dg_cntr, ch_cntr)
+                    if new_ch['channel_type'] == CHANNEL_TYPE_MASTER:
+                        self.masters_db[dg_cntr] = ch_cntr
+                    # go to next channel of the current channel group
+                    ch_addr = new_ch['next_ch_addr']
+                    ch_cntr += 1
+                    grp_chs.append(new_ch)
+
+                cg_addr = grp['channel_group']['next_cg_addr']
+                dg_cntr += 1
+
+            data_groups.append((gp, new_groups))
+
+            # go to next data group
+            dg_addr = gp['next_dg_addr']
+
+        return data_groups
+
+    def _get_record_sizes(self, gp, new_groups):
+        """ data block size and record size of each record id of a data group """
+        size = 0
+        record_id_nr = gp['record_id_nr'] if gp['record_id_nr'] <= 2 else 0
+
+        cg_size = {}
+        for grp in new_groups:
+            size += (grp['channel_group']['samples_byte_nr'] + record_id_nr) * grp['channel_group']['cycles_nr']
+            cg_size[grp['channel_group']['record_id']] = grp['channel_group']['samples_byte_nr']
+
+        return size, cg_size
+
+    def _index_data_group(self, stream_kargs, gp, new_groups):
+        """ store the record offsets of each channel group of an unsorted
+        data group in the *record_offsets* key of the groups """
+        size, cg_size = self._get_record_sizes(gp, new_groups)
+        dat_addr = gp['data_block_addr']
+        if not dat_addr:
+            size = 0
+
+        if 'buffer' in stream_kargs:
+            data = stream_kargs['buffer']
+            offset = dat_addr
+            size = min(size, len(data) - dat_addr)
+        else:
+            file_stream = stream_kargs['file_stream']
+            file_stream.seek(dat_addr, SEEK_START)
+            data = file_stream.read(size)
+            offset = 0
+            size = len(data)
+
+        # if 2 record id's are used the record id is repeated after each record
+        offsets = get_record_offsets(data,
+                                     cg_size,
+                                     trailing_record_id=gp['record_id_nr'] == 2,
+                                     offset=offset,
+                                     size=size)
+        for grp in new_groups:
+            grp['record_offsets'] = offsets[grp['channel_group']['record_id']]
+
+    def _load_group_data(self, gp):
+        """ get the raw data of a group; the data is read from disk if the
+        measured data was not loaded at file open
 
-                        self.channels_db[new_ch.name] = (dg_cntr, ch_cntr)
-                        if new_ch['channel_type'] == CHANNEL_TYPE_MASTER:
-                            self.masters_db[dg_cntr] = ch_cntr
-                        # go to next channel of the current channel group
-                        ch_addr = new_ch['next_ch_addr']
-                        ch_cntr += 1
-                        grp_chs.append(new_ch)
+        Parameters
+        ----------
+        gp : dict
+            group
 
-                    cg_addr = grp['channel_group']['next_cg_addr']
-                    dg_cntr += 1
+        Returns
+        -------
+        data : bytes | numpy.array
+            group raw data; in the memory mapped data mode the data of sorted
+            groups is a read-only uint8 view into the file memory map
 
-                    if cg_addr and self.load_measured_data == False:
-                        raise MdfException('Reading unsorted file with load_measured_data option set to False is not supported')
+        """
+        if self.load_measured_data:
+            block = gp['data_block']
+            if not block:
+                return b''
+            elif block.compression:
+                # the compressed bytes object identifies the cached data; it
+                # changes if the block data is replaced
+                compressed = dict.__getitem__(block, 'data')
+                return self.data_cache.get(id(block), compressed, lambda: block['data'])
+            else:
+                return block['data']
+
+        dat_addr = gp['data_group']['data_block_addr']
+        mapped = self._mapped
+        if mapped is not None:
+            if 'record_offsets' in gp:
+                offsets = gp['record_offsets']
+                if not len(offsets):
+                    return b''
+                return gather_records(mapped, offsets, gp['channel_group']['samples_byte_nr'], dat_addr)
+            elif dat_addr:
+                read_size = gp['channel_group']['samples_byte_nr'] * gp['channel_group']['cycles_nr']
+                read_size = max(0, min(read_size, len(mapped) - dat_addr))
+                return frombuffer(mapped, dtype=uint8, count=read_size, offset=dat_addr)
+            else:
+                return b''
+
+        file_stream = self._file_reader()
+        if 'record_offsets' in gp:
+            # unsorted data group: gather the records of this group
+            offsets = gp['record_offsets']
+            record_size = gp['channel_group']['samples_byte_nr']
+            if not len(offsets):
+                return b''
+            mapped = map_file(file_stream)
+            if mapped is not None:
+                try:
+                    return gather_records(mapped, offsets, record_size, dat_addr)
+                finally:
+                    mapped.close()
+            else:
+                file_stream.seek(dat_addr, SEEK_START)
+                data = file_stream.read(int(offsets[-1]) + record_size)
+                return gather_records(data, offsets, record_size)
+        else:
+            # go to the first data block of the current data group
+            read_size = gp['channel_group']['samples_byte_nr'] * gp['channel_group']['cycles_nr']
+            return DataBlock(file_stream=file_stream, address=dat_addr, size=read_size)['data']
 
-                if self.load_measured_data:
-                    size = 0
-                    record_id_nr = gp['record_id_nr'] if gp['record_id_nr'] <= 2 else 0
-
-                    cg_size = {}
-                    cg_data = defaultdict(list)
-                    for grp in new_groups:
-                        size += (grp['channel_group']['samples_byte_nr'] + record_id_nr) * grp['channel_group']['cycles_nr']
-                        cg_size[grp['channel_group']['record_id']] = grp['channel_group']['samples_byte_nr']
-
-                    # read data block of the current data group
-                    dat_addr = gp['data_block_addr']
-                    if dat_addr:
-                        seek(dat_addr, SEEK_START)
-                        data = read(size)
-                    else:
-                        data = b''
-                    if cg_nr == 1:
-                        kargs = {'data': data, 'compression': self.compression}
-                        new_groups[0]['data_block'] = DataBlock(**kargs)
-                    else:
-                        i = 0
-                        size = len(data)
-                        while i < size:
-                            rec_id = data[i]
-                            # skip redord id
-                            i += 1
-                            rec_size = cg_size[rec_id]
-                            rec_data = data[i: i+rec_size]
-                            cg_data[rec_id].append(rec_data)
-                            # if 2 record id's are sued skip also the second one
-                            if record_id_nr == 2:
-                                i += 1
-                            # go to next record
-                            i += rec_size
-                        for grp in new_groups:
-                            kargs = {}
-                            kargs['data'] = b''.join(cg_data[grp['channel_group']['record_id']])
-                            kargs['compression'] = self.compression
-                            grp['channel_group']['record_id'] = 1
-                            grp['data_block'] = DataBlock(**kargs)
-                self.groups.extend(new_groups)
+    def _load_group_records(self, gp, start=0, stop=None):
+        """ get the raw data of the records *start* to *stop* of a group; if
+        the measured data was not loaded at file open only these records are
+        read from disk
 
-                # go to next data group
-                dg_addr = gp['next_dg_addr']
+        Parameters
+        ----------
+        gp : dict
+            group
+        start : int
+            index of the first record
+        stop : int
+            index of the last record (exclusive); default *None* means up to
+            the last record
+
+        Returns
+        -------
+        data : bytes | numpy.array
+            records raw data
+
+        """
+        record_size = gp['channel_group']['samples_byte_nr']
+        begin = start * record_size
+        end = None if stop is None else stop * record_size
+
+        if self.load_measured_data:
+            block = gp['data_block']
+            if block and block.compression:
+                # only the chunks that hold the records are decompressed
+                return block.get_data(begin, end, cache=self.data_cache)
+            return self._load_group_data(gp)[begin: end]
+
+        dat_addr = gp['data_group']['data_block_addr']
+        mapped = self._mapped
+        if 'record_offsets' in gp:
+            # unsorted data group: read the span of the selected records
+            offsets = gp['record_offsets'][start: stop]
+            if not len(offsets):
+                return b''
+            if mapped is not None:
+                return gather_records(mapped, offsets, record_size, dat_addr)
+            first = int(offsets[0])
+            file_stream = self._file_reader()
+            file_stream.seek(dat_addr + first, SEEK_START)
+            data = file_stream.read(int(offsets[-1]) + record_size - first)
+            return gather_records(data, offsets - first, record_size)
+
+        if mapped is not None:
+            return self._load_group_data(gp)[begin: end]
+
+        size = record_size * gp['channel_group']['cycles_nr']
+        end = size if end is None else min(end, size)
+        if not dat_addr or end <= begin:
+            return b''
+        file_stream = self._file_reader()
+        file_stream.seek(dat_addr + begin, SEEK_START)
+        return file_stream.read(end - begin)
+
+    def _read_data_group(self, file_stream, gp, new_groups):
+        """ load the data block of a data group and split it to the groups
+        that share it (unsorted files) """
+        seek = file_stream.seek
+        read = file_stream.read
+
+        size, cg_size = self._get_record_sizes(gp, new_groups)
+
+        # read data block of the current data group
+        dat_addr = gp['data_block_addr']
+        if dat_addr:
+            seek(dat_addr, SEEK_START)
+            data = read(size)
+        else:
+            data = b''
+        if len(new_groups) == 1:
+            kargs = {'data': data,
+                     'compression': self.compression,
+                     'record_size': new_groups[0]['channel_group']['samples_byte_nr']}
+            new_groups[0]['data_block'] = DataBlock(**kargs)
+        else:
+            # if 2 record id's are used the record id is repeated after
+            # each record
+            cg_data = split_records(data, cg_size, trailing_record_id=gp['record_id_nr'] == 2)
+            for grp in new_groups:
+                kargs = {}
+                kargs['data'] = cg_data[grp['channel_group']['record_id']]
+                kargs['compression'] = self.compression
+                kargs['record_size'] = grp['channel_group']['samples_byte_nr']
+                grp['channel_group']['record_id'] = 1
+                grp['data_block'] = DataBlock(**kargs)
 
     def append(self, signals, acquisition_info='Python'):
         """
@@ -305,6 +619,9 @@ class MDF3(object):
             warnings.warn("Can't append if load_measurement_data option is False")
             return
 
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
+
         dg_cntr = len(self.groups)
         gp = {}
         self.groups.append(gp)
@@ -465,13 +782,17 @@ class MDF3(object):
         samples = fromarrays(arrays, dtype=types)
         block = samples.tostring()
 
-        kargs = {'data': block, 'compression' : self.compression}
+        kargs = {'data': block,
+                 'compression' : self.compression,
+                 'record_size': samples.itemsize}
         gp['data_block'] = DataBlock(**kargs)
 
         #data group
         kargs = {'block_len': DG32_BLOCK_SIZE if self.version in ('3.20', '3.30') else DG31_BLOCK_SIZE}
         gp['data_group'] = DataGroup(**kargs)
 
+        gp['record_layout'] = self._get_record_layout(gp)
+
 
     def get_master_data(self, name=None, group=None, data=None):
         """get master channel values only. The group is identified by a channel name (*name* argument) or by the index (*group* argument).
@@ -506,84 +827,113 @@ class MDF3(object):
             else:
                 gp_nr, _= self.channels_db[name]
 
-        gp = self.groups[gp_nr]
+        # all the channels of a group share the same timestamps
+        try:
+            t = self._master_channel_cache.pop(gp_nr)
+        except KeyError:
+            pass
+        else:
+            # keep the most recently used master channels at the end
+            self._master_channel_cache[gp_nr] = t
+            return t
 
-        time_idx = self.masters_db[gp_nr]
-        time_ch = gp['channels'][time_idx]
-        time_conv = gp['channel_conversions'][time_idx]
+        if data is None:
+            data = self._load_group_data(self.groups[gp_nr])
 
-        time_size = time_ch['bit_count'] // 8
-        t_fmt = get_fmt(time_ch['data_type'], time_size)
-        t_byte_offset, bit_offset = divmod(time_ch['start_offset'], 8)
+        t = self._decode_master_data(gp_nr, data)
 
-        bits = time_ch['bit_count']
-        if bits % 8:
-            size = bits // 8 + 1
-        else:
-            size = bits // 8
-
-        block_size = gp['channel_group']['samples_byte_nr'] - gp['data_group']['record_id_nr']
+        self._cache_master_channel(gp_nr, t)
 
+        return t
 
-        if data is None:
-            if not self.load_measured_data:
-                with open(self.name, 'rb') as file_stream:
-                    # go to the first data block of the current data group
-                    dat_addr = gp['data_group']['data_block_addr']
-                    read_size = gp['channel_group']['samples_byte_nr'] * gp['channel_group']['cycles_nr']
-                    data = DataBlock(file_stream=file_stream, address=dat_addr, size=read_size)['data']
-            else:
-                if gp['data_block']:
-                    data = gp['data_block']['data']
-                else:
-                    data = b''
+    def _decode_master_data(self, gp_nr, data):
+        """ master channel values of the records in *data* """
+        gp = self.groups[gp_nr]
 
-        types = dtype( [('', 'a{}'.format(t_byte_offset)),
-                        ('t', t_fmt),
-                        ('', 'a{}'.format(block_size - t_byte_offset - size))] )
+        time_idx = self.masters_db[gp_nr]
+        time_conv = gp['channel_conversions'][time_idx]
 
-        values = fromstring(data, types)
+        t = gp['record_layout'].get_channel_view(data, time_idx)
 
         # get timestamps
         time_conv_type = CONVERSION_TYPE_NONE if time_conv is None else time_conv['conversion_type']
         if time_conv_type == CONVERSION_TYPE_LINEAR:
             time_a = time_conv['a']
             time_b = time_conv['b']
-            t = values['t'] * time_a
+            t = t * time_a
             if time_b:
                 t += time_b
-        elif time_conv_type == CONVERSION_TYPE_NONE:
-            t = values['t']
+
+        if self._mapped is None and not t.flags.writeable:
+            t = t.copy()
 
         return t
 
-    def get_channel_data(self, name=None, group=None, index=None, data=None, return_info=False):
-        """get channel values. The channel is identified by name (*name* argument) or by the group and channel indexes (*group* and *index* arguments).
-        *data* argument is used internally by the *get* method to avoid double work.
-        By defaulkt only the channel values are returned. If the *return_info* argument is set then name, unit and conversion info is returned as well
+    def _get_cycles(self, gp):
+        """ number of records of a group """
+        if self.load_measured_data:
+            block = gp['data_block']
+            return block.size // gp['channel_group']['samples_byte_nr'] if block else 0
+        elif 'record_offsets' in gp:
+            return len(gp['record_offsets'])
+        else:
+            return gp['channel_group']['cycles_nr']
 
-        Parameters
-        ----------
-        name : str
-            channel name in target group
-        group : int
-            group index
-        index : int
-            channel index
-        data : bytes
-            data groups's raw channel data
-        return_info : bool
-            enables returning extra information (name, unit, conversion)
+    def _get_record_range(self, gp_nr, start=None, stop=None):
+        """ find the records of a group with master channel values between
+        *start* and *stop* (both included)
+
+        The decoded master channels (uncompressed measured data loaded in RAM
+        or cached) are searched with *numpy.searchsorted*. Otherwise the
+        master channel is searched by bisection so that only the probed
+        records are read from disk or decompressed.
 
         Returns
         -------
-        vals : numpy.array
-            channel values; if *return_info* is False
-        vals, name, conversion, unit : numpy.array, str, dict, str
-            channel values, channel name, channel conversion, channel unit: if *return_info* is True
+        first, last : int, int
+            index of the first record and end of the record range (exclusive)
 
         """
+        gp = self.groups[gp_nr]
+        cycles = self._get_cycles(gp)
+
+        if (self.load_measured_data and not self.compression) or gp_nr in self._master_channel_cache:
+            search = self.get_master_data(group=gp_nr).searchsorted
+        else:
+            def get_time(record):
+                return self._decode_master_data(gp_nr, self._load_group_records(gp, record, record + 1))[0]
+
+            def search(value, side='left'):
+                return search_records(get_time, value, 0, cycles, side)
+
+        first = 0 if start is None else int(search(start, side='left'))
+        last = cycles if stop is None else int(search(stop, side='right'))
+        return first, max(first, last)
 
+    def _load_time_range(self, gp_nr, start=None, stop=None):
+        """ get the raw data and the master channel values of the records of
+        a group between the *start* and *stop* timestamps """
+        gp = self.groups[gp_nr]
+        first, last = self._get_record_range(gp_nr, start, stop)
+        data = self._load_group_records(gp, first, last)
+        try:
+            t = self._master_channel_cache[gp_nr][first: last]
+        except KeyError:
+            t = self._decode_master_data(gp_nr, data)
+        return data, t
+
+    def _cache_master_channel(self, gp_nr, t):
+        """ keep the decoded master channel of a group; the timestamps are
+        shared by all the signals of the group so they are made read-only """
+        t.flags.writeable = False
+        self._master_channel_cache[gp_nr] = t
+        if len(self._master_channel_cache) > MASTER_CACHE_SIZE:
+            # drop the least recently used master channel
+            self._master_channel_cache.popitem(last=False)
+
+    def _validate_channel_selection(self, name=None, group=None, index=None):
+        """ get the group and channel indexes of a channel identified by name
+        or by the group and channel indexes """
         if name is None:
             if group is None or index is None:
                 raise MdfException('Invalid arguments for "get" methos: must give "name" or, "group" and "index"')
@@ -598,152 +948,188 @@ class MDF3(object):
                 raise MdfException('Channel "{}" not found'.format(name))
             else:
                 gp_nr, ch_nr = self.channels_db[name]
+        return gp_nr, ch_nr
 
-        gp = self.groups[gp_nr]
+    def _get_channel_format(self, gp, ch_nr):
+        """ numpy format and byte offset of a channel inside the group records """
         channel = gp['channels'][ch_nr]
-        conversion = gp['channel_conversions'][ch_nr]
-        if conversion:
-            unit = conversion['unit'].decode('latin-1').strip('\x00')
-        else:
-            unit = ''
-
-        group = gp
-
         bits = channel['bit_count']
         if bits % 8:
             size = bits // 8 + 1
         else:
             size = bits // 8
-        block_size = gp['channel_group']['samples_byte_nr'] - gp['data_group']['record_id_nr']
-        byte_offset, bit_offset = divmod(channel['start_offset'], 8)
-        ch_fmt = get_fmt(channel['data_type'], size)
+        return get_fmt(channel['data_type'], size), channel['start_offset'] // 8
+
+    def _get_bitfield(self, gp, ch_nr, packed=False):
+        """ bit field description (byte offset, bit offset, bit count, signed,
+        big endian) of the integer channels that cannot be read as a numpy
+        dtype view (odd byte sizes, fields that cross the bytes of their bit
+        count, signed fields that need sign extension); *None* for the other
+        channels. With *packed* the description is also returned for the
+        integer channels that only need a bit shift or mask. """
+        channel = gp['channels'][ch_nr]
+        data_type = channel['data_type']
+        if not data_type in (DATA_TYPE_UNSIGNED,
+                             DATA_TYPE_UNSIGNED_INTEL,
+                             DATA_TYPE_UNSIGNED_MOTOROLA,
+                             DATA_TYPE_SIGNED,
+                             DATA_TYPE_SIGNED_INTEL,
+                             DATA_TYPE_SIGNED_MOTOROLA):
+            return None
 
-        if data is None:
-            if not self.load_measured_data:
-                with open(self.name, 'rb') as file_stream:
-                    # go to the first data block of the current data group
-                    dat_addr = gp['data_group']['data_block_addr']
-                    read_size = gp['channel_group']['samples_byte_nr'] * gp['channel_group']['cycles_nr']
-                    data = DataBlock(file_stream=file_stream, address=dat_addr, size=read_size)['data']
-            else:
-                if gp['data_block']:
-                    data = gp['data_block']['data']
-                else:
-                    data = b''
+        bits = channel['bit_count']
+        bit_offset = channel['start_offset'] % 8
+        size = (bits + 7) // 8
+        signed = data_type in (DATA_TYPE_SIGNED, DATA_TYPE_SIGNED_INTEL, DATA_TYPE_SIGNED_MOTOROLA)
+        if bits > 64:
+            return None
+        if size in (1, 2, 4, 8) and (bits + bit_offset + 7) // 8 == size and (not signed or bits == size * 8):
+            if not packed or not (bit_offset or bits % 8):
+                return None
+
+        big_endian = data_type in (DATA_TYPE_UNSIGNED_MOTOROLA, DATA_TYPE_SIGNED_MOTOROLA)
+        return channel['start_offset'] // 8, bit_offset, bits, signed, big_endian
+
+    def _get_record_layout(self, gp):
+        """ compile the record layout of the group; it is built once when the
+        file is opened or the group is appended and it is used by all the
+        channel data requests """
+        indexes = range(len(gp['channels']))
+        formats = [self._get_channel_format(gp, ch_nr) for ch_nr in indexes]
+        return RecordLayout(gp['channel_group']['samples_byte_nr'] - gp['data_group']['record_id_nr'],
+                            [fmt for fmt, _ in formats],
+                            [byte_offset for _, byte_offset in formats],
+                            [self._get_bitfield(gp, ch_nr) for ch_nr in indexes],
+                            [self._get_bitfield(gp, ch_nr, packed=True) for ch_nr in indexes])
+
+    def _get_channel_unit(self, gp, ch_nr):
+        """ physical unit of a channel """
+        conversion = gp['channel_conversions'][ch_nr]
+        if conversion:
+            return conversion['unit'].decode('latin-1').strip('\x00')
+        else:
+            return ''
 
+    def _convert_channel(self, gp, ch_nr, values, out=None, dtype=None, shifted=False):
+        """ apply the bit offset, the bit mask and the conversion of a channel
+        to its raw values
 
-        types = dtype( [('', 'a{}'.format(byte_offset)),
-                        ('vals', ch_fmt),
-                        ('', 'a{}'.format(block_size - size - byte_offset))] )
+        Parameters
+        ----------
+        gp : dict
+            group
+        ch_nr : int
+            channel index
+        values : numpy.array
+            raw channel values
+        out : numpy.array
+            optional output array for the channel values
+        dtype : numpy.dtype
+            optional channel values dtype; ignored if *out* is given
+        shifted : bool
+            the raw values are bit field values that are already shifted,
+            masked and sign extended
 
-        values = fromstring(data, types)
+        Returns
+        -------
+        vals, conversion : numpy.array, dict
+            channel values and conversion information for the VTAB and VTABR
+            conversions (*None* for the other conversions)
 
-        # get channel values
-        conversion_type = CONVERSION_TYPE_NONE if conversion is None else conversion['conversion_type']
-        vals = values['vals']
-        if bit_offset:
-            vals = vals >> bit_offset
-        if bits % 8:
-            vals = vals & (2**bits - 1)
+        """
+        channel = gp['channels'][ch_nr]
+        conversion = gp['channel_conversions'][ch_nr]
 
-        info = None
+        bits = channel['bit_count']
+        bit_offset = channel['start_offset'] % 8
+        if shifted:
+            bit_offset = bits = 0
 
-        if conversion_type == CONVERSION_TYPE_NONE:
+        if conversion is None or conversion['conversion_type'] == CONVERSION_TYPE_NONE:
+            info = None
+            vals = shift_mask(values, bit_offset, bits)
             # is it a Byte Array?
             if channel['data_type'] == DATA_TYPE_BYTEARRAY:
                 vals = vals.tostring()
-                cols = size
+                cols = bits // 8 + 1 if bits % 8 else bits // 8
                 lines = len(vals) // cols
 
                 vals = frombuffer(vals, dtype=uint8).reshape((lines, cols))
+            elif out is not None:
+                out[:] = vals
+                vals = out
+            elif dtype is not None:
+                vals = vals.astype(dtype)
+        else:
+            # the conversion arrays are built only once per conversion block;
+            # the bit shift and mask are fused with the conversion
+            compiled = conversion.compile(gp['texts']['conversion_tab'][ch_nr])
+            vals = compiled.apply(values, bit_offset, bits, out=out, dtype=dtype)
+            info = compiled.info
 
-        elif conversion_type == CONVERSION_TYPE_LINEAR:
-            a = conversion['a']
-            b = conversion['b']
-            if (a, b) == (1, 0):
-                if not vals.dtype == ch_fmt:
-                    vals = vals.astype(ch_fmt)
-            else:
-                vals = vals * a
-                if b:
-                    vals = vals + b
-
-        elif conversion_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TABX):
-            nr = conversion['ref_param_nr']
-            raw = array([conversion['raw_{}'.format(i)] for i in range(nr)])
-            phys = array([conversion['phys_{}'.format(i)] for i in range(nr)])
-            if conversion_type == CONVERSION_TYPE_TABI:
-                vals = interp(values['vals'], raw, phys)
-            else:
-                idx = searchsorted(raw, values['vals'])
-                idx = clip(idx, 0, len(raw) - 1)
-                vals = phys[idx]
-
-        elif conversion_type == CONVERSION_TYPE_VTAB:
-            nr = conversion['ref_param_nr']
-            raw = array([conversion['param_val_{}'.format(i)] for i in range(nr)])
-            phys = array([conversion['text_{}'.format(i)] for i in range(nr)])
-            vals = values['vals']
-            info = {'raw': raw, 'phys': phys, 'type': CONVERSION_TYPE_VTAB}
-
-        elif conversion_type == CONVERSION_TYPE_VTABR:
-            nr = conversion['ref_param_nr']
-
-            texts = array([gp['texts']['conversion_tab'][ch_nr].get('text_{}'.format(i), {}).get('text', b'') for i in range(nr)])
-            lower = array([conversion['lower_{}'.format(i)] for i in range(nr)])
-            upper = array([conversion['upper_{}'.format(i)] for i in range(nr)])
-            vals = values['vals']
-            info = {'lower': lower, 'upper': upper, 'phys': texts, 'type': CONVERSION_TYPE_VTABR}
-
-        elif conversion_type in (CONVERSION_TYPE_EXPO, CONVERSION_TYPE_LOGH):
-            func = log if conversion_type == CONVERSION_TYPE_EXPO else exp
-            P1 = conversion['P1']
-            P2 = conversion['P2']
-            P3 = conversion['P3']
-            P4 = conversion['P4']
-            P5 = conversion['P5']
-            P6 = conversion['P6']
-            P7 = conversion['P7']
-            if P4 == 0:
-                vals = func(((values['vals'] - P7) * P6 - P3) / P1) / P2
-            elif P1 == 0:
-                vals = func((P3 / (values['vals'] - P7) - P6) / P4) / P5
-            else:
-                raise ValueError('wrong conversion type {}'.format(conversion_type))
-
-        elif conversion_type == CONVERSION_TYPE_RAT:
-            P1 = conversion['P1']
-            P2 = conversion['P2']
-            P3 = conversion['P3']
-            P4 = conversion['P4']
-            P5 = conversion['P5']
-            P6 = conversion['P6']
-            X = values['vals']
-            vals = (P1 * X**2 + P2 * X + P3) / (P4 * X**2 + P5 * X + P6)
-
-        elif conversion_type == CONVERSION_TYPE_POLY:
-            P1 = conversion['P1']
-            P2 = conversion['P2']
-            P3 = conversion['P3']
-            P4 = conversion['P4']
-            P5 = conversion['P5']
-            P6 = conversion['P6']
-            X = values['vals']
-            vals = (P2 - (P4 * (X - P5 -P6))) / (P3* (X - P5 - P6) - P1)
-
-        elif conversion_type == CONVERSION_TYPE_FORMULA:
-            formula = conversion['formula'].decode('latin-1').strip('\x00')
-            X1 = values['vals']
-            vals = evaluate(formula)
-
-        conversion = info
+        # raw values are views into the group data; the memory mapped data
+        # mode returns them as they are, otherwise a writable copy is made
+        if self._mapped is None and isinstance(vals, ndarray) and not vals.flags.writeable:
+            vals = vals.copy()
+
+        return vals, info
+
+    def get_channel_data(self, name=None, group=None, index=None, data=None, return_info=False, out=None, dtype=None):
+        """get channel values. The channel is identified by name (*name* argument) or by the group and channel indexes (*group* and *index* arguments).
+        *data* argument is used internally by the *get* method to avoid double work.
+        By defaulkt only the channel values are returned. If the *return_info* argument is set then name, unit and conversion info is returned as well
+
+        Parameters
+        ----------
+        name : str
+            channel name in target group
+        group : int
+            group index
+        index : int
+            channel index
+        data : bytes
+            data groups's raw channel data
+        return_info : bool
+            enables returning extra information (name, unit, conversion)
+        out : numpy.array
+            optional preallocated array that receives the channel values; the
+            values are cast to its dtype
+        dtype : numpy.dtype
+            optional channel values dtype, for example *numpy.float32* to halve
+            the memory of large float channels; ignored if *out* is given
+
+        Returns
+        -------
+        vals : numpy.array
+            channel values; if *return_info* is False
+        vals, name, conversion, unit : numpy.array, str, dict, str
+            channel values, channel name, channel conversion, channel unit: if *return_info* is True
+
+        """
+
+        gp_nr, ch_nr = self._validate_channel_selection(name, group, index)
+
+        gp = self.groups[gp_nr]
+        channel = gp['channels'][ch_nr]
+
+        if data is None:
+            data = self._load_group_data(gp)
+
+        layout = gp['record_layout']
+        bitfield = layout.bitfields[ch_nr]
+        if bitfield:
+            values = get_bitfield_values(data, layout.record_size, *bitfield)
+        else:
+            values = layout.get_channel_view(data, ch_nr)
+
+        vals, conversion = self._convert_channel(gp, ch_nr, values, out=out, dtype=dtype, shifted=bool(bitfield))
 
         if return_info:
-            return vals, channel.name, conversion, unit
+            return vals, channel.name, conversion, self._get_channel_unit(gp, ch_nr)
         else:
             return vals
 
-    def get(self, name=None, group=None, index=None, raster=None):
+    def get(self, name=None, group=None, index=None, raster=None, start=None, stop=None):
         """Gets channel samples.
         Channel can be specified in two ways:
 
@@ -764,6 +1150,14 @@ class MDF3(object):
             0-based channel index
         raster : float
             time raster in seconds
+        start : float
+            only return the samples with timestamps greater or equal than
+            *start*; only the records in the time range are decoded and, if
+            the measured data is not loaded in RAM, read from disk; default
+            *None* means from the first sample
+        stop : float
+            only return the samples with timestamps less or equal than
+            *stop*; default *None* means up to the last sample
 
         Returns
         -------
@@ -794,37 +1188,16 @@ class MDF3(object):
         * if the channel index is out of range
 
         """
-        if name is None:
-            if group is None or index is None:
-                raise MdfException('Invalid arguments for "get" methos: must give "name" or, "group" and "index"')
-            else:
-                gp_nr, ch_nr = group, index
-                if gp_nr > len(self.groups) - 1:
-                    raise MdfException('Group index out of range')
-                if index > len(self.groups[gp_nr]['channels']) - 1:
-                    raise MdfException('Channel index out of range')
-        else:
-            if not name in self.channels_db:
-                raise MdfException('Channel "{}" not found'.format(name))
-            else:
-                gp_nr, ch_nr = self.channels_db[name]
+        gp_nr, ch_nr = self._validate_channel_selection(name, group, index)
 
         gp = self.groups[gp_nr]
         channel = gp['channels'][ch_nr]
 
-        if not self.load_measured_data:
-            with open(self.name, 'rb') as file_stream:
-                # go to the first data block of the current data group
-                dat_addr = gp['data_group']['data_block_addr']
-                read_size = gp['channel_group']['samples_byte_nr'] * gp['channel_group']['cycles_nr']
-                data = DataBlock(file_stream=file_stream, address=dat_addr, size=read_size)['data']
+        if start is None and stop is None:
+            data = self._load_group_data(gp)
+            t = self.get_master_data(group=gp_nr, data=data)
         else:
-            if gp['data_block']:
-                data = gp['data_block']['data']
-            else:
-                data = b''
-
-        t = self.get_master_data(group=gp_nr, data=data)
+            data, t = self._load_time_range(gp_nr, start, stop)
 
         if ch_nr == self.masters_db[gp_nr]:
             res = Signal(samples=t,
@@ -845,6 +1218,94 @@ class MDF3(object):
             res = res.interp(tx)
         return res
 
+    def select(self, channels, start=None, stop=None):
+        """get several channels at once. The channels are grouped by data
+        group: the raw data of each data group is loaded and parsed only once
+        into a structured view that holds all the requested channels and the
+        master channel is computed only once per data group.
+
+        Parameters
+        ----------
+        channels : list
+            list of channel names or (group index, channel index) pairs
+        start : float
+            only return the samples with timestamps greater or equal than
+            *start*; default *None*
+        stop : float
+            only return the samples with timestamps less or equal than
+            *stop*; default *None*
+
+        Returns
+        -------
+        signals : list
+            list of *Signal* objects in the order of *channels*
+
+        Raises
+        ------
+        MdfError :
+
+        * if a channel name is not found
+        * if a group index is out of range
+        * if a channel index is out of range
+
+        Examples
+        --------
+        >>> speed, rpm = mdf.select(['Speed', (2, 3)])
+        >>> speed, rpm = mdf.select(['Speed', (2, 3)], start=10, stop=20)
+
+        """
+        # plan the requests by data group
+        requests = {}
+        for i, channel in enumerate(channels):
+            if isinstance(channel, (tuple, list)):
+                gp_nr, ch_nr = self._validate_channel_selection(group=channel[0], index=channel[1])
+            else:
+                gp_nr, ch_nr = self._validate_channel_selection(name=channel)
+            requests.setdefault(gp_nr, []).append((i, ch_nr))
+
+        signals = [None, ] * len(channels)
+        for gp_nr, group_requests in requests.items():
+            gp = self.groups[gp_nr]
+            master_index = self.masters_db[gp_nr]
+
+            if start is None and stop is None:
+                data = self._load_group_data(gp)
+                t = self.get_master_data(group=gp_nr, data=data)
+            else:
+                data, t = self._load_time_range(gp_nr, start, stop)
+
+            indexes = sorted(set(ch_nr for _, ch_nr in group_requests if ch_nr != master_index))
+            layout = gp['record_layout']
+            # the packed integer channels are extracted together from shared
+            # uint64 words; the other channels use the structured record view
+            packed = [ch_nr for ch_nr in indexes if layout.packed[ch_nr]]
+            packed = dict(zip(packed, get_packed_values(data, layout.record_size, [layout.packed[ch_nr] for ch_nr in packed])))
+            for ch_nr in packed:
+                if not layout.bitfields[ch_nr]:
+                    # keep the native dtype of the byte aligned channels
+                    packed[ch_nr] = packed[ch_nr].astype(layout.formats[ch_nr].lstrip('<>'))
+
+            for i, ch_nr in group_requests:
+                channel = gp['channels'][ch_nr]
+                if ch_nr == master_index:
+                    signals[i] = Signal(samples=t,
+                                        timestamps=t[:],
+                                        unit='s',
+                                        name=channel.name,
+                                        conversion=None)
+                else:
+                    if ch_nr in packed:
+                        vals, conversion = self._convert_channel(gp, ch_nr, packed[ch_nr], shifted=True)
+                    else:
+                        vals, conversion = self._convert_channel(gp, ch_nr, layout.get_channel_view(data, ch_nr))
+                    signals[i] = Signal(samples=vals,
+                                        timestamps=t,
+                                        unit=self._get_channel_unit(gp, ch_nr),
+                                        name=channel.name,
+                                        conversion=conversion)
+
+        return signals
+
     def info(self):
         """get MDF information as a dict
 
@@ -908,6 +1369,9 @@ class MDF3(object):
             print('Must specify a valid group or name argument')
             return
         self.groups.pop(idx)
+        # the group indexes of the cached master channels changed
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
 
     def save(self, dst=None):
         """Save MDF to *dst*. If *dst* is *None* the original file is overwritten
@@ -938,6 +1402,8 @@ class MDF3(object):
         with open(dst, 'wb') as dst:
             #store unique texts and their addresses
             defined_texts = {}
+            # ids of the shared blocks that were already written
+            defined_blocks = set()
             address = 0
 
             write = dst.write
@@ -971,7 +1437,8 @@ class MDF3(object):
                 # ChannelConversions
                 cc = gp['channel_conversions']
                 for i, conv in enumerate(cc):
-                    if conv:
+                    if conv and id(conv) not in defined_blocks:
+                        defined_blocks.add(id(conv))
                         conv.address = address
                         if conv['conversion_type'] == CONVERSION_TYPE_VTABR:
                             for key, item in gp_texts['conversion_tab'][i].items():
@@ -983,7 +1450,8 @@ class MDF3(object):
                 # Channel Extension
                 cs = gp['channel_extensions']
                 for source in cs:
-                    if source:
+                    if source and id(source) not in defined_blocks:
+                        defined_blocks.add(id(source))
                         source.address = address
                         write(bytes(source))
                         address = tell()
@@ -5,19 +5,20 @@ from __future__ import print_function, division
 import sys
 PYVERSION = sys.version_info[0]
 
-import time
 import warnings
 import os
+import threading
+from collections import OrderedDict
 from struct import unpack, unpack_from
-from functools import reduce
-from collections import defaultdict
+from functools import reduce, partial
 from hashlib import md5
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 
-from numpy import (interp, linspace, dtype, amin, amax, array_equal,
-                   array, searchsorted, clip, union1d, float64, frombuffer,
-                   uint8,
-                   issubdtype, flexible)
-from numexpr import evaluate
+from numpy import (linspace, amin, amax, array_equal,
+                   arange, union1d, float64, frombuffer,
+                   uint8, ndarray,
+                   issubdtype, flexible, datetime64, around)
 from numpy.core.records import fromstring, fromarrays
 
 from .v4blocks import (AttachmentBlock,
@@ -37,13 +38,25 @@ from .v4blocks import (AttachmentBlock,
                        TextBlock)
 
 from .v4constants import *
-from .utils import MdfException, get_fmt, fmt_to_datatype, pair
+from .utils import (MdfException, get_fmt, fmt_to_datatype, pair, map_file,
+                    get_index_key, load_index, save_index, LazyList, NOT_LOADED,
+                    split_records, get_record_offsets, gather_records,
+                    FileReader, MASTER_CACHE_SIZE, DataCache, DATA_CACHE_SIZE,
+                    shift_mask, decode_signal_data, UniformTimebase, get_bitfield_values,
+                    get_packed_values, RecordLayout,
+                    build_data_block_index, get_data_block_range, search_records,
+                    canopen_date_to_datetime64, canopen_time_to_datetime64)
 from .signal import Signal
 
 if PYVERSION == 2:
     def bytes(obj):
         return obj.__bytes__()
 
+try:
+    from time import perf_counter
+except ImportError:
+    from time import clock as perf_counter
+
 __all__ = ['MDF4', ]
 
 
@@ -61,9 +74,26 @@ class MDF4(object):
         * if *False* the channel data is read from disk on request
 
     compression : bool
-        compression option for data group binary data block; default *False*
+        compression option for data group binary data block; the data is
+        compressed in independent chunks of records so time range reads only
+        decompress the chunks they need; default *False*
     version : string
         mdf file version ('4.00', '4.10', '4.11'); default '4.00'
+    use_index : bool
+        keep the parsed metadata in a sidecar index file (*name* + '.idx') and
+        reuse it when the file is opened again; the index is rebuilt if the
+        file was modified; default *False*
+    lazy_metadata : bool
+        only read the channel names when the file is opened; the conversion,
+        source and text blocks of a channel are read on first access;
+        default *False*
+    memory_map : bool
+        only used if *load_measured_data* is *False*; the file is kept memory
+        mapped and the channels of single uncompressed data blocks are
+        returned as read-only zero-copy views into the file; default *False*
+    data_cache_size : int
+        only used if *compression* is *True*; byte budget of the least
+        recently used cache of decompressed data blocks; default 256MB
 
     Attributes
     ----------
@@ -83,6 +113,15 @@ class MDF4(object):
         load measured data option
     compression : bool
         measured data compression option
+    use_index : bool
+        sidecar index option
+    lazy_metadata : bool
+        lazy channel metadata option
+    memory_map : bool
+        memory mapped data option
+    data_cache : DataCache
+        decompressed data cache; *data_cache.stats()* returns the cache hit
+        and miss statistics
     version : int
         mdf version
     channels_db : dict
@@ -91,7 +130,7 @@ class MDF4(object):
         used for fast master channel access; for each group index key the value is the master channel index
 
     """
-    def __init__(self, name=None, load_measured_data=True, compression=False, version='4.00'):
+    def __init__(self, name=None, load_measured_data=True, compression=False, version='4.00', use_index=False, lazy_metadata=False, memory_map=False, data_cache_size=DATA_CACHE_SIZE):
         self.groups = []
         self.header = None
         self.identification = None
@@ -102,11 +141,31 @@ class MDF4(object):
         self.channels_db = {}
         self.masters_db = {}
         self.compression = compression
+        self.use_index = use_index
+        self.lazy_metadata = lazy_metadata
+        self.memory_map = memory_map
         self.attachments = []
+        self._block_cache = {}
+        self._default_conversion_units = {}
+        self._mapped = None
+        self._file = None
+        self._master_channel_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.data_cache = DataCache(data_cache_size)
 
         if name and os.path.isfile(name):
-            with open(self.name, 'rb') as file_stream:
-                self._read(file_stream)
+            if not self.load_measured_data or self.lazy_metadata:
+                # the file is kept open for the channel data and metadata
+                # requests; use *close* or the context manager to release it.
+                # It is opened first since the metadata loader can already be
+                # used while the file is read (sidecar index)
+                self._file = open(self.name, 'rb')
+            try:
+                with open(self.name, 'rb') as file_stream:
+                    self._read(file_stream)
+            except:
+                self.close()
+                raise
         else:
             self.load_measured_data = True
 
@@ -114,23 +173,167 @@ class MDF4(object):
             self.identification = FileIdentificationBlock(version=version)
             self.version = version
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # objects that are not closed release the kept file handle and
+        # memory map when they are garbage collected
+        if getattr(self, '_file', None) is not None or getattr(self, '_mapped', None) is not None:
+            self.close()
+
+    def close(self):
+        """ release the file handle and the memory map kept for the channel
+        data and lazy metadata requests; the channel data of files opened with
+        *load_measured_data* *False* and the metadata that was not loaded yet
+        cannot be read after the file is closed """
+        if self._mapped is not None:
+            if PYVERSION == 3:
+                try:
+                    self._mapped.close()
+                except BufferError:
+                    # zero-copy channel views still reference the memory map;
+                    # it is released with the last of them
+                    pass
+            self._mapped = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
+
+    def _file_reader(self):
+        """ file like object for positional reads from the kept file handle """
+        if self._file is None:
+            raise MdfException('The file "{}" is closed'.format(self.name))
+        return FileReader(self._file, self._lock)
+
     def _read(self, file_stream):
+        # the memory map is kept for the channel data requests in the
+        # memory mapped data mode
+        keep_mapped = self.memory_map and not self.load_measured_data
+        data_groups = None
+        mapped = None
+        if self.use_index:
+            index_key = get_index_key(self.name,
+                                      load_measured_data=self.load_measured_data,
+                                      compression=self.compression,
+                                      memory_map=self.memory_map,
+                                      lazy_metadata=self.lazy_metadata)
+            state = load_index(self.name, index_key)
+            if state is not None:
+                data_groups = self._set_index_state(state)
+                if keep_mapped:
+                    mapped = map_file(file_stream)
+
+        if data_groups is None:
+            # the metadata blocks are parsed directly from a memory map of the
+            # file; fall back to the file handle if the file cannot be mapped
+            stream_kargs = {'file_stream': file_stream}
+            mapped = map_file(file_stream)
+            if mapped is not None:
+                stream_kargs['buffer'] = mapped
+            try:
+                data_groups = self._read_blocks(stream_kargs)
+                if not self.load_measured_data:
+                    for group, new_groups in data_groups:
+                        self._index_data_blocks(stream_kargs, group, new_groups)
+                        # unsorted data groups are scanned once to build the
+                        # record offsets of each channel group
+                        if len(new_groups) > 1:
+                            self._index_data_group(stream_kargs, group, new_groups)
+            finally:
+                if not self.lazy_metadata:
+                    self._block_cache = {}
+                    self._default_conversion_units = {}
+                if mapped is not None and not keep_mapped:
+                    mapped.close()
+                    mapped = None
+
+            if self.use_index:
+                save_index(self.name, index_key, self._get_index_state(data_groups))
+
+        for group, new_groups in data_groups:
+            if self.load_measured_data:
+                self._read_data_group(file_stream, group, new_groups)
+            for grp in new_groups:
+                grp['record_layout'] = self._get_record_layout(grp)
+            self.groups.extend(new_groups)
+
+        self._mapped = mapped
+
+    def _get_index_state(self, data_groups):
+        """ metadata that is stored in the sidecar index file """
+        return {'identification': self.identification,
+                'header': self.header,
+                'file_comment': self.file_comment,
+                'file_history': self.file_history,
+                'attachments': self.attachments,
+                'version': self.version,
+                'channels_db': self.channels_db,
+                'masters_db': self.masters_db,
+                'data_groups': data_groups}
+
+    def _set_index_state(self, state):
+        """ restore the metadata loaded from the sidecar index file """
+        self.identification = state['identification']
+        self.header = state['header']
+        self.file_comment = state['file_comment']
+        self.file_history = state['file_history']
+        self.attachments = state['attachments']
+        self.version = state['version']
+        self.channels_db = state['channels_db']
+        self.masters_db = state['masters_db']
+        data_groups = state['data_groups']
+        if self.lazy_metadata:
+            # the lazy metadata lists are stored without their loader
+            for _, new_groups in data_groups:
+                for grp in new_groups:
+                    loader = partial(self._load_channel_metadata, grp)
+                    for container in self._channel_metadata_containers(grp):
+                        container.loader = loader
+        return data_groups
+
+    def _get_block(self, cls, address, stream_kargs):
+        """ read the block at *address* only once; conversion, source and
+        text blocks are usually shared by many channels and the same object
+        is returned for every reference """
+        try:
+            return self._block_cache[address]
+        except KeyError:
+            block = self._block_cache[address] = cls(address=address, **stream_kargs)
+            return block
+
+    def _read_blocks(self, stream_kargs):
+        """ parse the metadata blocks
+
+        Returns
+        -------
+        data_groups : list
+            (data group block, list of groups) pair for each data group
+            found in the file
+
+        """
+        data_groups = []
         dg_cntr = 0
 
-        self.identification = FileIdentificationBlock(file_stream=file_stream)
+        self.identification = FileIdentificationBlock(**stream_kargs)
         self.version = self.identification['version_str'].decode('utf-8').strip(' ').strip('\x00')
-        self.header = HeaderBlock(address=0x40, file_stream=file_stream)
+        self.header = HeaderBlock(address=0x40, **stream_kargs)
 
         # read file comment
         if self.header['comment_addr']:
-            self.file_comment = TextBlock(address=self.header['comment_addr'], file_stream=file_stream)
+            self.file_comment = TextBlock(address=self.header['comment_addr'], **stream_kargs)
 
         # read file history
         fh_addr = self.header['file_history_addr']
         while fh_addr:
-            fh = FileHistory(address=fh_addr, file_stream=file_stream)
+            fh = FileHistory(address=fh_addr, **stream_kargs)
             try:
-                fh_text = TextBlock(address=fh['comment_addr'], file_stream=file_stream)
+                fh_text = TextBlock(address=fh['comment_addr'], **stream_kargs)
             except:
                 print(self.name)
                 raise
@@ -141,11 +344,11 @@ class MDF4(object):
         at_addr = self.header['first_attachment_addr']
         while at_addr:
             texts = {}
-            at_block = AttachmentBlock(address=at_addr, file_stream=file_stream)
+            at_block = AttachmentBlock(address=at_addr, **stream_kargs)
             for key in ('file_name_addr', 'mime_addr', 'comment_addr'):
                 addr = at_block[key]
                 if addr:
-                    texts[key] = TextBlock(address=addr, file_stream=file_stream)
+                    texts[key] = TextBlock(address=addr, **stream_kargs)
 
             self.attachments.append((at_block, texts))
             at_addr = at_block['next_at_addr']
@@ -156,7 +359,7 @@ class MDF4(object):
 
         while dg_addr:
             new_groups = []
-            group = DataGroup(address=dg_addr, file_stream=file_stream)
+            group = DataGroup(address=dg_addr, **stream_kargs)
 
             # go to first channel group of the current data group
             cg_addr = group['first_cg_addr']
@@ -176,18 +379,26 @@ class MDF4(object):
                 # channel_group is lsit to allow uniform handling of all texts in save method
                 grp['texts'] = {'channels': [], 'sources': [], 'conversions': [], 'conversion_tab': [], 'channel_group': []}
 
+                if self.lazy_metadata:
+                    # the channel metadata is read on first access
+                    loader = partial(self._load_channel_metadata, grp)
+                    grp['channel_conversions'] = LazyList(loader)
+                    grp['channel_sources'] = LazyList(loader)
+                    for key in ('channels', 'sources', 'conversions', 'conversion_tab'):
+                        grp['texts'][key] = LazyList(loader)
+
                 # read each channel group sequentially
-                channel_group = grp['channel_group'] = ChannelGroup(address=cg_addr, file_stream=file_stream)
+                channel_group = grp['channel_group'] = ChannelGroup(address=cg_addr, **stream_kargs)
                 # read acquisition name and comment for current channel group
                 channel_group_texts = {}
                 grp['texts']['channel_group'].append(channel_group_texts)
 
-                grp['data_group'] = DataGroup(address=dg_addr, file_stream=file_stream)
+                grp['data_group'] = DataGroup(address=dg_addr, **stream_kargs)
 
                 for key in ('acq_name_addr', 'comment_addr'):
                     address = channel_group[key]
                     if address:
-                        channel_group_texts[key] = TextBlock(address=address, file_stream=file_stream)
+                        channel_group_texts[key] = TextBlock(address=address, **stream_kargs)
 
                 # go to first channel of the current channel group
                 ch_addr = channel_group['first_ch_addr']
@@ -195,165 +406,262 @@ class MDF4(object):
 
                 # Read channels by walking recursively in the channel group
                 # starting from the first channel
-                self._read_channels(ch_addr, grp, file_stream, dg_cntr, ch_cntr)
+                self._read_channels(ch_addr, grp, stream_kargs, dg_cntr, ch_cntr)
 
                 cg_addr = channel_group['next_cg_addr']
+                # each channel group becomes a separate entry in self.groups
+                dg_cntr += 1
 
-                if cg_addr and self.load_measured_data == False:
-                    raise MdfException('Reading unsorted file with load_measured_data option set to False is not supported')
+            data_groups.append((group, new_groups))
 
-            if self.load_measured_data:
-                size = 0
-                record_id_nr = group['record_id_len'] if group['record_id_len'] <= 2 else 0
+            dg_addr = group['next_dg_addr']
 
-                cg_size = {}
-                cg_data = defaultdict(list)
-                for grp in new_groups:
-                    if grp['channel_group']['flags'] == 0:
-                        cg_size[grp['channel_group']['record_id']] = grp['channel_group']['samples_byte_nr']
-                    else:
-                        # VLDS flags
-                        cg_size[grp['channel_group']['record_id']] = 0
+        return data_groups
 
-                # go to the first data block of the current data group
-                dat_addr = group['data_block_addr']
-                data = self._read_data_block(address=dat_addr, file_stream=file_stream)
+    @staticmethod
+    def _get_record_sizes(new_groups):
+        """ record size of each record id of a data group """
+        cg_size = {}
+        for grp in new_groups:
+            if grp['channel_group']['flags'] == 0:
+                cg_size[grp['channel_group']['record_id']] = grp['channel_group']['samples_byte_nr']
+            else:
+                # VLDS flags
+                cg_size[grp['channel_group']['record_id']] = 0
+        return cg_size
+
+    def _index_data_blocks(self, stream_kargs, group, new_groups):
+        """ store the flattened index of the data blocks of a data group in
+        the *data_block_index* key of the groups; the record fields of the
+        index are only set for sorted data groups """
+        blocks = self._get_data_blocks(group['data_block_addr'], stream_kargs['file_stream'])
+        if len(new_groups) == 1:
+            record_size = new_groups[0]['channel_group']['samples_byte_nr']
+        else:
+            record_size = 0
+        index = build_data_block_index(blocks, record_size)
+        for grp in new_groups:
+            grp['data_block_index'] = index
+
+    def _index_data_group(self, stream_kargs, group, new_groups):
+        """ store the record offsets of each channel group of an unsorted
+        data group in the *record_offsets* key of the groups """
+        cg_size = self._get_record_sizes(new_groups)
+        dat_addr = group['data_block_addr']
+
+        buffer = stream_kargs.get('buffer')
+        if dat_addr and buffer is not None and buffer[dat_addr: dat_addr + 4] == b'##DT':
+            # a single data block is scanned in place
+            data = buffer
+            offset = dat_addr + COMMON_SIZE
+            size = unpack_from('<Q', buffer, dat_addr + 8)[0] - COMMON_SIZE
+        else:
+            data = self._read_data_block(address=dat_addr, file_stream=stream_kargs['file_stream'])
+            offset = 0
+            size = len(data)
 
-                if cg_nr == 1:
-                    kargs = {'data': data, 'compression': self.compression}
-                    new_groups[0]['data_block'] = DataBlock(**kargs)
-                else:
-                    i = 0
-                    size = len(data)
-                    while i < size:
-                        rec_id = data[i]
-                        # skip redord id
-                        i += 1
-                        rec_size = cg_size[rec_id]
-                        if rec_size:
-                            rec_data = data[i: i+rec_size]
-                            cg_data[rec_id].append(rec_data)
-                        else:
-                            # as shown bby mdfvalidator rec size is first byte after rec id + 3
-                            rec_size = unpack('<I', data[i: i+3])[0]
-                            i += 4
-                            rec_data = data[i: i + rec_size]
-                            cg_data[rec_id].append(rec_data)
-                        # if 2 record id's are used skip also the second one
-                        if record_id_nr == 2:
-                            i += 1
-                        # go to next record
-                        i += rec_size
-                    for grp in new_groups:
-                        kargs = {}
-                        kargs['data'] = b''.join(cg_data[grp['channel_group']['record_id']])
-                        kargs['compression'] = self.compression
-                        grp['channel_group']['record_id'] = 1
-                        grp['data_block'] = DataBlock(**kargs)
-            self.groups.extend(new_groups)
+        offsets = get_record_offsets(data, cg_size, group['record_id_len'], offset=offset, size=size)
+        for grp in new_groups:
+            # VLSD channel groups have no channels and are never read
+            if cg_size[grp['channel_group']['record_id']]:
+                grp['record_offsets'] = offsets[grp['channel_group']['record_id']]
 
-            dg_addr = group['next_dg_addr']
-            dg_cntr += 1
+    def _load_group_data(self, gp):
+        """ get the raw data of a group; the data is read from disk if the
+        measured data was not loaded at file open
+
+        Parameters
+        ----------
+        gp : dict
+            group
+
+        Returns
+        -------
+        data : bytes | numpy.array
+            group raw data; in the memory mapped data mode the data of sorted
+            groups stored in a single ##DT block is a read-only uint8 view into
+            the file memory map
+
+        """
+        if self.load_measured_data:
+            block = gp['data_block']
+            if not block:
+                return b''
+            elif block.compression:
+                # the compressed bytes object identifies the cached data; it
+                # changes if the block data is replaced
+                compressed = dict.__getitem__(block, 'data')
+                return self.data_cache.get(id(block), compressed, lambda: block['data'])
+            else:
+                return block['data']
+
+        dat_addr = gp['data_group']['data_block_addr']
+        mapped = self._mapped
+        if mapped is not None and dat_addr and mapped[dat_addr: dat_addr + 4] == b'##DT':
+            # single uncompressed data block
+            if 'record_offsets' in gp:
+                offsets = gp['record_offsets']
+                if not len(offsets):
+                    return b''
+                return gather_records(mapped, offsets, gp['channel_group']['samples_byte_nr'], dat_addr + COMMON_SIZE)
+            else:
+                block_len = unpack_from('<Q', mapped, dat_addr + 8)[0]
+                return frombuffer(mapped, dtype=uint8, count=block_len - COMMON_SIZE, offset=dat_addr + COMMON_SIZE)
+
+        file_stream = self._file_reader()
+        if 'record_offsets' in gp:
+            # unsorted data group: gather the records of this group
+            offsets = gp['record_offsets']
+            record_size = gp['channel_group']['samples_byte_nr']
+            if not len(offsets):
+                return b''
+            file_stream.seek(dat_addr, SEEK_START)
+            if file_stream.read(4) == b'##DT':
+                mapped = map_file(file_stream)
+                if mapped is not None:
+                    try:
+                        return gather_records(mapped, offsets, record_size, dat_addr + COMMON_SIZE)
+                    finally:
+                        mapped.close()
+            data = self._read_indexed_data(gp['data_block_index'], file_stream)
+            return gather_records(data, offsets, record_size)
+        else:
+            return self._read_indexed_data(gp['data_block_index'], file_stream)
+
+    def _load_group_records(self, gp, start=0, stop=None):
+        """ get the raw data of the records *start* to *stop* of a group; if
+        the measured data was not loaded at file open only the data blocks
+        that cover the records are read from disk
+
+        Parameters
+        ----------
+        gp : dict
+            group
+        start : int
+            index of the first record
+        stop : int
+            index of the last record (exclusive); default *None* means up to
+            the last record
+
+        Returns
+        -------
+        data : bytes | numpy.array
+            records raw data
+
+        """
+        record_size = gp['channel_group']['samples_byte_nr']
+        begin = start * record_size
+        end = None if stop is None else stop * record_size
+
+        if self.load_measured_data:
+            block = gp['data_block']
+            if block and block.compression:
+                # only the chunks that hold the records are decompressed
+                return block.get_data(begin, end, cache=self.data_cache)
+            return self._load_group_data(gp)[begin: end]
+
+        index = gp['data_block_index']
+        if 'record_offsets' in gp:
+            # unsorted data group: read the span of the selected records
+            offsets = gp['record_offsets'][start: stop]
+            if not len(offsets):
+                return b''
+            first = int(offsets[0])
+            data = self._read_indexed_data(index, self._file_reader(), first, int(offsets[-1]) + record_size)
+            return gather_records(data, offsets - first, record_size)
+
+        size = int(index['offset'][-1] + index['size'][-1]) if len(index) else 0
+        end = size if end is None else min(end, size)
+        if end <= begin:
+            return b''
+        mapped = self._mapped
+        if mapped is not None and len(index) == 1 and index['type'][0] == b'DT':
+            return frombuffer(mapped, dtype=uint8, count=end - begin, offset=int(index['address'][0]) + COMMON_SIZE + begin)
+        return self._read_indexed_data(index, self._file_reader(), begin, end)
+
+    def _load_signal_data(self, gp, index):
+        """ get the signal data of a VLSD channel; the data is read from disk
+        if the measured data was not loaded at file open
+
+        Parameters
+        ----------
+        gp : dict
+            group
+        index : int
+            channel index
+
+        Returns
+        -------
+        signal_data : bytes
+            data from the SDBLOCKs of the channel
 
-    def _read_channels(self, ch_addr, grp, file_stream, dg_cntr, ch_cntr):
+        """
+        if self.load_measured_data:
+            signal_data = gp['signal_data'][index]
+            return signal_data['data'] if signal_data else b''
+        else:
+            # check if it is a VLDS channel with signal data
+            ch_data_addr = gp['channels'][index]['data_block_addr']
+            signal_data = self._read_agregated_signal_data(address=ch_data_addr, file_stream=self._file_reader())
+            return signal_data or b''
+
+    def _read_data_group(self, file_stream, group, new_groups):
+        """ load the data blocks and the signal data blocks of a data group;
+        the data is split to the groups that share it (unsorted files) """
+        for grp in new_groups:
+            signal_data = grp['signal_data']
+            for i, channel in enumerate(grp['channels']):
+                ch_data_addr = channel['data_block_addr']
+                data = self._read_agregated_signal_data(address=ch_data_addr, file_stream=file_stream)
+                if data:
+                    signal_data[i] = SignalDataBlock(data=data)
+
+        cg_size = self._get_record_sizes(new_groups)
+
+        # go to the first data block of the current data group
+        dat_addr = group['data_block_addr']
+        data = self._read_data_block(address=dat_addr, file_stream=file_stream)
+
+        if len(new_groups) == 1:
+            kargs = {'data': data,
+                     'compression': self.compression,
+                     'record_size': new_groups[0]['channel_group']['samples_byte_nr']}
+            new_groups[0]['data_block'] = DataBlock(**kargs)
+        else:
+            cg_data = split_records(data, cg_size, group['record_id_len'])
+            for grp in new_groups:
+                kargs = {}
+                kargs['data'] = cg_data[grp['channel_group']['record_id']]
+                kargs['compression'] = self.compression
+                kargs['record_size'] = grp['channel_group']['samples_byte_nr']
+                grp['channel_group']['record_id'] = 1
+                grp['data_block'] = DataBlock(**kargs)
+
+    def _read_channels(self, ch_addr, grp, stream_kargs, dg_cntr, ch_cntr):
         channels = grp['channels']
         while ch_addr:
             # read channel block and create channel object
-            channel = Channel(address=ch_addr, file_stream=file_stream)
+            channel = Channel(address=ch_addr, **stream_kargs)
             if channel['component_addr'] != 0:
-                ch_cntr = self._read_channels(channel['component_addr'], grp, file_stream, dg_cntr, ch_cntr)
+                ch_cntr = self._read_channels(channel['component_addr'], grp, stream_kargs, dg_cntr, ch_cntr)
             else:
                 channels.append(channel)
 
-                # append channel signal data if load_measured_data allows it
-                if self.load_measured_data:
-                    ch_data_addr = channel['data_block_addr']
-                    signal_data = self._read_agregated_signal_data(address=ch_data_addr, file_stream=file_stream)
-                    if signal_data:
-                        grp['signal_data'].append(SignalDataBlock(data=signal_data))
-                    else:
-                        grp['signal_data'].append(None)
-                else:
-                    grp['signal_data'].append(None)
+                # the channel signal data is loaded after all the metadata
+                # blocks if load_measured_data allows it
+                grp['signal_data'].append(None)
 
-                # read conversion block and create channel conversion object
-                address = channel['conversion_addr']
-                if address:
-                    conv = ChannelConversion(address=address, file_stream=file_stream)
-                else:
-                    conv = None
-                grp['channel_conversions'].append(conv)
-
-                conv_tabx_texts = {}
-                grp['texts']['conversion_tab'].append(conv_tabx_texts)
-                if conv and conv['conversion_type'] in (CONVERSION_TYPE_TABX, CONVERSION_TYPE_RTABX, CONVERSION_TYPE_TTAB):
-                    # link_nr - common links (4) - default text link (1)
-                    for i in range(conv['links_nr'] - 4 - 1):
-                        address = conv['text_{}'.format(i)]
-                        if address:
-                            conv_tabx_texts['text_{}'.format(i)] = TextBlock(address=address, file_stream=file_stream)
-                    address = conv.get('default_addr', 0)
-                    if address:
-                        file_stream.seek(address, SEEK_START)
-                        blk_id = file_stream.read(4)
-                        if blk_id == b'##TX':
-                            conv_tabx_texts['default_addr'] = TextBlock(address=address, file_stream=file_stream)
-                        elif blk_id == b'##CC':
-                            conv_tabx_texts['default_addr'] = ChannelConversion(address=address, file_stream=file_stream)
-                            conv_tabx_texts['default_addr'].text_str = str(time.clock())
-
-                            conv['unit_addr'] = conv_tabx_texts['default_addr']['unit_addr']
-                            conv_tabx_texts['default_addr']['unit_addr'] = 0
-                elif conv and conv['conversion_type'] == CONVERSION_TYPE_TRANS:
-                    # link_nr - common links (4) - default text link (1)
-                    for i in range((conv['links_nr'] - 4 - 1 ) //2):
-                        for key in ('input_{}_addr'.format(i), 'output_{}_addr'.format(i)):
-                            address = conv[key]
-                            if address:
-                                conv_tabx_texts[key] = TextBlock(address=address, file_stream=file_stream)
-                    address = conv['default_addr']
-                    if address:
-                        conv_tabx_texts['default_addr'] = TextBlock(address=address, file_stream=file_stream)
-
-                if self.load_measured_data:
-                    # read source block and create source information object
-                    source_texts = {}
-                    address = channel['source_addr']
-                    if address:
-                        source = SourceInformation(address=address, file_stream=file_stream)
-                        grp['channel_sources'].append(source)
-                        grp['texts']['sources'].append(source_texts)
-                        # read text fields for channel sources
-                        for key in ('name_addr', 'path_addr', 'comment_addr'):
-                            address = source[key]
-                            if address:
-                                source_texts[key] = TextBlock(address=address, file_stream=file_stream)
-                    else:
-                        grp['channel_sources'].append(None)
-                        grp['texts']['sources'].append(source_texts)
+                if self.lazy_metadata:
+                    # only the channel name is needed now
+                    for container in self._channel_metadata_containers(grp):
+                        container.append(NOT_LOADED)
+                    channel.name = TextBlock(address=channel['name_addr'], **stream_kargs).text_str
                 else:
-                    grp['channel_sources'].append(None)
-                    grp['texts']['sources'].append({})
-
-                # read text fields for channel conversions
-                conv_texts = {}
-                grp['texts']['conversions'].append(conv_texts)
-                for key in ('name_addr', 'unit_addr', 'comment_addr', 'formula_addr'):
-                    if conv is not None:
-                        address = conv.get(key, 0)
-                        if address:
-                            conv_texts[key] = TextBlock(address=address, file_stream=file_stream)
-
-                # read text fields for channel
-                channel_texts = {}
-                grp['texts']['channels'].append(channel_texts)
-                for key in ('name_addr', 'comment_addr', 'unit_addr'):
-                    address = channel[key]
-                    if address:
-                        channel_texts[key] = TextBlock(address=address, file_stream=file_stream)
+                    metadata = self._read_channel_metadata(channel, stream_kargs)
+                    for container, item in zip(self._channel_metadata_containers(grp), metadata):
+                        container.append(item)
+                    channel.name = metadata[-1]['name_addr'].text_str
 
-                # update channel object name and block_size attributes
-                channel.name = channel_texts['name_addr'].text_str
                 self.channels_db[channel.name] = (dg_cntr, ch_cntr)
 
                 if channel['channel_type'] in (CHANNEL_TYPE_MASTER, CHANNEL_TYPE_VIRTUAL_MASTER):
@@ -366,6 +674,112 @@ class MDF4(object):
 
         return ch_cntr
 
+    @staticmethod
+    def _channel_metadata_containers(grp):
+        """ per channel metadata lists of a group, in the order returned by
+        *_read_channel_metadata* """
+        texts = grp['texts']
+        return (grp['channel_conversions'],
+                texts['conversion_tab'],
+                grp['channel_sources'],
+                texts['sources'],
+                texts['conversions'],
+                texts['channels'])
+
+    def _read_channel_metadata(self, channel, stream_kargs):
+        """ read the conversion, source and text blocks of a channel
+
+        Returns
+        -------
+        metadata : tuple
+            (conversion, conversion tab texts, source, source texts,
+            conversion texts, channel texts)
+
+        """
+        # read conversion block and create channel conversion object
+        address = channel['conversion_addr']
+        if address:
+            new_conv = address not in self._block_cache
+            conv = self._get_block(ChannelConversion, address, stream_kargs)
+        else:
+            conv = None
+
+        conv_tabx_texts = {}
+        if conv and conv['conversion_type'] in (CONVERSION_TYPE_TABX, CONVERSION_TYPE_RTABX, CONVERSION_TYPE_TTAB):
+            # link_nr - common links (4) - default text link (1)
+            for i in range(conv['links_nr'] - 4 - 1):
+                address = conv['text_{}'.format(i)]
+                if address:
+                    conv_tabx_texts['text_{}'.format(i)] = self._get_block(TextBlock, address, stream_kargs)
+            address = conv.get('default_addr', 0)
+            if address:
+                if 'buffer' in stream_kargs:
+                    blk_id = stream_kargs['buffer'][address: address + 4]
+                else:
+                    file_stream = stream_kargs['file_stream']
+                    file_stream.seek(address, SEEK_START)
+                    blk_id = file_stream.read(4)
+                if blk_id == b'##TX':
+                    conv_tabx_texts['default_addr'] = self._get_block(TextBlock, address, stream_kargs)
+                elif blk_id == b'##CC':
+                    # the unit of the default conversion is moved to each
+                    # parent conversion; the default conversion block can be
+                    # shared so its original unit is kept for the other parents
+                    new_block = address not in self._block_cache
+                    default_conv = conv_tabx_texts['default_addr'] = self._get_block(ChannelConversion, address, stream_kargs)
+                    if new_block:
+                        default_conv.text_str = str(perf_counter())
+                        self._default_conversion_units[address] = default_conv['unit_addr']
+                        default_conv['unit_addr'] = 0
+                    if new_conv:
+                        conv['unit_addr'] = self._default_conversion_units[address]
+        elif conv and conv['conversion_type'] == CONVERSION_TYPE_TRANS:
+            # link_nr - common links (4) - default text link (1)
+            for i in range((conv['links_nr'] - 4 - 1 ) //2):
+                for key in ('input_{}_addr'.format(i), 'output_{}_addr'.format(i)):
+                    address = conv[key]
+                    if address:
+                        conv_tabx_texts[key] = self._get_block(TextBlock, address, stream_kargs)
+            address = conv['default_addr']
+            if address:
+                conv_tabx_texts['default_addr'] = self._get_block(TextBlock, address, stream_kargs)
+
+        # read source block and create source information object
+        source = None
+        source_texts = {}
+        if self.load_measured_data:
+            address = channel['source_addr']
+            if address:
+                source = self._get_block(SourceInformation, address, stream_kargs)
+                # read text fields for channel sources
+                for key in ('name_addr', 'path_addr', 'comment_addr'):
+                    address = source[key]
+                    if address:
+                        source_texts[key] = self._get_block(TextBlock, address, stream_kargs)
+
+        # read text fields for channel conversions
+        conv_texts = {}
+        for key in ('name_addr', 'unit_addr', 'comment_addr', 'formula_addr'):
+            if conv is not None:
+                address = conv.get(key, 0)
+                if address:
+                    conv_texts[key] = self._get_block(TextBlock, address, stream_kargs)
+
+        # read text fields for channel
+        channel_texts = {}
+        for key in ('name_addr', 'comment_addr', 'unit_addr'):
+            address = channel[key]
+            if address:
+                channel_texts[key] = self._get_block(TextBlock, address, stream_kargs)
+
+        return conv, conv_tabx_texts, source, source_texts, conv_texts, channel_texts
+
+    def _load_channel_metadata(self, grp, index):
+        """ lazy loader for the metadata of the channel *index* of group *grp* """
+        metadata = self._read_channel_metadata(grp['channels'][index], {'file_stream': self._file_reader()})
+        for container, item in zip(self._channel_metadata_containers(grp), metadata):
+            container[index] = item
+
     def _read_data_block(self, address, file_stream):
         """read and agregate data blocks for a given data group
 
@@ -374,34 +788,104 @@ class MDF4(object):
         data : bytes
             agregated raw data
         """
+        index = build_data_block_index(self._get_data_blocks(address, file_stream))
+        return self._read_indexed_data(index, file_stream)
+
+    def _get_data_blocks(self, address, file_stream):
+        """ flatten the ##HL and ##DL chains that start at *address*; only
+        the block headers are read
+
+        Returns
+        -------
+        blocks : list
+            (address, block type, raw data size) of each ##DT and ##DZ block
+            in data order
+        """
+        blocks = []
         if address:
             file_stream.seek(address, SEEK_START)
             id_string = file_stream.read(4)
             if id_string == b'##DT':
-                data = DataBlock(address=address, file_stream=file_stream)['data']
+                file_stream.seek(address, SEEK_START)
+                block_len = unpack(FMT_COMMON, file_stream.read(COMMON_SIZE))[2]
+                blocks.append((address, b'DT', block_len - COMMON_SIZE))
             elif id_string == b'##DZ':
-                data = DataZippedBlock(address=address, file_stream=file_stream)['data']
+                file_stream.seek(address, SEEK_START)
+                original_size = unpack(FMT_DZ_COMMON, file_stream.read(DZ_COMMON_SIZE))[8]
+                blocks.append((address, b'DZ', original_size))
             elif id_string == b'##DL':
-                data = []
                 while address:
                     dl = DataList(address=address, file_stream=file_stream)
                     for i in range(dl['links_nr'] - 1):
                         addr = dl['data_block_addr{}'.format(i)]
-                        file_stream.seek(addr, SEEK_START)
-                        id_string = file_stream.read(4)
-                        if id_string == b'##DT':
-                            data.append(DataBlock(file_stream=file_stream, address=addr)['data'])
-                        elif id_string == b'##DZ':
-                            data.append(DataZippedBlock(address=addr, file_stream=file_stream)['data'])
-                        elif id_string == b'##DL':
-                            data.append(self._read_data_block(address=addr, file_stream=file_stream))
+                        blocks.extend(self._get_data_blocks(addr, file_stream))
                     address = dl['next_dl_addr']
-                data = b''.join(data)
             elif id_string == b'##HL':
                 hl = HeaderList(address=address, file_stream=file_stream)
-                return self._read_data_block(address=hl['first_dl_addr'], file_stream=file_stream)
+                blocks = self._get_data_blocks(hl['first_dl_addr'], file_stream)
+        return blocks
+
+    def _read_indexed_data(self, index, file_stream, start=0, stop=None):
+        """ read the raw data bytes *start* to *stop* using the flattened data
+        block index; only the blocks that cover the range are read
+
+        Returns
+        -------
+        data : bytes
+            raw data
+        """
+        if stop is None:
+            stop = int(index['offset'][-1] + index['size'][-1]) if len(index) else 0
+        blocks = get_data_block_range(index, start, stop)[['address', 'type', 'size', 'offset']].tolist()
+        blocks = [(address, block_type, size, max(start - offset, 0), min(stop - offset, size))
+                  for address, block_type, size, offset in blocks]
+
+        if len(blocks) == 1:
+            address, block_type, size, begin, end = blocks[0]
+            if block_type == b'DT':
+                file_stream.seek(address + COMMON_SIZE + begin, SEEK_START)
+                return file_stream.read(end - begin)
+            else:
+                data = DataZippedBlock(address=address, file_stream=file_stream)['data']
+                return data[begin: end] if begin or end < size else data
+
+        # the blocks are read in order into a preallocated buffer; the ##DZ
+        # blocks are decompressed into their slice of the buffer afterwards
+        data = bytearray(sum(end - begin for _, _, _, begin, end in blocks))
+        view = memoryview(data)
+        zipped = []
+        position = 0
+        for address, block_type, size, begin, end in blocks:
+            part = view[position: position + end - begin]
+            position += end - begin
+            if block_type == b'DT':
+                file_stream.seek(address + COMMON_SIZE + begin, SEEK_START)
+                block_data = file_stream.read(end - begin)
+                part[:len(block_data)] = block_data
+            else:
+                block = DataZippedBlock(address=address, file_stream=file_stream)
+                zipped.append((block, begin, end, size, part))
+
+        def unzip(item):
+            block, begin, end, size, part = item
+            if begin or end < size:
+                part[:] = block.unzip()[begin: end]
+            else:
+                block.unzip(part)
+
+        workers = min(len(zipped), cpu_count())
+        if workers > 1:
+            # zlib releases the GIL so the blocks are inflated in parallel
+            pool = ThreadPool(workers)
+            try:
+                pool.map(unzip, zipped)
+            finally:
+                pool.close()
+                pool.join()
         else:
-            data = b''
+            for item in zipped:
+                unzip(item)
+
         return data
 
     def _read_agregated_signal_data(self, address, file_stream):
@@ -483,6 +967,9 @@ class MDF4(object):
             warnings.warn("Must provide at least one Signal object in the input list for append")
             return
 
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
+
         signals_nr = len(signals)
         dg_cntr = len(self.groups)
         self.groups.append({})
@@ -669,12 +1156,15 @@ class MDF4(object):
 
         kargs = {'data': block,
                  'block_len': 24 + len(block),
-                 'compression' : self.compression}
+                 'compression' : self.compression,
+                 'record_size': arrays.itemsize}
         gp['data_block'] = DataBlock(**kargs)
 
         #data group
         gp['data_group'] = DataGroup()
 
+        gp['record_layout'] = self._get_record_layout(gp)
+
     def attach(self, data, file_name=None, comment=None, compression=True, mime=r'application/octet-stream'):
         """ attach embedded attachment as application/octet-stream
 
@@ -772,7 +1262,7 @@ class MDF4(object):
             os.chdir(current_path)
             warnings.warn('Exception during attachment extraction: ' + repr(err))
 
-    def get_master_data(self, name=None, group=None, data=None):
+    def get_master_data(self, name=None, group=None, data=None, lazy_timebase=False, absolute_time=False, local_time=False):
         """get master channel values only. The group is identified by a channel name (*name* argument) or by the index (*group* argument).
         *data* argument is used internally by the *get* method to avoid double work.
 
@@ -784,12 +1274,30 @@ class MDF4(object):
             group index
         data : bytes
             data groups's raw channel data
+        lazy_timebase : bool
+            return virtual master channels as *UniformTimebase* objects
+            instead of materialized arrays; default *False*
+        absolute_time : bool
+            add the measurement start time from the header block to the
+            master channel values and return *numpy.datetime64[ns]*
+            timestamps; the start time is UTC unless the header time flags
+            mark it as local time; default *False*
+        local_time : bool
+            only used if *absolute_time* is *True*: return local time
+            timestamps; the time zone and daylight saving time offsets of the
+            header block are added to an UTC start time if the header time
+            flags mark them as valid, otherwise a warning is issued and the
+            UTC start time is used; default *False*
 
         Returns
         -------
-        t : numpy.array
+        t : numpy.array | UniformTimebase
             master channel values
         """
+        if absolute_time:
+            t = self.get_master_data(name, group, data)
+            start_time = datetime64(self._get_start_time(local_time), 'ns')
+            return start_time + around(t * 10**9).astype('timedelta64[ns]')
 
         if name is None:
             if group is None:
@@ -805,90 +1313,182 @@ class MDF4(object):
                 gp_nr, _= self.channels_db[name]
 
 
+        # all the channels of a group share the same timestamps
+        try:
+            t = self._master_channel_cache.pop(gp_nr)
+        except KeyError:
+            pass
+        else:
+            # keep the most recently used master channels at the end
+            self._master_channel_cache[gp_nr] = t
+            return t
+
         gp = self.groups[gp_nr]
 
         time_idx = self.masters_db[gp_nr]
         time_ch = gp['channels'][time_idx]
         time_conv = gp['channel_conversions'][time_idx]
 
-        time_size = time_ch['bit_count'] // 8
-        t_fmt = get_fmt(time_ch['data_type'], time_size, version=4)
-        t_byte_offset, bit_offset = time_ch['byte_offset'], time_ch['bit_offset']
-        bits = time_ch['bit_count']
-        if bits % 8:
-            t_size = bits // 8 + 1
-        else:
-            t_size = bits // 8
-
-        block_size = gp['channel_group']['samples_byte_nr']
+        if lazy_timebase and time_ch['channel_type'] == CHANNEL_TYPE_VIRTUAL_MASTER:
+            if data is None:
+                cycles = gp['channel_group']['cycles_nr']
+            else:
+                cycles = len(data) // gp['channel_group']['samples_byte_nr']
+            return UniformTimebase(time_conv['b'], time_conv['a'], cycles)
 
         # get the raw data if it's not provided
         if data is None:
-            if not self.load_measured_data:
-                with open(self.name, 'rb') as file_stream:
-                    # go to the first data block of the current data group
-                    dat_addr = gp['data_group']['data_block_addr']
-                    data = self._read_data_block(address=dat_addr, file_stream=file_stream)
-            else:
-                if gp['data_block']:
-                    data = gp['data_block']['data']
-                else:
-                    data = b''
+            data = self._load_group_data(gp)
 
-        if time_ch['channel_type'] == CHANNEL_TYPE_MASTER:
-            types = dtype( [('', 'a{}'.format(t_byte_offset)),
-                            ('t', t_fmt),
-                            ('', 'a{}'.format(block_size - t_byte_offset - t_size))] )
+        t = self._decode_master_data(gp_nr, data)
 
-            values = fromstring(data, types)
+        self._cache_master_channel(gp_nr, t)
+
+        return t
+
+    def _decode_master_data(self, gp_nr, data, first=0, lazy_timebase=False):
+        """ master channel values of the records in *data*; *first* is the
+        index of the first of these records in the group """
+        gp = self.groups[gp_nr]
+
+        time_idx = self.masters_db[gp_nr]
+        time_ch = gp['channels'][time_idx]
+        time_conv = gp['channel_conversions'][time_idx]
+
+        block_size = gp['channel_group']['samples_byte_nr']
+
+        if time_ch['channel_type'] == CHANNEL_TYPE_MASTER:
+            t = gp['record_layout'].get_channel_view(data, time_idx)
 
             time_conv_type = CONVERSION_TYPE_NON if time_conv is None else time_conv['conversion_type']
             if time_conv_type == CONVERSION_TYPE_LIN:
                 time_a = time_conv['a']
                 time_b = time_conv['b']
-                t = values['t'] * time_a
+                t = t * time_a
                 if time_b:
                     t += time_b
-            elif time_conv_type == CONVERSION_TYPE_NON:
-                t = values['t']
+
+            if self._mapped is None and not t.flags.writeable:
+                t = t.copy()
 
         elif time_ch['channel_type'] == CHANNEL_TYPE_VIRTUAL_MASTER:
             time_a = time_conv['a']
             time_b = time_conv['b']
             cycles = len(data) // block_size
-            t = array([t * time_a + time_b for t in range(cycles)], dtype=float64)
+            if lazy_timebase:
+                t = UniformTimebase(time_b, time_a, first + cycles)[first:]
+            else:
+                t = arange(first, first + cycles, dtype=float64) * time_a + time_b
 
         return t
 
-    def get_channel_data(self, name=None, group=None, index=None, data=None, signal_data=None, return_info=False):
-        """get channel values. The channel is identified by name (*name* argument) or by the group and channel indexes (*group* and *index* arguments).
-        *data* argument is used internally by the *get* method to avoid double work.
-        By defaulkt only the channel values are returned. If the *return_info* argument is set then name, unit and conversion info is returned as well
+    def _get_cycles(self, gp):
+        """ number of records of a group """
+        record_size = gp['channel_group']['samples_byte_nr']
+        if self.load_measured_data:
+            block = gp['data_block']
+            return block.size // record_size if block else 0
+        elif 'record_offsets' in gp:
+            return len(gp['record_offsets'])
+        else:
+            index = gp['data_block_index']
+            size = int(index['offset'][-1] + index['size'][-1]) if len(index) else 0
+            return size // record_size
 
-        Parameters
-        ----------
-        name : str
-            channel name in target group
-        group : int
-            group index
-        index : int
-            channel index
-        data : bytes
-            data groups's raw channels data
-        signal_data : bytes
-            data from SDBLOCKs of VLDS channels
-        return_info : bool
-            enables returning extra information (name, unit, conversion)
+    def _get_record_range(self, gp_nr, start=None, stop=None):
+        """ find the records of a group with master channel values between
+        *start* and *stop* (both included)
+
+        The virtual master channels are searched analytically and the decoded
+        master channels (uncompressed measured data loaded in RAM or cached)
+        with *numpy.searchsorted*. Otherwise the master channel is sampled at
+        the data block boundaries and then inside the selected block by
+        binary search, so that only the probed records are read from disk or
+        decompressed.
 
         Returns
         -------
-        vals : numpy.array
-            channel values; if *return_info* is False
-        vals, name, conversion, unit : numpy.array, str, dict, str
-            channel values, channel name, channel conversion, channel unit: if *return_info* is True
+        first, last : int, int
+            index of the first record and end of the record range (exclusive)
 
         """
+        gp = self.groups[gp_nr]
+        time_idx = self.masters_db[gp_nr]
+        cycles = self._get_cycles(gp)
+
+        if gp['channels'][time_idx]['channel_type'] == CHANNEL_TYPE_VIRTUAL_MASTER:
+            time_conv = gp['channel_conversions'][time_idx]
+            t = UniformTimebase(time_conv['b'], time_conv['a'], cycles)
+            search = t.searchsorted
+        elif (self.load_measured_data and not self.compression) or gp_nr in self._master_channel_cache:
+            t = self.get_master_data(group=gp_nr)
+            search = t.searchsorted
+        else:
+            def get_time(record):
+                return self._decode_master_data(gp_nr, self._load_group_records(gp, record, record + 1), record)[0]
 
+            if self.load_measured_data or 'record_offsets' in gp:
+                bounds = []
+            else:
+                index = gp['data_block_index']
+                bounds = index['first_record'][index['record_count'] > 0].tolist()
+                bounds = [record for record in bounds if 0 < record < cycles]
+
+            def search(value, side='left'):
+                # pick the block first and then the record inside the block
+                pos = search_records(lambda i: get_time(bounds[i]), value, 0, len(bounds), side)
+                lo = bounds[pos - 1] + 1 if pos else 0
+                hi = bounds[pos] if pos < len(bounds) else cycles
+                return search_records(get_time, value, lo, hi, side)
+
+        first = 0 if start is None else int(search(start, side='left'))
+        last = cycles if stop is None else int(search(stop, side='right'))
+        return first, max(first, last)
+
+    def _load_time_range(self, gp_nr, start=None, stop=None, lazy_timebase=False):
+        """ get the raw data and the master channel values of the records of
+        a group between the *start* and *stop* timestamps """
+        gp = self.groups[gp_nr]
+        first, last = self._get_record_range(gp_nr, start, stop)
+        data = self._load_group_records(gp, first, last)
+        try:
+            t = self._master_channel_cache[gp_nr][first: last]
+        except KeyError:
+            t = self._decode_master_data(gp_nr, data, first, lazy_timebase)
+        return data, t
+
+    def _get_start_time(self, local_time=False):
+        """ measurement start time in ns since 1970 from the header block,
+        as UTC time or as local time """
+        header = self.header
+        start_time = header['abs_time']
+        time_flags = header['time_flags']
+        if time_flags & FLAG_HD_LOCAL_TIME:
+            if not local_time:
+                warnings.warn('The measurement start time is local time with unknown UTC offset; local time is used')
+        elif local_time:
+            if time_flags & FLAG_HD_TIME_OFFSET_VALID:
+                # the offsets are signed minutes
+                offset = 0
+                for minutes in (header['tz_offset'], header['daylight_save_time']):
+                    offset += minutes - 2**16 if minutes >= 2**15 else minutes
+                start_time += offset * 60 * 10**9
+            else:
+                warnings.warn('The header block has no valid time zone offsets; UTC time is used')
+        return start_time
+
+    def _cache_master_channel(self, gp_nr, t):
+        """ keep the decoded master channel of a group; the timestamps are
+        shared by all the signals of the group so they are made read-only """
+        t.flags.writeable = False
+        self._master_channel_cache[gp_nr] = t
+        if len(self._master_channel_cache) > MASTER_CACHE_SIZE:
+            # drop the least recently used master channel
+            self._master_channel_cache.popitem(last=False)
+
+    def _validate_channel_selection(self, name=None, group=None, index=None):
+        """ get the group and channel indexes of a channel identified by name
+        or by the group and channel indexes """
         if name is None:
             if group is None or index is None:
                 raise MdfException('Invalid arguments for "get" methos: must give "name" or, "group" and "index"')
@@ -903,18 +1503,61 @@ class MDF4(object):
                 raise MdfException('Channel "{}" not found'.format(name))
             else:
                 gp_nr, ch_nr = self.channels_db[name]
+        return gp_nr, ch_nr
 
-        gp = self.groups[gp_nr]
+    def _get_channel_format(self, gp, ch_nr):
+        """ numpy format and byte offset of a channel inside the group records """
         channel = gp['channels'][ch_nr]
-
-        conversion = gp['channel_conversions'][ch_nr]
-
-        signal_data = gp['signal_data'][ch_nr]
-        if signal_data:
-            signal_data = signal_data['data']
+        size = channel['bit_count'] + channel['bit_offset']
+        if size % 8:
+            size = size // 8 + 1
         else:
-            signal_data = b''
+            size = size // 8
+        ch_fmt = get_fmt(channel['data_type'], size, version=4)
+        return ch_fmt, channel['byte_offset']
+
+    def _get_bitfield(self, gp, ch_nr, packed=False):
+        """ bit field description (byte offset, bit offset, bit count, signed,
+        big endian) of the integer channels that cannot be read as a numpy
+        dtype view (odd byte sizes, signed fields that need sign extension);
+        *None* for the other channels. With *packed* the description is also
+        returned for the integer channels that only need a bit shift or
+        mask. """
+        channel = gp['channels'][ch_nr]
+        data_type = channel['data_type']
+        if not data_type in (DATA_TYPE_UNSIGNED_INTEL,
+                             DATA_TYPE_UNSIGNED_MOTOROLA,
+                             DATA_TYPE_SIGNED_INTEL,
+                             DATA_TYPE_SIGNED_MOTOROLA):
+            return None
 
+        bits = channel['bit_count']
+        bit_offset = channel['bit_offset']
+        size = (bits + bit_offset + 7) // 8
+        signed = data_type in (DATA_TYPE_SIGNED_INTEL, DATA_TYPE_SIGNED_MOTOROLA)
+        if bits > 64:
+            return None
+        if size in (1, 2, 4, 8) and (not signed or bits == size * 8):
+            if not packed or not (bit_offset or bits % 8):
+                return None
+
+        big_endian = data_type in (DATA_TYPE_UNSIGNED_MOTOROLA, DATA_TYPE_SIGNED_MOTOROLA)
+        return channel['byte_offset'], bit_offset, bits, signed, big_endian
+
+    def _get_record_layout(self, gp):
+        """ compile the record layout of the group; it is built once when the
+        file is opened or the group is appended and it is used by all the
+        channel data requests """
+        indexes = range(len(gp['channels']))
+        formats = [self._get_channel_format(gp, ch_nr) for ch_nr in indexes]
+        return RecordLayout(gp['channel_group']['samples_byte_nr'],
+                            [fmt for fmt, _ in formats],
+                            [byte_offset for _, byte_offset in formats],
+                            [self._get_bitfield(gp, ch_nr) for ch_nr in indexes],
+                            [self._get_bitfield(gp, ch_nr, packed=True) for ch_nr in indexes])
+
+    def _get_channel_unit(self, gp, ch_nr):
+        """ physical unit of a channel """
         # search for unit in conversion texts
         unit = gp['texts']['conversions'][ch_nr].get('unit_addr', None)
         if unit:
@@ -926,65 +1569,61 @@ class MDF4(object):
                 unit = unit.text_str
             else:
                 unit = ''
+        return unit
+
+    def _convert_channel(self, gp, ch_nr, values, signal_data=b'', out=None, dtype=None, lazy_vlsd=False, as_datetime=False, shifted=False):
+        """ apply the bit offset, the bit mask and the conversion of a channel
+        to its raw values
+
+        Parameters
+        ----------
+        gp : dict
+            group
+        ch_nr : int
+            channel index
+        values : numpy.array
+            raw channel values
+        signal_data : bytes
+            data from SDBLOCKs of VLDS channels
+        out : numpy.array
+            optional output array for the numeric channel values
+        dtype : numpy.dtype
+            optional numeric channel values dtype; ignored if *out* is given
+        shifted : bool
+            the raw values are bit field values that are already shifted,
+            masked and sign extended
+        lazy_vlsd : bool
+            return the VLSD channel values as *VariableLengthArray*
+        as_datetime : bool
+            return the CANopen date and time channel values as datetime64
 
-        group = gp
+        Returns
+        -------
+        vals, conversion : numpy.array, dict
+            channel values and conversion information for the TABX, RTABX,
+            TTAB and TRANS conversions (*None* for the other conversions)
 
-        byte_offset, bit_offset = channel['byte_offset'], channel['bit_offset']
+        """
+        channel = gp['channels'][ch_nr]
+        conversion = gp['channel_conversions'][ch_nr]
 
+        bit_offset = channel['bit_offset']
         bits = channel['bit_count']
         size = bits + bit_offset
-
         if size % 8:
             size = size // 8 + 1
         else:
             size = size // 8
-        block_size = gp['channel_group']['samples_byte_nr']
-
-#        print(channel, gp_nr, ch_nr, size)
-
-        if data is None:
-            if not self.load_measured_data:
-                with open(self.name, 'rb') as file_stream:
-                    # go to the first data block of the current data group
-                    dat_addr = gp['data_group']['data_block_addr']
-                    data = self._read_data_block(address=dat_addr, file_stream=file_stream)
-            else:
-                if gp['data_block']:
-                    data = gp['data_block']['data']
-                else:
-                    data = b''
-
-        if signal_data is None:
-            if not self.load_measured_data:
-                ch_data_addr = channel['data_block_addr']
-                signal_data = self._read_agregated_signal_data(address=ch_data_addr, file_stream=file_stream)
-            else:
-                signal_data = gp['signal_data'][ch_nr]['data'] if gp['signal_data'][ch_nr] else b''
+        if shifted:
+            bit_offset = bits = 0
 
-        ch_fmt = get_fmt(channel['data_type'], size, version=4)
-
-        # for VLSD channel with signal data block change the dtype from string to void
-        if signal_data:
-            ch_fmt = ch_fmt.replace('S', 'V')
-
-        types = dtype( [('', 'a{}'.format(byte_offset)),
-                        ('vals', ch_fmt),
-                        ('', 'a{}'.format(block_size - byte_offset - size))] )
-#            print(channel.name, types, data)
-        values = fromstring(data, types)
-
-        # get channel values
         conversion_type = CONVERSION_TYPE_NON if conversion is None else conversion['conversion_type']
-        vals = values['vals']
-        if bit_offset:
-            vals = vals >> bit_offset
-        if bits % 8:
-            vals = vals & (2**bits - 1)
 
         if conversion_type == CONVERSION_TYPE_NON:
+            conversion = None
+            vals = shift_mask(values, bit_offset, bits)
             # check if it is VLDS channel type with SDBLOCK
             if signal_data:
-                values = []
                 vals = vals.tostring()
                 if size == 4:
                     fmt = '<u4'
@@ -992,59 +1631,66 @@ class MDF4(object):
                     fmt = '<u8'
                 vals = frombuffer(vals, dtype=fmt)
 
-                for offset in vals:
-                    offset = int(offset)
-                    size = unpack_from('<I', signal_data, offset)[0]
-                    values.append(signal_data[offset+4: offset+4+size])
-                vals = array(values)
+                # all the length prefixes are parsed at once
+                vals = decode_signal_data(signal_data, vals)
+                if not lazy_vlsd:
+                    vals = vals.as_bytes()
 
             # CANopen date
             elif channel['data_type'] == DATA_TYPE_CANOPEN_DATE:
                 vals = vals.tostring()
 
-                types = dtype( [('ms', '<u2'),
-                                ('min', '<u1'),
-                                ('hour', '<u1'),
-                                ('day', '<u1'),
-                                ('month', '<u1'),
-                                ('year', '<u1')] )
+                # the record dtype is given as a list since the *dtype*
+                # argument shadows numpy.dtype
+                types = [('ms', '<u2'),
+                         ('min', '<u1'),
+                         ('hour', '<u1'),
+                         ('day', '<u1'),
+                         ('month', '<u1'),
+                         ('year', '<u1')]
                 dates = fromstring(vals, types)
 
-                arrays = []
-                arrays.append(dates['ms'])
-                # bit 6 and 7 of minutes are reserved
-                arrays.append(dates['min'] & 0x3F)
-                # only firt 4 bits of hour are used
-                arrays.append(dates['hour'] & 0xF)
-                # the first 4 bits are the day number
-                arrays.append(dates['day'] & 0xF)
-                # bit 6 and 7 of month are reserved
-                arrays.append(dates['month'] & 0x3F)
-                # bit 7 of year is reserved
-                arrays.append(dates['year'] & 0x7F)
-                # add summer or standard time information for hour
-                arrays.append((dates['hour'] & 0x80) >> 7)
-                # add day of week information
-                arrays.append((dates['day'] & 0xF0) >> 4)
-
-                names = ['ms', 'min', 'hour', 'day', 'month', 'year', 'summer_time', 'day_of_week']
-                vals = fromarrays(arrays, names=names)
+                if as_datetime:
+                    vals = canopen_date_to_datetime64(dates)
+                else:
+                    arrays = []
+                    arrays.append(dates['ms'])
+                    # bit 6 and 7 of minutes are reserved
+                    arrays.append(dates['min'] & 0x3F)
+                    # only firt 4 bits of hour are used
+                    arrays.append(dates['hour'] & 0xF)
+                    # the first 4 bits are the day number
+                    arrays.append(dates['day'] & 0xF)
+                    # bit 6 and 7 of month are reserved
+                    arrays.append(dates['month'] & 0x3F)
+                    # bit 7 of year is reserved
+                    arrays.append(dates['year'] & 0x7F)
+                    # add summer or standard time information for hour
+                    arrays.append((dates['hour'] & 0x80) >> 7)
+                    # add day of week information
+                    arrays.append((dates['day'] & 0xF0) >> 4)
+
+                    names = ['ms', 'min', 'hour', 'day', 'month', 'year', 'summer_time', 'day_of_week']
+                    vals = fromarrays(arrays, names=names)
 
             # CANopen time
             elif channel['data_type'] == DATA_TYPE_CANOPEN_TIME:
                 vals = vals.tostring()
 
-                types = dtype( [('ms', '<u4'),
-                                ('days', '<u2')] )
+                types = [('ms', '<u4'),
+                         ('days', '<u2')]
                 dates = fromstring(vals, types)
 
-                arrays = []
-                # bits 28 to 31 are reserverd for ms
-                arrays.append(dates['ms'] & 0xFFFFFFF)
-                arrays.append(dates['days'] & 0x3F)
+                if as_datetime:
+                    vals = canopen_time_to_datetime64(dates)
+                else:
+                    arrays = []
+                    # bits 28 to 31 are reserverd for ms
+                    arrays.append(dates['ms'] & 0xFFFFFFF)
+                    arrays.append(dates['days'] & 0x3F)
 
-                names = ['ms', 'days']
-                vals = fromarrays(arrays, names=names)
+                    names = ['ms', 'days']
+                    vals = fromarrays(arrays, names=names)
 
             # byte array
             elif channel['data_type'] == DATA_TYPE_BYTEARRAY:
@@ -1054,117 +1700,99 @@ class MDF4(object):
 
                 vals = frombuffer(vals, dtype=uint8).reshape((lines, cols))
 
-        elif conversion_type == CONVERSION_TYPE_LIN:
-            a = conversion['a']
-            b = conversion['b']
-            if (a, b) == (1, 0):
-                if not vals.dtype == ch_fmt:
-                    vals = vals.astype(ch_fmt)
-            else:
-                vals = vals * a
-                if b:
-                    vals = vals + b
-
-        elif conversion_type == CONVERSION_TYPE_RAT:
-            P1 = conversion['P1']
-            P2 = conversion['P2']
-            P3 = conversion['P3']
-            P4 = conversion['P4']
-            P5 = conversion['P5']
-            P6 = conversion['P6']
-            X = values['vals']
-            vals = (P1 * X**2 + P2 * X + P3) / (P4 * X**2 + P5 * X + P6)
-
-        elif conversion_type == CONVERSION_TYPE_ALG:
-            formula = gp['texts']['conversions'][ch_nr]['formula_addr'].text_str
-            X = values['vals']
-            vals = evaluate(formula)
-
-        elif conversion_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TAB):
-            nr = conversion['val_param_nr'] // 2
-            raw = array([conversion['raw_{}'.format(i)] for i in range(nr)])
-            phys = array([conversion['phys_{}'.format(i)] for i in range(nr)])
-            if conversion_type == CONVERSION_TYPE_TABI:
-                vals = interp(values['vals'], raw, phys)
-            else:
-                idx = searchsorted(raw, values['vals'])
-                idx = clip(idx, 0, len(raw) - 1)
-                vals = phys[idx]
-
-        elif conversion_type ==  CONVERSION_TYPE_RTAB:
-            nr = (conversion['val_param_nr'] - 1) // 3
-            lower = array([conversion['lower_{}'.format(i)] for i in range(nr)])
-            upper = array([conversion['upper_{}'.format(i)] for i in range(nr)])
-            phys = array([conversion['phys_{}'.format(i)] for i in range(nr)])
-            default = conversion['default']
-            vals = values['vals']
-
-            res = []
-            for v in vals:
-                for l, u, p in zip(lower, upper, phys):
-                    if l <= v <= u:
-                        res.append(p)
-                        break
-                else:
-                    res.append(default)
-            vals = array(res).astype(ch_fmt)
-
-        elif conversion_type == CONVERSION_TYPE_TABX:
-            nr = conversion['val_param_nr']
-            raw = array([conversion['val_{}'.format(i)] for i in range(nr)])
-            phys = array([gp['texts']['conversion_tab'][ch_nr]['text_{}'.format(i)]['text'] for i in range(nr)])
-            default = gp['texts']['conversion_tab'][ch_nr].get('default_addr', {}).get('text', b'')
-            vals = values['vals']
-            info = {'raw': raw, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_TABX}
-
-        elif conversion_type == CONVERSION_TYPE_RTABX:
-            nr = conversion['val_param_nr'] // 2
-
-            phys = array([gp['texts']['conversion_tab'][ch_nr]['text_{}'.format(i)]['text'] for i in range(nr)])
-            lower = array([conversion['lower_{}'.format(i)] for i in range(nr)])
-            upper = array([conversion['upper_{}'.format(i)] for i in range(nr)])
-            default = gp['texts']['conversion_tab'][ch_nr].get('default_addr', {}).get('text', b'')
-            vals = values['vals']
-            info = {'lower': lower, 'upper': upper, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_RTABX}
-
-        elif conversion == CONVERSION_TYPE_TTAB:
-            nr = conversion['val_param_nr'] - 1
-
-            raw = array([gp['texts']['conversion_tab'][ch_nr]['text_{}'.format(i)]['text'] for i in range(nr)])
-            phys = array([conversion['val_{}'.format(i)] for i in range(nr)])
-            default = conversion['val_default']
-            vals = values['vals']
-            info = {'lower': lower, 'upper': upper, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_TTAB}
-
-        elif conversion == CONVERSION_TYPE_TRANS:
-            nr = (conversion['ref_param_nr'] - 1 ) // 2
-            in_ = array([gp['texts']['conversion_tab'][ch_nr]['input_{}'.format(i)]['text'] for i in range(nr)])
-            out_ = array([gp['texts']['conversion_tab'][ch_nr]['output_{}'.format(i)]['text'] for i in range(nr)])
-            default = gp['texts']['conversion_tab'][ch_nr]['default_addr']['text']
-            vals = values['vals']
-
-            res = []
-            for v in vals:
-                for i, o in zip(in_, out_):
-                    if v == i:
-                        res.append(o)
-                        break
-                else:
-                    res.append(default)
-            vals = array(res)
-            info = {'input': in_, 'output': out_, 'default': default, 'type': CONVERSION_TYPE_TRANS}
+            elif out is not None:
+                out[:] = vals
+                vals = out
+
+            elif dtype is not None:
+                vals = vals.astype(dtype)
 
-        if conversion_type in (CONVERSION_TYPE_TABX, CONVERSION_TYPE_RTABX, CONVERSION_TYPE_TTAB, CONVERSION_TYPE_TRANS):
-            conversion = info
         else:
-            conversion = None
+            # the conversion arrays are built only once per conversion block;
+            # the bit shift and mask are fused with the conversion
+            compiled = conversion.compile(gp['texts']['conversion_tab'][ch_nr], gp['texts']['conversions'][ch_nr])
+            vals = compiled.apply(values, bit_offset, bits, out=out, dtype=dtype)
+            conversion = compiled.info
+
+        # raw values are views into the group data; the memory mapped data
+        # mode returns them as they are, otherwise a writable copy is made
+        if self._mapped is None and isinstance(vals, ndarray) and not vals.flags.writeable:
+            vals = vals.copy()
+
+        return vals, conversion
+
+    def get_channel_data(self, name=None, group=None, index=None, data=None, signal_data=None, return_info=False, out=None, dtype=None, lazy_vlsd=False, as_datetime=False):
+        """get channel values. The channel is identified by name (*name* argument) or by the group and channel indexes (*group* and *index* arguments).
+        *data* argument is used internally by the *get* method to avoid double work.
+        By defaulkt only the channel values are returned. If the *return_info* argument is set then name, unit and conversion info is returned as well
+
+        Parameters
+        ----------
+        name : str
+            channel name in target group
+        group : int
+            group index
+        index : int
+            channel index
+        data : bytes
+            data groups's raw channels data
+        signal_data : bytes
+            data from SDBLOCKs of VLDS channels; read from the file if *None*
+        return_info : bool
+            enables returning extra information (name, unit, conversion)
+        out : numpy.array
+            optional preallocated array that receives the numeric channel
+            values; the values are cast to its dtype
+        dtype : numpy.dtype
+            optional numeric channel values dtype, for example *numpy.float32*
+            to halve the memory of large float channels; ignored if *out* is
+            given
+        lazy_vlsd : bool
+            return the values of VLSD channels as a *VariableLengthArray*
+            (offsets and values buffers) instead of a fixed width bytes array;
+            the bytes or str arrays are built on request with its *as_bytes*
+            and *as_str* methods; default *False*
+        as_datetime : bool
+            return the values of CANopen DATE and TIME channels as
+            *numpy.datetime64* arrays (millisecond resolution) instead of
+            record arrays of the separate date and time fields; default
+            *False*
+
+        Returns
+        -------
+        vals : numpy.array
+            channel values; if *return_info* is False
+        vals, name, conversion, unit : numpy.array, str, dict, str
+            channel values, channel name, channel conversion, channel unit: if *return_info* is True
+
+        """
+
+        gp_nr, ch_nr = self._validate_channel_selection(name, group, index)
+
+        gp = self.groups[gp_nr]
+        channel = gp['channels'][ch_nr]
+
+        if data is None:
+            data = self._load_group_data(gp)
+
+        if signal_data is None:
+            signal_data = self._load_signal_data(gp, ch_nr)
+
+        layout = gp['record_layout']
+        bitfield = layout.bitfields[ch_nr]
+        if bitfield:
+            values = get_bitfield_values(data, layout.record_size, *bitfield)
+        else:
+            values = layout.get_channel_view(data, ch_nr)
+
+        vals, conversion = self._convert_channel(gp, ch_nr, values, signal_data, out=out, dtype=dtype, lazy_vlsd=lazy_vlsd, as_datetime=as_datetime, shifted=bool(bitfield))
 
         if return_info:
-            return vals, channel.name, conversion, unit
+            return vals, channel.name, conversion, self._get_channel_unit(gp, ch_nr)
         else:
             return vals
 
-    def get(self, name=None, group=None, index=None, raster=None):
+    def get(self, name=None, group=None, index=None, raster=None, lazy_timebase=False, start=None, stop=None):
         """Gets channel samples.
         Channel can be specified in two ways:
 
@@ -1185,6 +1813,19 @@ class MDF4(object):
             0-based channel index
         raster : float
             time raster in seconds
+        lazy_timebase : bool
+            keep the timestamps of virtual master channels as a
+            *UniformTimebase* (start, step and count) that is not materialized;
+            *Signal.cut* and *Signal.interp* work on it analytically; default
+            *False*
+        start : float
+            only return the samples with timestamps greater or equal than
+            *start*; only the records in the time range are decoded and, if
+            the measured data is not loaded in RAM, read from disk; default
+            *None* means from the first sample
+        stop : float
+            only return the samples with timestamps less or equal than
+            *stop*; default *None* means up to the last sample
 
         Returns
         -------
@@ -1217,41 +1858,17 @@ class MDF4(object):
         * if the channel index is out of range
 
         """
-        if name is None:
-            if group is None or index is None:
-                raise MdfException('Invalid arguments for "get" methos: must give "name" or, "group" and "index"')
-            else:
-                gp_nr, ch_nr = group, index
-                if gp_nr > len(self.groups) - 1:
-                    raise MdfException('Group index out of range')
-                if index > len(self.groups[gp_nr]['channels']) - 1:
-                    raise MdfException('Channel index out of range')
-        else:
-            if not name in self.channels_db:
-                raise MdfException('Channel "{}" not found'.format(name))
-            else:
-                gp_nr, ch_nr = self.channels_db[name]
+        gp_nr, ch_nr = self._validate_channel_selection(name, group, index)
 
         gp = self.groups[gp_nr]
         channel = gp['channels'][ch_nr]
 
-        if not self.load_measured_data:
-            with open(self.name, 'rb') as file_stream:
-                # go to the first data block of the current data group
-                dat_addr = gp['data_group']['data_block_addr']
-                data = self._read_data_block(address=dat_addr, file_stream=file_stream)
-
-                # check if it is a VLDS channel with signal data
-                ch_data_addr = channel['data_block_addr']
-                signal_data = self._read_agregated_signal_data(address=ch_data_addr, file_stream=file_stream)
+        if start is None and stop is None:
+            data = self._load_group_data(gp)
+            t = self.get_master_data(group=gp_nr, data=data, lazy_timebase=lazy_timebase)
         else:
-            if gp['data_block']:
-                data = gp['data_block']['data']
-            else:
-                data = b''
-            signal_data = gp['signal_data'][ch_nr]['data'] if gp['signal_data'][ch_nr] else b''
-
-        t = self.get_master_data(group=gp_nr, data=data)
+            data, t = self._load_time_range(gp_nr, start, stop, lazy_timebase)
+        signal_data = self._load_signal_data(gp, ch_nr)
 
         if ch_nr == self.masters_db[gp_nr]:
             res = Signal(samples=t,
@@ -1273,6 +1890,95 @@ class MDF4(object):
             res = res.interp(tx)
         return res
 
+    def select(self, channels, start=None, stop=None):
+        """get several channels at once. The channels are grouped by data
+        group: the raw data of each data group is loaded and parsed only once
+        into a structured view that holds all the requested channels and the
+        master channel is computed only once per data group.
+
+        Parameters
+        ----------
+        channels : list
+            list of channel names or (group index, channel index) pairs
+        start : float
+            only return the samples with timestamps greater or equal than
+            *start*; default *None*
+        stop : float
+            only return the samples with timestamps less or equal than
+            *stop*; default *None*
+
+        Returns
+        -------
+        signals : list
+            list of *Signal* objects in the order of *channels*
+
+        Raises
+        ------
+        MdfError :
+
+        * if a channel name is not found
+        * if a group index is out of range
+        * if a channel index is out of range
+
+        Examples
+        --------
+        >>> speed, rpm = mdf.select(['Speed', (2, 3)])
+        >>> speed, rpm = mdf.select(['Speed', (2, 3)], start=10, stop=20)
+
+        """
+        # plan the requests by data group
+        requests = {}
+        for i, channel in enumerate(channels):
+            if isinstance(channel, (tuple, list)):
+                gp_nr, ch_nr = self._validate_channel_selection(group=channel[0], index=channel[1])
+            else:
+                gp_nr, ch_nr = self._validate_channel_selection(name=channel)
+            requests.setdefault(gp_nr, []).append((i, ch_nr))
+
+        signals = [None, ] * len(channels)
+        for gp_nr, group_requests in requests.items():
+            gp = self.groups[gp_nr]
+            master_index = self.masters_db[gp_nr]
+
+            if start is None and stop is None:
+                data = self._load_group_data(gp)
+                t = self.get_master_data(group=gp_nr, data=data)
+            else:
+                data, t = self._load_time_range(gp_nr, start, stop)
+
+            indexes = sorted(set(ch_nr for _, ch_nr in group_requests if ch_nr != master_index))
+            signal_data = dict((ch_nr, self._load_signal_data(gp, ch_nr)) for ch_nr in indexes)
+            layout = gp['record_layout']
+            # the packed integer channels are extracted together from shared
+            # uint64 words; the other channels use the structured record view
+            packed = [ch_nr for ch_nr in indexes if layout.packed[ch_nr]]
+            packed = dict(zip(packed, get_packed_values(data, layout.record_size, [layout.packed[ch_nr] for ch_nr in packed])))
+            for ch_nr in packed:
+                if not layout.bitfields[ch_nr]:
+                    # keep the native dtype of the byte aligned channels
+                    packed[ch_nr] = packed[ch_nr].astype(layout.formats[ch_nr].lstrip('<>'))
+
+            for i, ch_nr in group_requests:
+                channel = gp['channels'][ch_nr]
+                if ch_nr == master_index:
+                    signals[i] = Signal(samples=t,
+                                        timestamps=t[:],
+                                        unit='s',
+                                        name=channel.name,
+                                        conversion=None)
+                else:
+                    if ch_nr in packed:
+                        vals, conversion = self._convert_channel(gp, ch_nr, packed[ch_nr], signal_data[ch_nr], shifted=True)
+                    else:
+                        vals, conversion = self._convert_channel(gp, ch_nr, layout.get_channel_view(data, ch_nr), signal_data[ch_nr])
+                    signals[i] = Signal(samples=vals,
+                                        timestamps=t,
+                                        unit=self._get_channel_unit(gp, ch_nr),
+                                        name=channel.name,
+                                        conversion=conversion)
+
+        return signals
+
     def info(self):
         """get MDF information as a dict
 
@@ -1333,6 +2039,9 @@ class MDF4(object):
             warnings.warn('Must specify a valid group or name argument')
             return
         self.groups.pop(idx)
+        # the group indexes of the cached master channels changed
+        self._master_channel_cache.clear()
+        self.data_cache.clear()
 
     def save(self, dst=None):
         """Save MDF to *dst*. If *dst* is *None* the original file is overwritten
@@ -1357,6 +2066,8 @@ class MDF4(object):
 
         with open(dst, 'wb') as dst:
             defined_texts = {}
+            # ids of the shared blocks that were already written
+            defined_blocks = set()
 
             write = dst.write
             tell = dst.tell
@@ -1431,7 +2142,8 @@ class MDF4(object):
 
                 # write channel conversions
                 for j, conv in enumerate(gp['channel_conversions']):
-                    if conv:
+                    if conv and id(conv) not in defined_blocks:
+                        defined_blocks.add(id(conv))
                         conv.address = address
 
                         for key in ('name_addr', 'unit_addr', 'comment_addr', 'formula_addr'):
@@ -1452,7 +2164,8 @@ class MDF4(object):
                         address = tell()
 
                 for j, source in enumerate(gp['channel_sources']):
-                    if source:
+                    if source and id(source) not in defined_blocks:
+                        defined_blocks.add(id(source))
                         source.address = address
 
                         for key in ('name_addr', 'path_addr', 'comment_addr'):
@@ -5,7 +5,7 @@ asammdf *Signal* class module for time correct signal processing
 import numpy as np
 import matplotlib.pyplot as plt
 
-from .utils import MdfException
+from .utils import MdfException, UniformTimebase
 
 
 class Signal(object):
@@ -20,7 +20,7 @@ class Signal(object):
     ----------
     samples : numpy.array
         signal samples
-    timestamps : numpy.array
+    timestamps : numpy.array | UniformTimebase
         signal timestamps
     unit : str
         signal unit
@@ -91,6 +91,8 @@ class Signal(object):
 
     def interp(self, new_timestamps):
         """ returns a new *Signal* interpolated using the *new_timestamps*"""
+        if isinstance(self.timestamps, UniformTimebase) and len(self.timestamps) > 1:
+            return self.__interp_uniform(new_timestamps)
         if self.samples.dtype in ('float64', 'float32'):
             s = np.interp(new_timestamps, self.timestamps, self.samples)
         else:
@@ -99,6 +101,25 @@ class Signal(object):
             s = self.samples[idx]
         return Signal(s, new_timestamps, self.unit, self.name, self.conversion)
 
+    def __interp_uniform(self, new_timestamps):
+        """ interpolation on a uniform time base; the sample indexes are
+        computed from the start and step without materializing the
+        timestamps """
+        timestamps = self.timestamps
+        samples = np.asarray(self.samples)
+        if samples.dtype in ('float64', 'float32'):
+            # fractional sample positions clipped like numpy.interp does
+            pos = (np.asarray(new_timestamps, dtype=np.float64) - timestamps.start) / timestamps.step
+            pos = np.clip(pos, 0, len(timestamps) - 1)
+            idx = np.minimum(pos.astype(np.int64), len(timestamps) - 2)
+            frac = pos - idx
+            s = samples[idx] * (1 - frac) + samples[idx + 1] * frac
+        else:
+            idx = np.searchsorted(timestamps, new_timestamps, side='right') - 1
+            idx = np.clip(idx, 0, len(timestamps) - 1)
+            s = samples[idx]
+        return Signal(s, new_timestamps, self.unit, self.name, self.conversion)
+
     def __apply_func(self, other, func_name):
 
         if isinstance(other, Signal):
@@ -1,16 +1,94 @@
 '''
 asammdf utility functions and classes
 '''
+import hmac
+import io
 import itertools
-from numpy import issubdtype, signedinteger, unsignedinteger, floating, flexible
+import json
+import mmap
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from hashlib import md5, sha256
+
+# cPickle does not support restricting the classes that can be unpickled
+import pickle
+
+from array import array
+from struct import Struct
+
+from numpy import (integer, issubdtype, signedinteger, unsignedinteger, floating, flexible,
+                   frombuffer, ndarray, uint8, uint16, uint32, uint64, empty, repeat, cumsum, dtype,
+                   zeros, ones, arange, concatenate, int64, char, float64, asarray,
+                   floor, ceil, clip, searchsorted, datetime64)
+from numexpr import evaluate
 from . import v3constants as v3c
 from . import v4constants as v4c
 
 
-__all__ = ['MdfException',
+__all__ = ['DataCache',
+           'FileReader',
+           'DATA_BLOCK_INDEX_DTYPE',
+           'LazyList',
+           'MdfException',
+           'VariableLengthArray',
+           'canopen_date_to_datetime64',
+           'canopen_time_to_datetime64',
+           'decode_signal_data',
+           'evaluate_conversion',
+           'get_bitfield_values',
+           'get_channel_view',
+           'get_packed_values',
            'get_fmt',
            'fmt_to_datatype',
-           'pair']
+           'gather_records',
+           'get_index_key',
+           'get_raw_expression',
+           'get_record_offsets',
+           'get_record_view',
+           'load_index',
+           'map_file',
+           'NOT_LOADED',
+           'RecordLayout',
+           'UniformTimebase',
+           'build_data_block_index',
+           'get_data_block_range',
+           'pair',
+           'save_index',
+           'scan_records',
+           'search_records',
+           'shift_mask',
+           'split_records',
+           'transpose_bytes']
+
+# bump this when the layout of the pickled metadata changes
+INDEX_FORMAT_VERSION = 2
+# identification block and the largest header block
+INDEX_HASH_SIZE = 64 + 208
+# sidecar index header: magic, format version, HMAC-SHA256 of the key and
+# metadata bytes, key byte size and metadata byte size
+INDEX_MAGIC = b'MDFINDEX'
+INDEX_HEADER = Struct('<8sI32sIQ')
+# per user secret used to sign the sidecar index files
+INDEX_SECRET_FILE = os.path.join(os.path.expanduser('~'), '.asammdf', 'index.key')
+INDEX_SECRET_SIZE = 32
+# number of decoded master channels kept by the MDF objects
+MASTER_CACHE_SIZE = 32
+# default byte budget of the decompressed data cache
+DATA_CACHE_SIZE = 256 * 2**20
+# byte size of the independently compressed data chunks (compression option)
+COMPRESSION_CHUNK_SIZE = 2**20
+# byte size of the tiles of the cache blocked transposition
+TRANSPOSE_TILE_SIZE = 2**16
+# flattened data block index entry: block address, block type (b'DT' or
+# b'DZ'), raw data size, raw data offset and the records covered by the block
+DATA_BLOCK_INDEX_DTYPE = [('address', '<u8'),
+                          ('type', 'S2'),
+                          ('size', '<u8'),
+                          ('offset', '<u8'),
+                          ('first_record', '<u8'),
+                          ('record_count', '<u8')]
 
 
 class MdfException(Exception):
@@ -18,6 +96,1386 @@ class MdfException(Exception):
     pass
 
 
+def map_file(file_stream):
+    """ create a read-only memory map of the whole file
+
+    Parameters
+    ----------
+    file_stream : file handle
+        file opened in binary read mode
+
+    Returns
+    -------
+    mapped : mmap.mmap | None
+        memory map of the file or *None* if the file cannot be mapped (empty
+        files or address space exhausted on 32 bit interpreters)
+
+    """
+    try:
+        return mmap.mmap(file_stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, EnvironmentError):
+        return None
+
+
+class FileReader(object):
+    """ file like object with a private position over a shared file handle
+
+    The reads are positional (*os.pread*) so several readers can use the same
+    handle concurrently without fighting over the handle's seek position. On
+    platforms without *os.pread* the handle is seeked and read under *lock*.
+
+    Parameters
+    ----------
+    file_stream : file handle
+        file opened in binary read mode
+    lock : threading.Lock
+        lock shared by all the readers of *file_stream*; only used if
+        *os.pread* is not available
+
+    """
+    def __init__(self, file_stream, lock=None):
+        self._file_stream = file_stream
+        self._fileno = file_stream.fileno()
+        self._lock = lock if lock is not None else threading.Lock()
+        self._position = 0
+
+    def fileno(self):
+        return self._fileno
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self._position = offset
+        elif whence == os.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = os.fstat(self._fileno).st_size + offset
+        return self._position
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = max(0, os.fstat(self._fileno).st_size - self._position)
+        if hasattr(os, 'pread'):
+            chunks = []
+            position = self._position
+            # pread can return less bytes than requested
+            while size > 0:
+                chunk = os.pread(self._fileno, size, position)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                position += len(chunk)
+                size -= len(chunk)
+            data = b''.join(chunks)
+        else:
+            with self._lock:
+                self._file_stream.seek(self._position)
+                data = self._file_stream.read(size)
+        self._position += len(data)
+        return data
+
+
+class DataCache(object):
+    """ least recently used cache of decompressed data blocks bounded by a
+    byte budget
+
+    Parameters
+    ----------
+    max_size : int
+        byte budget of the cached data; items larger than the budget are not
+        cached
+
+    Attributes
+    ----------
+    hits : int
+        number of requests served from the cache
+    misses : int
+        number of requests that needed a decompression
+    size : int
+        byte size of the cached data
+
+    Examples
+    --------
+    >>> mdf = MDF('test.mf4', compression=True)
+    >>> mdf.get('Speed'); mdf.get('Torque')
+    >>> mdf.data_cache.hits, mdf.data_cache.misses
+    (1, 1)
+
+    """
+    def __init__(self, max_size=DATA_CACHE_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, token, load):
+        """ get the cached data of *key* or load it
+
+        Parameters
+        ----------
+        key : hashable
+            cache key
+        token : object
+            identity of the source data; a cached item is only used if it was
+            loaded from the same *token* object
+        load : callable
+            called without arguments to load the data on a cache miss
+
+        Returns
+        -------
+        data : bytes
+            cached or loaded data
+
+        """
+        with self._lock:
+            try:
+                item_token, data = self._items.pop(key)
+            except KeyError:
+                pass
+            else:
+                if item_token is token:
+                    # keep the most recently used items at the end
+                    self._items[key] = item_token, data
+                    self.hits += 1
+                    return data
+                self.size -= len(data)
+            self.misses += 1
+
+        data = load()
+        if len(data) <= self.max_size:
+            with self._lock:
+                if key in self._items:
+                    self.size -= len(self._items.pop(key)[1])
+                self._items[key] = token, data
+                self.size += len(data)
+                while self.size > self.max_size:
+                    # drop the least recently used items
+                    self.size -= len(self._items.popitem(last=False)[1][1])
+        return data
+
+    def clear(self):
+        """ drop all the cached data; the statistics are kept """
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self):
+        """ cache statistics
+
+        Returns
+        -------
+        stats : dict
+            *hits*, *misses*, *items*, *size* and *max_size* values
+
+        """
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'items': len(self._items),
+                'size': self.size,
+                'max_size': self.max_size}
+
+
+class _NotLoaded(object):
+    """ placeholder for the LazyList items that were not loaded yet; it is
+    pickled by reference so the unpickled placeholders are *NOT_LOADED* """
+    def __reduce__(self):
+        return 'NOT_LOADED'
+
+
+NOT_LOADED = _NotLoaded()
+
+
+class LazyList(list):
+    """ list whose *NOT_LOADED* items are created on first access
+
+    Parameters
+    ----------
+    loader : callable
+        called with the item index when a *NOT_LOADED* item is accessed; the
+        loader must set the item in the list. The loader is not pickled: an
+        unpickled list has the loader *None*
+
+    """
+    def __init__(self, loader, items=()):
+        super(LazyList, self).__init__(items)
+        self.loader = loader
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = super(LazyList, self).__getitem__(index)
+        if item is NOT_LOADED:
+            if index < 0:
+                index += len(self)
+            self.loader(index)
+            item = super(LazyList, self).__getitem__(index)
+        return item
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reduce_ex__(self, protocol):
+        # the loader is not picklable and pickling must not load the items;
+        # the items are stored as they are and the owner sets the loader
+        # again after unpickling
+        return LazyList, (None, list(list.__iter__(self)))
+
+
+class UniformTimebase(object):
+    """ lazy uniform time base *start + i * step* for *i* in *range(count)*;
+    the timestamps are only materialized when the object is converted to a
+    numpy array. Slicing returns a new *UniformTimebase* and *searchsorted*
+    (used by *numpy.searchsorted*) is computed analytically.
+
+    Parameters
+    ----------
+    start : float
+        first timestamp
+    step : float
+        time step
+    count : int
+        number of timestamps
+
+    """
+    dtype = dtype(float64)
+    ndim = 1
+
+    def __init__(self, start, step, count, _offset=0, _stride=1):
+        # the timestamps of slices are computed from the original start and
+        # step so they are identical to the materialized original time base
+        self._origin = float(start)
+        self._step = float(step)
+        self._offset = _offset
+        self._stride = _stride
+        self.count = int(count)
+
+    @property
+    def start(self):
+        return self._value(0)
+
+    @property
+    def step(self):
+        return self._step * self._stride
+
+    @property
+    def shape(self):
+        return (self.count, )
+
+    def _value(self, index):
+        return self._origin + (self._offset + index * self._stride) * self._step
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return 'UniformTimebase(start={}, step={}, count={})'.format(self.start, self.step, self.count)
+
+    def __array__(self, dtype=None, copy=None):
+        t = self._value(arange(self.count, dtype=float64))
+        return t if dtype is None else t.astype(dtype)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self._value(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.count)
+            count = len(range(start, stop, step))
+            return UniformTimebase(self._origin,
+                                   self._step,
+                                   count,
+                                   self._offset + start * self._stride,
+                                   self._stride * step)
+        elif isinstance(index, (int, integer)):
+            if index < 0:
+                index += self.count
+            if not 0 <= index < self.count:
+                raise IndexError('index {} is out of bounds for size {}'.format(index, self.count))
+            return self._value(int(index))
+        else:
+            return asarray(self)[index]
+
+    def searchsorted(self, v, side='left', sorter=None):
+        """ insertion indexes of *v*; same as *numpy.searchsorted* """
+        if self.step <= 0 or sorter is not None:
+            return searchsorted(asarray(self), v, side=side, sorter=sorter)
+        v = asarray(v, dtype=float64)
+        pos = ((v - self._origin) / self._step - self._offset) / self._stride
+        if side == 'left':
+            idx = ceil(pos)
+        else:
+            idx = floor(pos) + 1
+        idx = clip(idx, 0, self.count).astype(int64)
+        # correct the floating point rounding of the division against the
+        # materialized timestamps
+        for _ in range(2):
+            prev = self._value(idx - 1)
+            cur = self._value(idx)
+            if side == 'left':
+                idx = idx - ((idx > 0) & (prev >= v)) + ((idx < self.count) & (cur < v))
+            else:
+                idx = idx - ((idx > 0) & (prev > v)) + ((idx < self.count) & (cur <= v))
+        return idx if idx.ndim else int(idx)
+
+
+def get_index_name(name):
+    """ sidecar index file name for the mdf file *name* """
+    return name + '.idx'
+
+
+def get_index_key(name, **options):
+    """ compute the key that validates the sidecar index of a file
+
+    The key is built from the absolute file path, size, modification time, a
+    hash of the file identification and header blocks and the given reading
+    *options*.
+
+    Parameters
+    ----------
+    name : str
+        mdf file name
+    options : dict
+        reading options that change the stored metadata
+
+    Returns
+    -------
+    key : bytes
+        index key
+
+    """
+    stat = os.stat(name)
+    with open(name, 'rb') as file_stream:
+        header_hash = md5(file_stream.read(INDEX_HASH_SIZE)).hexdigest()
+    key = [INDEX_FORMAT_VERSION,
+           os.path.abspath(name),
+           stat.st_size,
+           repr(stat.st_mtime),
+           header_hash,
+           sorted(options.items())]
+    return json.dumps(key).encode('utf-8')
+
+
+def get_index_secret(create=False):
+    """ per user secret that signs the sidecar index files; it is stored in
+    *INDEX_SECRET_FILE* and it is only readable by the user
+
+    Parameters
+    ----------
+    create : bool
+        create the secret if it does not exist yet
+
+    Returns
+    -------
+    secret : bytes | None
+        secret or *None* if it does not exist
+
+    """
+    try:
+        with open(INDEX_SECRET_FILE, 'rb') as secret_file:
+            secret = secret_file.read()
+        if len(secret) == INDEX_SECRET_SIZE:
+            return secret
+    except (IOError, OSError):
+        pass
+    if not create:
+        return None
+
+    folder = os.path.dirname(INDEX_SECRET_FILE)
+    if not os.path.isdir(folder):
+        os.makedirs(folder, 0o700)
+    secret = os.urandom(INDEX_SECRET_SIZE)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    with os.fdopen(os.open(INDEX_SECRET_FILE, flags, 0o600), 'wb') as secret_file:
+        secret_file.write(secret)
+    return secret
+
+
+class _IndexUnpickler(pickle.Unpickler):
+    """ unpickler that only resolves the asammdf classes and the numpy array
+    and dtype constructors that the sidecar index metadata is made of """
+    NUMPY_NAMES = ('dtype', 'ndarray', '_reconstruct', '_frombuffer', 'scalar')
+
+    def find_class(self, module, name):
+        if module.split('.')[0] == 'asammdf':
+            obj = getattr(__import__(module, fromlist=[name]), name)
+            # NOT_LOADED is the placeholder of the lazy metadata items
+            if isinstance(obj, type) or obj is NOT_LOADED:
+                return obj
+        elif module.split('.')[0] == 'numpy' and name in self.NUMPY_NAMES:
+            return getattr(__import__(module, fromlist=[name]), name)
+        elif module == 'collections' and name == 'OrderedDict':
+            return OrderedDict
+        raise pickle.UnpicklingError('"{}.{}" is not allowed in the index'.format(module, name))
+
+
+def load_index(name, key):
+    """ load the metadata stored in the sidecar index of a file
+
+    The index header, the key and the HMAC signature of the metadata are
+    checked before the metadata is unpickled and only the classes of the
+    metadata blocks can be unpickled, so a planted or modified index file is
+    rejected without running its content.
+
+    Parameters
+    ----------
+    name : str
+        mdf file name
+    key : bytes
+        key returned by *get_index_key* for the current file
+
+    Returns
+    -------
+    state : dict | None
+        stored metadata or *None* if the index is missing, stale, corrupt or
+        not signed by the current user
+
+    """
+    try:
+        secret = get_index_secret()
+        if secret is None:
+            return None
+        with open(get_index_name(name), 'rb') as index:
+            magic, version, signature, key_size, state_size = INDEX_HEADER.unpack(index.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION or key_size != len(key):
+                return None
+            if index.read(key_size) != key:
+                return None
+            state = index.read(state_size)
+        if len(state) != state_size:
+            return None
+        if not hmac.compare_digest(hmac.new(secret, key + state, sha256).digest(), signature):
+            return None
+        return _IndexUnpickler(io.BytesIO(state)).load()
+    except Exception:
+        return None
+
+
+def save_index(name, key, state):
+    """ write the sidecar index of a file; failures only issue a warning
+
+    Parameters
+    ----------
+    name : str
+        mdf file name
+    key : bytes
+        key returned by *get_index_key* for the current file
+    state : dict
+        metadata to store
+
+    """
+    index_name = get_index_name(name)
+    try:
+        secret = get_index_secret(create=True)
+        state = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        signature = hmac.new(secret, key + state, sha256).digest()
+        with open(index_name, 'wb') as index:
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, signature, len(key), len(state)))
+            index.write(key)
+            index.write(state)
+    except Exception as err:
+        warnings.warn('Could not write index file "{}": {}'.format(index_name, err))
+        try:
+            os.remove(index_name)
+        except OSError:
+            pass
+
+
+RECORD_ID_FORMATS = {1: '<B', 2: '<H', 4: '<I', 8: '<Q'}
+unpack_vlsd_size = Struct('<I').unpack_from
+
+
+def scan_records(data, record_sizes, record_id_size=1, trailing_record_id=False, offset=0, size=None):
+    """ find the record boundaries of an unsorted data block; only the record
+    headers are read
+
+    The start of each record depends on the size of the previous one, so the
+    boundaries are found with a Python loop over the record headers (one
+    iteration per record); the record bytes are then gathered with vectorized
+    numpy operations by *split_records* and *gather_records*.
+
+    Parameters
+    ----------
+    data : bytes | mmap
+        buffer that holds the data block
+    record_sizes : dict
+        record size (without the record id) for each record id; size 0 marks
+        variable length records (VLSD) that start with their uint32 length
+    record_id_size : int
+        record id size in bytes (1, 2, 4 or 8)
+    trailing_record_id : bool
+        the record id is repeated after each record (mdf version 3 with 2
+        record ids)
+    offset : int
+        data block offset inside *data*
+    size : int
+        data block size; by default until the end of *data*
+
+    Returns
+    -------
+    record_ids, codes, sizes : list, numpy.array, numpy.array
+        sorted record ids, index in *record_ids* of each record and size of
+        each record; the VLSD record sizes include the length prefix
+
+    """
+    if size is None:
+        size = len(data) - offset
+    end = offset + size
+    tail = record_id_size if trailing_record_id else 0
+    unpack_id = Struct(RECORD_ID_FORMATS[record_id_size]).unpack_from
+
+    record_ids = sorted(record_sizes)
+    # code and size of each record id looked up once per record
+    records = dict((rec_id, (code, record_sizes[rec_id])) for code, rec_id in enumerate(record_ids))
+    # array.array keeps the memory usage low for millions of records
+    rec_codes = array('L')
+    rec_sizes = array('L')
+    add_code = rec_codes.append
+    add_size = rec_sizes.append
+    i = offset
+    while i + record_id_size <= end:
+        code, rec_size = records[unpack_id(data, i)[0]]
+        i += record_id_size
+        if not rec_size:
+            if i + 4 > end:
+                break
+            rec_size = unpack_vlsd_size(data, i)[0] + 4
+        if i + rec_size > end:
+            break
+        add_code(code)
+        add_size(rec_size)
+        i += rec_size + tail
+
+    return (record_ids,
+            frombuffer(rec_codes, dtype=rec_codes.typecode) if rec_codes else empty(0, dtype='int64'),
+            frombuffer(rec_sizes, dtype=rec_sizes.typecode) if rec_sizes else empty(0, dtype='int64'))
+
+
+def split_records(data, record_sizes, record_id_size=1, trailing_record_id=False):
+    """ split the records of an unsorted data block by record id
+
+    If all records have the same size the records are split with vectorized
+    numpy operations only. Otherwise the record boundaries are found first by
+    *scan_records*, which loops over the record headers in Python (one
+    iteration per record, see *scan_records*), and the record bytes are then
+    gathered for each record id with vectorized numpy operations.
+
+    Parameters
+    ----------
+    data : bytes
+        raw data block content
+    record_sizes : dict
+        record size (without the record id) for each record id; size 0 marks
+        variable length records (VLSD) that start with their uint32 length
+    record_id_size : int
+        record id size in bytes (1, 2, 4 or 8)
+    trailing_record_id : bool
+        the record id is repeated after each record (mdf version 3 with 2
+        record ids)
+
+    Returns
+    -------
+    records : dict
+        concatenated records for each record id; the VLSD records keep their
+        length prefix
+
+    """
+    records = dict.fromkeys(record_sizes, b'')
+    size = len(data)
+    if not size:
+        return records
+
+    tail = record_id_size if trailing_record_id else 0
+    raw = frombuffer(data, dtype=uint8)
+
+    strides = set(record_id_size + rec_size + tail for rec_size in record_sizes.values())
+    if len(strides) == 1 and 0 not in record_sizes.values():
+        # all the records have the same size
+        stride = strides.pop()
+        count = size // stride
+        rows = raw[:count * stride].reshape(count, stride)
+        ids = ndarray(shape=(count, ), dtype=RECORD_ID_FORMATS[record_id_size], buffer=data, strides=(stride, ))
+        for rec_id, rec_size in record_sizes.items():
+            records[rec_id] = rows[ids == rec_id, record_id_size: record_id_size + rec_size].tobytes()
+        return records
+
+    record_ids, rec_codes, rec_sizes = scan_records(data, record_sizes, record_id_size, trailing_record_id)
+
+    # label each byte with the record id code; the record id bytes get the
+    # extra code len(record_ids)
+    skip = len(record_ids)
+    label_type = uint8 if skip < 255 else uint16 if skip < 65535 else uint32
+    count = len(rec_codes)
+    labels = empty((count, 3), dtype=label_type)
+    labels[:, 0] = skip
+    labels[:, 1] = rec_codes
+    labels[:, 2] = skip
+    lengths = empty((count, 3), dtype='int64')
+    lengths[:, 0] = record_id_size
+    lengths[:, 1] = rec_sizes
+    lengths[:, 2] = tail
+    labels = repeat(labels.ravel(), lengths.ravel())[:size]
+    raw = raw[:len(labels)]
+
+    for code, rec_id in enumerate(record_ids):
+        records[rec_id] = raw[labels == code].tobytes()
+
+    return records
+
+
+def get_record_offsets(data, record_sizes, record_id_size=1, trailing_record_id=False, offset=0, size=None):
+    """ build the record offset index of an unsorted data block
+
+    The arguments are the same as for *scan_records*.
+
+    Returns
+    -------
+    offsets : dict
+        array of record start offsets (after the record id, relative to
+        *offset*) for each record id
+
+    """
+    record_ids, rec_codes, rec_sizes = scan_records(data, record_sizes, record_id_size, trailing_record_id, offset, size)
+    tail = record_id_size if trailing_record_id else 0
+    steps = rec_sizes.astype('int64') + record_id_size + tail
+    starts = cumsum(steps) - steps + record_id_size
+    return dict((rec_id, starts[rec_codes == code]) for code, rec_id in enumerate(record_ids))
+
+
+def gather_records(data, offsets, record_size, offset=0):
+    """ gather fixed size records from a buffer
+
+    Parameters
+    ----------
+    data : bytes | mmap
+        buffer that holds the data block
+    offsets : numpy.array
+        record start offsets relative to *offset*
+    record_size : int
+        record size in bytes
+    offset : int
+        data block offset inside *data*
+
+    Returns
+    -------
+    records : bytes
+        concatenated records
+
+    """
+    raw = frombuffer(data, dtype=uint8, offset=offset)
+    rows = empty((len(offsets), record_size), dtype=uint8)
+    # one byte column at a time keeps the temporary memory usage low
+    for i in range(record_size):
+        rows[:, i] = raw[i:][offsets]
+    return rows.tobytes()
+
+
+def build_data_block_index(blocks, record_size=0):
+    """ build the flattened index of the data blocks of a group
+
+    Parameters
+    ----------
+    blocks : list
+        (address, block type, raw data size) of each data block in data
+        order
+    record_size : int
+        record size in bytes; if 0 the *first_record* and *record_count*
+        fields are left 0 (unsorted data groups)
+
+    Returns
+    -------
+    index : numpy.array
+        structured array with the *DATA_BLOCK_INDEX_DTYPE* fields; records
+        that are split between two blocks are counted for both blocks
+
+    """
+    index = zeros(len(blocks), dtype=DATA_BLOCK_INDEX_DTYPE)
+    if blocks:
+        addresses, types, sizes = zip(*blocks)
+        index['address'] = addresses
+        index['type'] = types
+        index['size'] = sizes
+        index['offset'][1:] = cumsum(index['size'][:-1])
+        if record_size:
+            start = index['offset']
+            stop = start + index['size']
+            index['first_record'] = start // record_size
+            last = (stop + record_size - 1) // record_size
+            index['record_count'] = last - index['first_record']
+    return index
+
+
+def get_data_block_range(index, start, stop):
+    """ select the data blocks that cover a raw data byte range
+
+    Parameters
+    ----------
+    index : numpy.array
+        flattened data block index
+    start : int
+        first byte of the range
+    stop : int
+        end of the range (exclusive)
+
+    Returns
+    -------
+    blocks : numpy.array
+        index entries of the covering blocks, in data order
+
+    """
+    if stop <= start:
+        return index[:0]
+    offsets = index['offset']
+    first = max(int(searchsorted(offsets, start, side='right')) - 1, 0)
+    last = int(searchsorted(offsets, stop, side='left'))
+    return index[first: last]
+
+
+def search_records(get_value, value, lo, hi, side='left'):
+    """ binary search in the records *lo* to *hi* of a group with
+    monotonically increasing values, for example the master channel, that
+    reads only the probed records
+
+    Parameters
+    ----------
+    get_value : callable
+        called with a record index to get the value of the record
+    value : float
+        searched value
+    lo : int
+        first record of the search range
+    hi : int
+        end of the search range (exclusive)
+    side : str
+        'left' finds the first record with a value greater or equal than
+        *value* and 'right' the first record with a value greater than
+        *value*; see *numpy.searchsorted*
+
+    Returns
+    -------
+    index : int
+        record index; *hi* if no record matches
+
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_value = get_value(mid)
+        if mid_value < value or (side == 'right' and mid_value == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def transpose_bytes(data, rows, cols, out=None):
+    """ transpose the first *rows* x *cols* bytes of *data* (row major byte
+    matrix) into a column major buffer; the trailing bytes are copied
+    unchanged. This is the byte shuffle of the transposed deflate ##DZ
+    blocks. Large matrices are transposed tile by tile so that the source
+    and destination tiles stay in the CPU cache.
+
+    Parameters
+    ----------
+    data : bytes | bytearray | memoryview
+        source buffer
+    rows : int
+        number of rows
+    cols : int
+        number of columns
+    out : bytearray | memoryview
+        optional writable destination buffer of the same size as *data*
+
+    Returns
+    -------
+    out : bytearray | memoryview
+        transposed data
+
+    """
+    size = rows * cols
+    if out is None:
+        out = bytearray(len(data))
+    src = frombuffer(data, dtype=uint8, count=size).reshape((rows, cols))
+    dst = frombuffer(out, dtype=uint8, count=size).reshape((cols, rows))
+    if size <= TRANSPOSE_TILE_SIZE:
+        dst[:] = src.T
+    else:
+        col_step = min(cols, 256)
+        row_step = max(TRANSPOSE_TILE_SIZE // col_step, 1)
+        for col in range(0, cols, col_step):
+            for row in range(0, rows, row_step):
+                dst[col: col + col_step, row: row + row_step] = src[row: row + row_step, col: col + col_step].T
+    out[size:] = data[size:]
+    return out
+
+
+def get_record_view(data, record_size, fields):
+    """ zero-copy structured view of records; the fields are described by an
+    offset based structured dtype so each field is a strided view into *data*
+    and no record bytes are copied
+
+    Parameters
+    ----------
+    data : bytes | mmap | numpy.array
+        records buffer
+    record_size : int
+        record size in bytes
+    fields : list
+        list of (field name, numpy format, byte offset inside the record)
+        tuples; the fields can overlap
+
+    Returns
+    -------
+    records : numpy.array
+        read-only structured array
+
+    """
+    types = dtype({'names': [field[0] for field in fields],
+                   'formats': [field[1] for field in fields],
+                   'offsets': [field[2] for field in fields],
+                   'itemsize': record_size})
+    count = len(data) // record_size if record_size else 0
+    return frombuffer(data, dtype=types, count=count)
+
+
+class RecordLayout(object):
+    """ compiled record layout of a channel group; the channel formats and
+    bit field descriptions are computed once and all the channels that can be
+    read as a numpy dtype are described by a single offset based structured
+    dtype (field *ch{index}* for the channel *index*)
+
+    Parameters
+    ----------
+    record_size : int
+        record size in bytes
+    formats : list
+        numpy format of each channel
+    byte_offsets : list
+        byte offset of each channel inside the record
+    bitfields : list
+        bit field description of each channel or *None*; see
+        *get_bitfield_values*
+    packed : list
+        bit field description of each packed integer channel (bit fields and
+        byte aligned channels that need a bit shift or mask) or *None*
+
+    """
+    def __init__(self, record_size, formats, byte_offsets, bitfields, packed):
+        self.record_size = record_size
+        self.formats = list(formats)
+        self.byte_offsets = list(byte_offsets)
+        self.bitfields = list(bitfields)
+        self.packed = list(packed)
+
+        names = []
+        fmts = []
+        offsets = []
+        for i, (fmt, byte_offset, bitfield) in enumerate(zip(formats, byte_offsets, bitfields)):
+            if bitfield:
+                continue
+            try:
+                size = dtype(fmt).itemsize
+            except TypeError:
+                # formats without numpy dtype are read by the slow path
+                continue
+            if size and byte_offset + size <= record_size:
+                names.append('ch{}'.format(i))
+                fmts.append(fmt)
+                offsets.append(byte_offset)
+        self.dtype = dtype({'names': names,
+                            'formats': fmts,
+                            'offsets': offsets,
+                            'itemsize': record_size})
+
+    def get_records(self, data):
+        """ read-only zero-copy structured view of the records """
+        count = len(data) // self.record_size if self.record_size else 0
+        return frombuffer(data, dtype=self.dtype, count=count)
+
+    def get_channel_view(self, data, index):
+        """ read-only zero-copy view of the raw values of the channel *index* """
+        name = 'ch{}'.format(index)
+        if name in self.dtype.fields:
+            return self.get_records(data)[name]
+        else:
+            return get_channel_view(data, self.record_size, self.formats[index], self.byte_offsets[index])
+
+
+def get_channel_view(data, record_size, fmt, byte_offset):
+    """ zero-copy view of a channel's raw values
+
+    Parameters
+    ----------
+    data : bytes | mmap | numpy.array
+        records buffer
+    record_size : int
+        record size in bytes
+    fmt : str
+        numpy format of the channel values
+    byte_offset : int
+        channel byte offset inside the record
+
+    Returns
+    -------
+    vals : numpy.array
+        read-only view of the channel values
+
+    """
+    return get_record_view(data, record_size, [('vals', fmt, byte_offset)])['vals']
+
+
+class VariableLengthArray(object):
+    """ variable length values stored as an offsets and a values buffer
+    (Arrow style layout); the value *i* is *values[offsets[i]: offsets[i+1]]*
+
+    The fixed width bytes and str arrays are only built on request and are
+    cached.
+
+    Parameters
+    ----------
+    offsets : numpy.array
+        int64 array of *len(self) + 1* value start offsets inside *values*
+    values : numpy.array
+        uint8 array with the concatenated values
+
+    Examples
+    --------
+    >>> vlsd = mdf.get_channel_data('CAN_DataFrame.ID', lazy_vlsd=True)
+    >>> vlsd[0]
+    b'...'
+    >>> vlsd.as_bytes()
+    >>> vlsd.as_str('utf-8')
+
+    """
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+        self._bytes = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """ get a single value as bytes, or a *VariableLengthArray* for
+        slices and integer or boolean index arrays
+
+        Negative indexes count from the end like for lists; an index outside
+        the array raises IndexError.
+
+        """
+        size = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(size)
+            if step == 1:
+                offsets = self.offsets[start: max(start, stop) + 1]
+                return VariableLengthArray(offsets - offsets[0],
+                                           self.values[offsets[0]: offsets[-1]])
+            index = arange(start, stop, step)
+
+        index = asarray(index)
+        if index.dtype == bool:
+            index = arange(size)[index]
+        elif not issubdtype(index.dtype, integer):
+            raise IndexError('VariableLengthArray indexes must be integers, slices or arrays')
+        index = index.astype(int64)
+        if ((index < -size) | (index >= size)).any():
+            raise IndexError('VariableLengthArray index out of range')
+        index = index + (index < 0) * size
+
+        if not index.ndim:
+            index = int(index)
+            return self.values[self.offsets[index]: self.offsets[index + 1]].tobytes()
+
+        starts = self.offsets[index]
+        lengths = self.offsets[index + 1] - starts
+        offsets = concatenate((zeros(1, dtype=int64), cumsum(lengths)))
+        # byte positions of the selected values inside *values*
+        positions = repeat(starts - offsets[:-1], lengths) + arange(offsets[-1])
+        return VariableLengthArray(offsets, self.values[positions])
+
+    def __iter__(self):
+        values = self.values
+        offsets = self.offsets
+        for i in range(len(self)):
+            yield values[offsets[i]: offsets[i + 1]].tobytes()
+
+    def __array__(self, dtype=None, copy=None):
+        vals = self.as_bytes()
+        return vals if dtype is None else vals.astype(dtype)
+
+    @property
+    def lengths(self):
+        """ byte length of each value """
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def as_bytes(self):
+        """ fixed width bytes array of the values; the width is given by the
+        longest value
+
+        Returns
+        -------
+        vals : numpy.array
+            bytes array
+
+        """
+        if self._bytes is None:
+            lengths = self.lengths
+            starts = self.offsets[:-1]
+            width = int(lengths.max()) if len(lengths) else 0
+            rows = zeros((len(lengths), max(width, 1)), dtype=uint8)
+            # one byte column at a time keeps the temporary memory usage low
+            for i in range(width):
+                idx = lengths > i
+                rows[idx, i] = self.values[starts[idx] + i]
+            self._bytes = rows.view('S{}'.format(max(width, 1))).ravel()
+        return self._bytes
+
+    def as_str(self, encoding='utf-8'):
+        """ fixed width str array of the values
+
+        Parameters
+        ----------
+        encoding : str
+            values encoding; default 'utf-8'
+
+        Returns
+        -------
+        vals : numpy.array
+            str array
+
+        """
+        return char.decode(self.as_bytes(), encoding)
+
+
+def decode_signal_data(signal_data, offsets):
+    """ decode the VLSD channel values from the signal data; the signal data
+    is a sequence of values prefixed by their uint32 byte length and the
+    channel raw values are the offsets of the length prefixes
+
+    Parameters
+    ----------
+    signal_data : bytes
+        signal data blocks data
+    offsets : numpy.array
+        value offsets inside *signal_data*
+
+    Returns
+    -------
+    vals : VariableLengthArray
+        decoded values
+
+    """
+    raw = frombuffer(signal_data, dtype=uint8)
+    offsets = offsets.astype(int64)
+    count = len(offsets)
+    if not count:
+        return VariableLengthArray(zeros(1, dtype=int64), zeros(0, dtype=uint8))
+
+    prefixes = offsets.reshape(-1, 1) + arange(4)
+    lengths = raw[prefixes].view('<u4').ravel().astype(int64)
+    value_offsets = concatenate(([0, ], cumsum(lengths)))
+    starts = offsets + 4
+
+    if offsets[0] == 0 and starts[-1] + lengths[-1] == len(raw) and (starts[1:] == starts[:-1] + lengths[:-1] + 4).all():
+        # the values are stored back to back in order; only the length
+        # prefixes have to be dropped
+        keep = ones(len(raw), dtype=bool)
+        keep[prefixes] = False
+        values = raw[keep]
+    else:
+        positions = arange(value_offsets[-1], dtype=int64) + repeat(starts - value_offsets[:-1], lengths)
+        values = raw[positions]
+
+    return VariableLengthArray(value_offsets, values)
+
+
+def canopen_date_to_datetime64(dates):
+    """ convert CANopen DATE values to datetime64 timestamps
+
+    Parameters
+    ----------
+    dates : numpy.array
+        structured array with the *ms*, *min*, *hour*, *day*, *month* and
+        *year* uint fields of the CANopen DATE values
+
+    Returns
+    -------
+    timestamps : numpy.array
+        datetime64[ms] array; the invalid dates are *NaT*
+
+    """
+    # the year is counted from 2000
+    years = (dates['year'] & 0x7F).astype(int64) + 30
+    months = years * 12 + (dates['month'] & 0x3F).astype(int64) - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + ((dates['day'] & 0x1F).astype(int64) - 1)
+    ms = ((dates['hour'] & 0x1F).astype(int64) * 60 + (dates['min'] & 0x3F)) * 60000 + dates['ms']
+    timestamps = days.astype('datetime64[ms]') + ms.astype('timedelta64[ms]')
+    # zero day or month fields are invalid dates
+    timestamps[((dates['month'] & 0x3F) == 0) | ((dates['day'] & 0x1F) == 0)] = datetime64('NaT')
+    return timestamps
+
+
+def canopen_time_to_datetime64(times):
+    """ convert CANopen TIME values to datetime64 timestamps
+
+    Parameters
+    ----------
+    times : numpy.array
+        structured array with the *ms* (milliseconds after midnight) and
+        *days* (days since 1984-01-01) uint fields of the CANopen TIME values
+
+    Returns
+    -------
+    timestamps : numpy.array
+        datetime64[ms] array
+
+    """
+    days = times['days'].astype('timedelta64[D]') + datetime64('1984-01-01', 'D')
+    return days.astype('datetime64[ms]') + (times['ms'] & 0xFFFFFFF).astype('timedelta64[ms]')
+
+
+def get_bitfield_values(data, record_size, byte_offset, bit_offset, bits, signed=False, big_endian=False):
+    """ extract an integer bit field from the records; the field bytes are
+    gathered into uint64 words, shifted and masked and the signed values are
+    sign extended. Any width up to 64 bits and any bit offset is supported,
+    including the byte sizes that have no numpy dtype (3, 5, 6 and 7 bytes).
+
+    Parameters
+    ----------
+    data : bytes | mmap | numpy.array
+        records buffer
+    record_size : int
+        record size in bytes
+    byte_offset : int
+        byte offset of the field inside the record
+    bit_offset : int
+        bit offset of the field's least significant bit
+    bits : int
+        field bit count
+    signed : bool
+        two's complement signed field
+    big_endian : bool
+        Motorola byte order; the field bytes are read as a big endian integer
+
+    Returns
+    -------
+    vals : numpy.array
+        field values with the smallest integer dtype that holds *bits*
+
+    """
+    count = len(data) // record_size if record_size else 0
+    byte_count = (bit_offset + bits + 7) // 8
+    records = frombuffer(data, dtype=uint8, count=count * record_size).reshape(count, record_size)
+    fields = records[:, byte_offset: byte_offset + byte_count]
+
+    low = fields[:, -8:] if big_endian else fields[:, :8]
+    size = low.shape[1]
+
+    words = zeros((count, 8), dtype=uint8)
+    if big_endian:
+        words[:, 8 - size:] = low
+        vals = words.view('>u8').ravel().astype(uint64)
+    else:
+        words[:, :size] = low
+        vals = words.view('<u8').ravel().astype(uint64)
+
+    if bit_offset:
+        vals >>= uint64(bit_offset)
+        if byte_count > 8:
+            # the ninth byte is only needed by wide fields with a bit offset
+            high = fields[:, 0] if big_endian else fields[:, 8]
+            vals |= high.astype(uint64) << uint64(64 - bit_offset)
+    if bits < 64:
+        vals &= uint64((1 << bits) - 1)
+
+    return _finalize_bitfield(vals, bits, signed)
+
+
+def _finalize_bitfield(vals, bits, signed):
+    """ sign extend the masked uint64 bit field values and cast them to the
+    smallest integer dtype that holds *bits* """
+    if signed:
+        vals = vals.view(int64)
+        if bits < 64:
+            sign = 1 << (bits - 1)
+            vals = (vals ^ sign) - sign
+
+    for size in (1, 2, 4, 8):
+        if bits <= size * 8:
+            break
+    return vals.astype('{}{}'.format('i' if signed else 'u', size))
+
+
+def get_packed_values(data, record_size, fields):
+    """ extract several integer bit fields from the records in one pass; the
+    fields are grouped in windows of up to 8 bytes, each window is gathered
+    only once into uint64 words and all its fields are derived from the
+    words with broadcast shift and mask operations
+
+    Parameters
+    ----------
+    data : bytes | mmap | numpy.array
+        records buffer
+    record_size : int
+        record size in bytes
+    fields : list
+        list of (byte offset, bit offset, bit count, signed, big endian)
+        tuples as used by *get_bitfield_values*
+
+    Returns
+    -------
+    values : list
+        field values in the order of *fields*
+
+    """
+    count = len(data) // record_size if record_size else 0
+    records = frombuffer(data, dtype=uint8, count=count * record_size).reshape(count, record_size)
+    values = [None, ] * len(fields)
+
+    windows = []
+    order = sorted(range(len(fields)), key=lambda i: (fields[i][4], fields[i][0]))
+    for i in order:
+        byte_offset, bit_offset, bits, signed, big_endian = fields[i]
+        end = byte_offset + (bit_offset + bits + 7) // 8
+        if end - byte_offset > 8:
+            # 64 bit fields with a bit offset span 9 bytes
+            values[i] = get_bitfield_values(data, record_size, *fields[i])
+        elif windows and windows[-1][1] == big_endian and end <= windows[-1][0] + 8:
+            windows[-1][2].append(i)
+        else:
+            windows.append((byte_offset, big_endian, [i, ]))
+
+    for start, big_endian, indexes in windows:
+        size = min(8, record_size - start)
+        words = zeros((count, 8), dtype=uint8)
+        if big_endian:
+            words[:, 8 - size:] = records[:, start: start + size]
+            words = words.view('>u8').ravel().astype(uint64)
+        else:
+            words[:, :size] = records[:, start: start + size]
+            words = words.view('<u8').ravel().astype(uint64)
+
+        shifts = []
+        masks = []
+        for i in indexes:
+            byte_offset, bit_offset, bits = fields[i][:3]
+            if big_endian:
+                last = byte_offset + (bit_offset + bits + 7) // 8 - 1
+                shifts.append(8 * (start + size - 1 - last) + bit_offset)
+            else:
+                shifts.append(8 * (byte_offset - start) + bit_offset)
+            masks.append((1 << bits) - 1)
+        shifts = asarray(shifts, dtype=uint64)
+        masks = asarray(masks, dtype=uint64)
+
+        packed = (words.reshape(-1, 1) >> shifts) & masks
+        for j, i in enumerate(indexes):
+            values[i] = _finalize_bitfield(packed[:, j], fields[i][2], fields[i][3])
+
+    return values
+
+
+def shift_mask(vals, bit_offset=0, bits=0):
+    """ extract the channel value bits from the raw integer values
+
+    Parameters
+    ----------
+    vals : numpy.array
+        raw values
+    bit_offset : int
+        bit offset of the channel value inside the raw values
+    bits : int
+        channel bit count; the values are masked if it is not a multiple of 8
+
+    Returns
+    -------
+    vals : numpy.array
+        channel values
+
+    """
+    if bit_offset:
+        vals = vals >> bit_offset
+    if bits % 8:
+        vals = vals & (2**bits - 1)
+    return vals
+
+
+def get_raw_expression(name, raw, bit_offset=0, bits=0):
+    """ numexpr expression that does the *shift_mask* operation on the
+    variable *name*; the masking is written as a modulo so it can only be
+    fused for unsigned integers that fit in numexpr's int64
+
+    Parameters
+    ----------
+    name : str
+        raw values variable name
+    raw : numpy.array
+        raw values
+    bit_offset : int
+        bit offset of the channel value inside the raw values
+    bits : int
+        channel bit count
+
+    Returns
+    -------
+    expression : str | None
+        raw values expression or *None* if the operation cannot be fused
+
+    """
+    mask = bits % 8
+    if not bit_offset and not mask:
+        return name
+    if raw.dtype.kind != 'u' or raw.dtype.itemsize > 4:
+        return None
+    expression = name
+    if bit_offset:
+        expression = '({} >> {})'.format(expression, bit_offset)
+    if mask:
+        expression = '({} % {})'.format(expression, 2**bits)
+    return expression
+
+
+def evaluate_conversion(expression, local_dict, size, out=None, dtype=None):
+    """ evaluate a conversion expression with numexpr; the expression is
+    computed in blocks on all the numexpr threads so no full length
+    temporaries are created
+
+    Parameters
+    ----------
+    expression : str
+        numexpr expression
+    local_dict : dict
+        expression variables
+    size : int
+        number of samples
+    out : numpy.array
+        optional output array
+    dtype : numpy.dtype
+        optional result dtype (for example float32 or float64); ignored if
+        *out* is given
+
+    Returns
+    -------
+    vals : numpy.array
+        expression result
+
+    """
+    if out is None and dtype is not None:
+        out = empty(size, dtype=dtype)
+    if out is None:
+        return evaluate(expression, local_dict=local_dict)
+    else:
+        evaluate(expression, local_dict=local_dict, out=out, casting='unsafe')
+        return out
+
+
 def dtype_mapping(invalue, outversion=3):
     """ map data types between mdf versions 3 and 4
 
@@ -4,18 +4,45 @@ PYVERSION = sys.version_info[0]
 
 import time
 import os
-from struct import unpack, pack
+from struct import unpack, pack, unpack_from, Struct
 
+import re
 from functools import partial
 
+from numpy import array, interp, searchsorted, clip, float64
+
 try:
     from blosc import compress, decompress
     compress = partial(compress, clevel=7)
 
+    def compress_records(data, record_size):
+        """ compress records; the record size is used as blosc type size so
+        the byte shuffle groups the same byte of all the records """
+        return compress(data, typesize=record_size if 0 < record_size <= 255 else 1)
+
 except ImportError:
     from zlib import compress, decompress
 
+    def compress_records(data, record_size):
+        """ compress records """
+        return compress(data)
+
 from .v3constants import *
+from .utils import MdfException, shift_mask, get_raw_expression, evaluate_conversion, COMPRESSION_CHUNK_SIZE
+
+
+# precompiled parsers for the fixed size blocks
+unpack_channel = Struct(FMT_CHANNEL).unpack_from
+unpack_channel_group = Struct(FMT_CHANNEL_GROUP).unpack_from
+unpack_data_group = Struct(FMT_DATA_GROUP).unpack_from
+unpack_conversion_common = Struct(FMT_CONVERSION_COMMON_SHORT).unpack_from
+unpack_source_common = Struct(FMT_SOURCE_COMMON).unpack_from
+unpack_source_ecu = Struct(FMT_SOURCE_EXTRA_ECU).unpack_from
+unpack_source_vector = Struct(FMT_SOURCE_EXTRA_VECTOR).unpack_from
+unpack_header_common = Struct(HEADER_COMMON_FMT).unpack_from
+unpack_header_extra = Struct(HEADER_POST_320_EXTRA_FMT).unpack_from
+unpack_identification = Struct(ID_FMT).unpack_from
+unpack_block_header = Struct('<2sH').unpack_from
 
 
 __all__ = ['Channel',
@@ -23,6 +50,7 @@ __all__ = ['Channel',
            'ChannelDependency',
            'ChannelExtension',
            'ChannelGroup',
+           'CompiledConversion',
            'DataBlock',
            'DataGroup',
            'FileIdentificationBlock',
@@ -33,6 +61,42 @@ __all__ = ['Channel',
            'TriggerBlock']
 
 
+def read_block(kargs, address, size=None):
+    """get the buffer that holds the raw bytes of a block loaded from file
+
+    If the *buffer* keyword argument is given (bytes, bytearray or mmap of the
+    whole file) the block is parsed in place. Otherwise the block is read
+    from the *file_stream*.
+
+    Parameters
+    ----------
+    kargs : dict
+        block keyword arguments
+    address : int
+        block address inside the file
+    size : int
+        block size; if *None* the *block_len* field of the block is used
+
+    Returns
+    -------
+    block, offset : bytes | mmap, int
+        buffer and the block offset inside the buffer
+
+    """
+    if 'buffer' in kargs:
+        return kargs['buffer'], address
+    else:
+        stream = kargs['file_stream']
+        stream.seek(address, SEEK_START)
+        if size is None:
+            block = stream.read(4)
+            size = unpack_block_header(block)[1]
+            block += stream.read(size - 4)
+        else:
+            block = stream.read(size)
+        return block, 0
+
+
 class Channel(dict):
     ''' CNBLOCK class derived from *dict*
 
@@ -72,6 +136,8 @@ class Channel(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -99,10 +165,8 @@ class Channel(dict):
         self.name = ''
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
-            block = stream.read(CN_BLOCK_SIZE)
+            block, offset = read_block(kargs, address, CN_BLOCK_SIZE)
 
             (self['id'],
              self['block_len'],
@@ -123,7 +187,7 @@ class Channel(dict):
              self['sampling_rate'],
              self['long_name_addr'],
              self['display_name_addr'],
-             self['aditional_byte_offset']) = unpack(FMT_CHANNEL, block)
+             self['aditional_byte_offset']) = unpack_channel(block, offset)
 
         except KeyError:
 
@@ -214,6 +278,8 @@ class ChannelConversion(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -235,41 +301,41 @@ class ChannelConversion(dict):
         super(ChannelConversion, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
-            block = stream.read(4)
+            block, offset = read_block(kargs, address)
             (self['id'],
-             self['block_len']) = unpack('<2sH', block)
+             self['block_len']) = unpack_block_header(block, offset)
             size = self['block_len']
-            block += stream.read(size - 4)
 
             (self['range_flag'],
              self['min_phy_value'],
              self['max_phy_value'],
              self['unit'],
              self['conversion_type'],
-             self['ref_param_nr']) = unpack(FMT_CONVERSION_COMMON_SHORT, block[4:CC_COMMON_BLOCK_SIZE])
+             self['ref_param_nr']) = unpack_conversion_common(block, offset + 4)
 
             conv_type = self['conversion_type']
+            block_start = offset
+            offset += CC_COMMON_BLOCK_SIZE
 
             if conv_type == CONVERSION_TYPE_NONE:
                 pass
             elif conv_type == CONVERSION_TYPE_FORMULA:
-                self['formula'] = unpack('<{}s'.format(size - 46), block[CC_COMMON_BLOCK_SIZE:])[0]
+                self['formula'] = unpack_from('<{}s'.format(size - 46), block, offset)[0]
 
             elif conv_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TABX):
                 nr = self['ref_param_nr']
-                values = unpack('<{}d'.format(2*nr), block[CC_COMMON_BLOCK_SIZE:])
+                values = unpack_from('<{}d'.format(2*nr), block, offset)
                 for i in range(nr):
                     (self['raw_{}'.format(i)],
                      self['phys_{}'.format(i)]) = values[i*2], values[2*i+1]
 
             elif conv_type == CONVERSION_TYPE_LINEAR:
                 (self['b'],
-                 self['a']) = unpack('<2d', block[CC_COMMON_BLOCK_SIZE: CC_LIN_BLOCK_SIZE])
+                 self['a']) = unpack_from('<2d', block, offset)
                 if not size == CC_LIN_BLOCK_SIZE:
-                    self['CANapeHiddenExtra'] = block[CC_LIN_BLOCK_SIZE:]
+                    start = block_start + CC_LIN_BLOCK_SIZE
+                    self['CANapeHiddenExtra'] = block[start: block_start + size]
 
             elif conv_type in (CONVERSION_TYPE_POLY, CONVERSION_TYPE_RAT):
                 (self['P1'],
@@ -277,7 +343,7 @@ class ChannelConversion(dict):
                  self['P3'],
                  self['P4'],
                  self['P5'],
-                 self['P6']) = unpack('<6d', block[CC_COMMON_BLOCK_SIZE: CC_POLY_BLOCK_SIZE])
+                 self['P6']) = unpack_from('<6d', block, offset)
 
             elif conv_type in (CONVERSION_TYPE_EXPO, CONVERSION_TYPE_LOGH):
                 (self['P1'],
@@ -286,12 +352,12 @@ class ChannelConversion(dict):
                  self['P4'],
                  self['P5'],
                  self['P6'],
-                 self['P7']) = unpack('<7d', block[CC_COMMON_BLOCK_SIZE: CC_EXPO_BLOCK_SIZE])
+                 self['P7']) = unpack_from('<7d', block, offset)
 
             elif conv_type == CONVERSION_TYPE_VTAB:
                 nr = self['ref_param_nr']
 
-                values = unpack('<' + 'd32s' * nr, block[CC_COMMON_BLOCK_SIZE:])
+                values = unpack_from('<' + 'd32s' * nr, block, offset)
 
                 for i in range(nr):
                     (self['param_val_{}'.format(i)],
@@ -300,7 +366,7 @@ class ChannelConversion(dict):
             elif conv_type == CONVERSION_TYPE_VTABR:
                 nr = self['ref_param_nr']
 
-                values = unpack('<' + '2dI' * nr, block[CC_COMMON_BLOCK_SIZE:])
+                values = unpack_from('<' + '2dI' * nr, block, offset)
                 for i in range(nr):
                     (self['lower_{}'.format(i)],
                      self['upper_{}'.format(i)],
@@ -461,6 +527,45 @@ class ChannelConversion(dict):
 
         return pack(fmt, *[self[key] for key in keys])
 
+    def __setitem__(self, item, value):
+        # the compiled conversion is rebuilt after the block fields change
+        self.__dict__.pop('_compiled', None)
+        super(ChannelConversion, self).__setitem__(item, value)
+
+    def compile(self, texts=None):
+        """get the array backed form of the conversion. It is built on the
+        first call and reused afterwards, so the conversion parameters are
+        collected from the block keys only once. Changing the block fields
+        discards the compiled conversion.
+
+        Parameters
+        ----------
+        texts : dict
+            TextBlock objects of the VTABR conversion texts (*text_{n}* keys)
+
+        Returns
+        -------
+        compiled : CompiledConversion
+            compiled conversion
+
+        Raises
+        ------
+        MdfException : if the conversion was compiled with other texts
+
+        """
+        texts = texts or {}
+        try:
+            compiled_texts, compiled = self._compiled
+        except AttributeError:
+            compiled = CompiledConversion(self, texts)
+            self._compiled = texts, compiled
+            return compiled
+        # the shared conversion blocks must be compiled with the same texts
+        # for all the channels
+        if texts != compiled_texts:
+            raise MdfException('The conversion is already compiled with other conversion texts')
+        return compiled
+
 
 class ChannelDependency(dict):
     ''' CDBLOCK class derived from *dict*
@@ -487,6 +592,8 @@ class ChannelDependency(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -500,17 +607,16 @@ class ChannelDependency(dict):
         super(ChannelDependency, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['block_len'],
              self['dependency_type'],
-             self['sd_nr']) = unpack('<2s3H', stream.read(50))
+             self['sd_nr']) = unpack_from('<2s3H', block, offset)
 
             links_size = 3 * 4 * self['sd_nr']
-            links = unpack('<{}I'.format(3 * self['sd_nr']), stream.read(links_size))
+            links = unpack_from('<{}I'.format(3 * self['sd_nr']), block, offset + 8)
 
             for i in range(self['sd_nr']):
                 self['dg_{}'.format(i)] = links[i]
@@ -520,7 +626,7 @@ class ChannelDependency(dict):
             optional_dims_nr = (self['block_len'] - 50 - links_size) // 2
             self['optional_dims_nr'] = optional_dims_nr
             if optional_dims_nr:
-                dims = unpack('<{}H'.format(optional_dims_nr), stream.read(optional_dims_nr * 2))
+                dims = unpack_from('<{}H'.format(optional_dims_nr), block, offset + 8 + links_size)
                 for i, dim in enumerate(dims):
                     self['dim_{}'.format(i)] = dim
 
@@ -576,6 +682,8 @@ class ChannelExtension(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -589,26 +697,24 @@ class ChannelExtension(dict):
         super(ChannelExtension, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address)
             (self['id'],
              self['block_len'],
-             self['type']) = unpack(FMT_SOURCE_COMMON, stream.read(6))
-            block = stream.read(self['block_len'] - 6)
+             self['type']) = unpack_source_common(block, offset)
 
             if self['type'] == SOURCE_ECU:
                 (self['module_nr'],
                  self['module_address'],
                  self['description'],
                  self['ECU_identification'],
-                 self['reserved0']) = unpack(FMT_SOURCE_EXTRA_ECU, block)
+                 self['reserved0']) = unpack_source_ecu(block, offset + 6)
             elif self['type'] == SOURCE_VECTOR:
                 (self['CAN_id'],
                  self['CAN_ch_index'],
                  self['message_name'],
                  self['sender_name'],
-                 self['reserved0']) = unpack(FMT_SOURCE_EXTRA_VECTOR, block)
+                 self['reserved0']) = unpack_source_vector(block, offset + 6)
         except KeyError:
 
             self.address = 0
@@ -664,6 +770,8 @@ class ChannelGroup(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -687,10 +795,8 @@ class ChannelGroup(dict):
         super(ChannelGroup, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
-            block = stream.read(CG_BLOCK_SIZE)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['block_len'],
@@ -700,9 +806,9 @@ class ChannelGroup(dict):
              self['record_id'],
              self['ch_nr'],
              self['samples_byte_nr'],
-             self['cycles_nr']) = unpack(FMT_CHANNEL_GROUP, block)
+             self['cycles_nr']) = unpack_channel_group(block, offset)
             if self['block_len'] == CG33_BLOCK_SIZE:
-                self['sample_reduction_addr'] = unpack('<I', stream.read(4))[0]
+                self['sample_reduction_addr'] = unpack_from('<I', block, offset + CG_BLOCK_SIZE)[0]
             else:
                 self['sample_reduction_addr'] = 0
         except KeyError:
@@ -728,6 +834,175 @@ class ChannelGroup(dict):
         return pack(fmt, *[self[key] for key in keys])
 
 
+class CompiledConversion(object):
+    """ array backed form of a ChannelConversion; the conversion parameters
+    are collected once and the conversion is applied to the raw channel
+    values with the *apply* method
+
+    The algebraic conversions (linear, polynomial, rational, exponential,
+    logarithmic and formula) are compiled together with the bit shift and
+    mask of the raw values into a single numexpr expression that is
+    evaluated multithreaded without full length temporaries.
+
+    Parameters
+    ----------
+    conversion : ChannelConversion
+        channel conversion; *None* for channels without conversion
+    texts : dict
+        TextBlock objects of the VTABR conversion texts (*text_{n}* keys)
+
+    Attributes
+    ----------
+    conversion_type : int
+        conversion type
+    expression : str | None
+        numexpr expression of the algebraic conversions
+    info : dict | None
+        VTAB and VTABR conversion information returned by *MDF3.get*; *None*
+        for the other conversion types
+
+    Examples
+    --------
+    >>> compiled = conversion.compile()
+    >>> phys = compiled.apply(raw)
+    >>> phys = compiled.apply(raw, dtype=numpy.float32)
+
+    """
+    def __init__(self, conversion=None, texts=None):
+        self.info = None
+        self.expression = None
+        self.params = {}
+        self.variable = 'X'
+        if conversion is None:
+            self.conversion_type = CONVERSION_TYPE_NONE
+            return
+
+        conv_type = self.conversion_type = conversion['conversion_type']
+        nr = conversion['ref_param_nr']
+
+        if conv_type == CONVERSION_TYPE_LINEAR:
+            a, b = conversion['a'], conversion['b']
+            if (a, b) == (1, 0):
+                self.expression = 'X'
+            else:
+                self.expression = 'X * a + b'
+                self.params = {'a': float(a), 'b': float(b)}
+
+        elif conv_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TABX):
+            self.raw = array([conversion['raw_{}'.format(i)] for i in range(nr)])
+            self.phys = array([conversion['phys_{}'.format(i)] for i in range(nr)])
+
+        elif conv_type == CONVERSION_TYPE_VTAB:
+            raw = array([conversion['param_val_{}'.format(i)] for i in range(nr)])
+            phys = array([conversion['text_{}'.format(i)] for i in range(nr)])
+            self.info = {'raw': raw, 'phys': phys, 'type': CONVERSION_TYPE_VTAB}
+
+        elif conv_type == CONVERSION_TYPE_VTABR:
+            texts = texts or {}
+            phys = array([texts.get('text_{}'.format(i), {}).get('text', b'') for i in range(nr)])
+            lower = array([conversion['lower_{}'.format(i)] for i in range(nr)])
+            upper = array([conversion['upper_{}'.format(i)] for i in range(nr)])
+            self.info = {'lower': lower, 'upper': upper, 'phys': phys, 'type': CONVERSION_TYPE_VTABR}
+
+        elif conv_type == CONVERSION_TYPE_POLY:
+            self.params = {'P{}'.format(i): float(conversion['P{}'.format(i)]) for i in range(1, 7)}
+            self.expression = '(P2 - (P4 * (X - P5 - P6))) / (P3 * (X - P5 - P6) - P1)'
+
+        elif conv_type == CONVERSION_TYPE_RAT:
+            # the parameters are multiplied first to avoid integer overflows
+            self.params = {'P{}'.format(i): float(conversion['P{}'.format(i)]) for i in range(1, 7)}
+            self.expression = '(P1 * X * X + P2 * X + P3) / (P4 * X * X + P5 * X + P6)'
+
+        elif conv_type in (CONVERSION_TYPE_EXPO, CONVERSION_TYPE_LOGH):
+            func = 'log' if conv_type == CONVERSION_TYPE_EXPO else 'exp'
+            self.params = {'P{}'.format(i): float(conversion['P{}'.format(i)]) for i in range(1, 8)}
+            if self.params['P4'] == 0:
+                self.expression = func + '(((X - P7) * P6 - P3) / P1) / P2'
+            elif self.params['P1'] == 0:
+                self.expression = func + '((P3 / (X - P7) - P6) / P4) / P5'
+            else:
+                raise ValueError('wrong conversion type {}'.format(conv_type))
+
+        elif conv_type == CONVERSION_TYPE_FORMULA:
+            self.expression = conversion['formula'].decode('latin-1').strip('\x00')
+            self.variable = 'X1'
+
+    def apply(self, raw, bit_offset=0, bits=0, out=None, dtype=None):
+        """ convert the raw channel values to physical values
+
+        Parameters
+        ----------
+        raw : numpy.array
+            raw channel values
+        bit_offset : int
+            bit offset of the channel value inside the raw values
+        bits : int
+            channel bit count; the raw values are masked if it is not a
+            multiple of 8
+        out : numpy.array
+            optional output array for the physical values; the result is cast
+            to the *out* dtype
+        dtype : numpy.dtype
+            optional physical values dtype (for example float32 or float64);
+            ignored if *out* is given; by default the algebraic conversions
+            keep the dtype of float channels and return float64 values for
+            integer channels
+
+        Returns
+        -------
+        phys : numpy.array
+            physical values; the raw values are returned for the text
+            conversions (VTAB and VTABR) and for channels without conversion
+
+        """
+        conv_type = self.conversion_type
+        expression = self.expression
+
+        if expression is not None:
+            variable = self.variable
+            if expression == variable and out is None and dtype is None:
+                return shift_mask(raw, bit_offset, bits)
+            if out is None and dtype is None and raw.dtype.kind == 'f':
+                # the parameters are float64 scalars; float32 channels keep
+                # their dtype instead of being upcast
+                dtype = raw.dtype.newbyteorder('=')
+            if raw.dtype.kind == 'u' and raw.dtype.itemsize == 8:
+                # numexpr has no uint64 support
+                raw = shift_mask(raw, bit_offset, bits).astype(float64)
+                raw_expression = variable
+            else:
+                raw_expression = get_raw_expression(variable, raw, bit_offset, bits)
+                if raw_expression is None:
+                    raw = shift_mask(raw, bit_offset, bits)
+                    raw_expression = variable
+            if raw_expression != variable:
+                expression = re.sub(r'\b{}\b'.format(variable), raw_expression, expression)
+            local_dict = dict(self.params)
+            local_dict[variable] = raw
+            return evaluate_conversion(expression, local_dict, len(raw), out, dtype)
+
+        vals = shift_mask(raw, bit_offset, bits)
+
+        if conv_type == CONVERSION_TYPE_TABI:
+            vals = interp(vals, self.raw, self.phys)
+
+        elif conv_type == CONVERSION_TYPE_TABX:
+            idx = searchsorted(self.raw, vals)
+            idx = clip(idx, 0, len(self.raw) - 1)
+            vals = self.phys[idx]
+
+        else:
+            return vals
+
+        if out is not None:
+            out[:] = vals
+            vals = out
+        elif dtype is not None:
+            vals = vals.astype(dtype)
+
+        return vals
+
+
 class DataBlock(dict):
     """Data Block class derived from *dict*
 
@@ -748,6 +1023,8 @@ class DataBlock(dict):
         block address
     compression : bool
         compression flag
+    size : int
+        data size in bytes
 
     Parameters
     ----------
@@ -756,7 +1033,12 @@ class DataBlock(dict):
     stream : file.io.handle
         binary file stream
     compression : bool
-        option flag for data compression; default *False*
+        option flag for data compression; the data is compressed in chunks
+        of whole records so that a range of records can be decompressed
+        without the rest of the data; default *False*
+    record_size : int
+        record size in bytes used for the compression chunks and the byte
+        shuffle; default 0
 
     """
 
@@ -764,6 +1046,11 @@ class DataBlock(dict):
         super(DataBlock, self).__init__()
 
         self.compression = kargs.get('compression', False)
+        self.record_size = record_size = kargs.get('record_size', 0)
+        if record_size:
+            self.chunk_size = max(COMPRESSION_CHUNK_SIZE // record_size, 1) * record_size
+        else:
+            self.chunk_size = COMPRESSION_CHUNK_SIZE
 
         try:
             stream = kargs['file_stream']
@@ -779,8 +1066,14 @@ class DataBlock(dict):
 
     def __setitem__(self, item, value):
         if item == 'data':
+            self.size = len(value)
             if self.compression:
-                super(DataBlock, self).__setitem__(item, compress(value))
+                # each chunk is compressed on its own
+                view = memoryview(value)
+                chunk_size = self.chunk_size
+                chunks = [compress_records(bytes(view[i: i + chunk_size]), self.record_size)
+                          for i in range(0, self.size, chunk_size)]
+                super(DataBlock, self).__setitem__(item, chunks)
             else:
                 super(DataBlock, self).__setitem__(item, value)
         else:
@@ -788,10 +1081,55 @@ class DataBlock(dict):
 
     def __getitem__(self, item):
         if item == 'data' and self.compression:
-            return decompress(super(DataBlock, self).__getitem__(item))
+            return b''.join([decompress(chunk) for chunk in super(DataBlock, self).__getitem__(item)])
         else:
             return super(DataBlock, self).__getitem__(item)
 
+    def get_data(self, start=0, stop=None, cache=None):
+        """ get the data bytes *start* to *stop*; if the data is compressed
+        only the chunks that cover the range are decompressed
+
+        Parameters
+        ----------
+        start : int
+            first byte
+        stop : int
+            end of the range (exclusive); default *None* means up to the end
+            of the data
+        cache : DataCache
+            optional cache of the decompressed chunks
+
+        Returns
+        -------
+        data : bytes
+            data range
+
+        """
+        if not self.compression:
+            return super(DataBlock, self).__getitem__('data')[start: stop]
+
+        stop = self.size if stop is None else min(stop, self.size)
+        if stop <= start:
+            return b''
+
+        chunks = super(DataBlock, self).__getitem__('data')
+        chunk_size = self.chunk_size
+        first = start // chunk_size
+        last = (stop - 1) // chunk_size + 1
+        data = []
+        for i in range(first, last):
+            chunk = chunks[i]
+            if cache is None:
+                data.append(decompress(chunk))
+            else:
+                data.append(cache.get((id(self), i), chunk, partial(decompress, chunk)))
+        data = b''.join(data)
+
+        offset = first * chunk_size
+        if start > offset or stop - offset < len(data):
+            data = data[start - offset: stop - offset]
+        return data
+
     def __bytes__(self):
         return self['data']
 
@@ -820,6 +1158,8 @@ class DataGroup(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -833,10 +1173,8 @@ class DataGroup(dict):
         super(DataGroup, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
-            block = stream.read(DG31_BLOCK_SIZE)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['block_len'],
@@ -845,10 +1183,11 @@ class DataGroup(dict):
              self['trigger_addr'],
              self['data_block_addr'],
              self['cg_nr'],
-             self['record_id_nr']) = unpack(FMT_DATA_GROUP, block)
+             self['record_id_nr']) = unpack_data_group(block, offset)
 
             if self['block_len'] == DG32_BLOCK_SIZE:
-                self['reserved0'] = stream.read(4)
+                offset += DG31_BLOCK_SIZE
+                self['reserved0'] = block[offset: offset + 4]
             else:
                 self['reserved0'] = b'\x00\x00\x00\x00'
         except KeyError:
@@ -899,6 +1238,8 @@ class FileIdentificationBlock(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     version : int
         mdf version in case of new file
 
@@ -914,8 +1255,7 @@ class FileIdentificationBlock(dict):
         self.address = 0
         try:
 
-            stream = kargs['file_stream']
-            stream.seek(0, SEEK_START)
+            block, offset = read_block(kargs, 0, ID_BLOCK_SIZE)
 
             (self['file_identification'],
              self['version_str'],
@@ -927,7 +1267,7 @@ class FileIdentificationBlock(dict):
              self['reserved0'],
              self['reserved1'],
              self['unfinalized_standard_flags'],
-             self['unfinalized_custom_flags']) = unpack(ID_FMT, stream.read(ID_BLOCK_SIZE))
+             self['unfinalized_custom_flags']) = unpack_identification(block, offset)
         except KeyError:
             version = kargs['version']
             self['file_identification'] = 'MDF     '.encode('latin-1')
@@ -980,6 +1320,8 @@ class HeaderBlock(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
 
     Attributes
     ----------
@@ -993,8 +1335,7 @@ class HeaderBlock(dict):
         self.address = 64
         try:
 
-            stream = kargs['file_stream']
-            stream.seek(64, SEEK_START)
+            block, offset = read_block(kargs, 64)
 
             (self['id'],
              self['block_len'],
@@ -1007,13 +1348,13 @@ class HeaderBlock(dict):
              self['author'],
              self['organization'],
              self['project'],
-             self['subject']) = unpack(HEADER_COMMON_FMT, stream.read(HEADER_COMMON_SIZE))
+             self['subject']) = unpack_header_common(block, offset)
 
             if self['block_len'] > HEADER_COMMON_SIZE:
                 (self['abs_time'],
                  self['tz_offset'],
                  self['time_quality'],
-                 self['timer_identification']) = unpack(HEADER_POST_320_EXTRA_FMT, stream.read(HEADER_POST_320_EXTRA_SIZE))
+                 self['timer_identification']) = unpack_header_extra(block, offset + HEADER_COMMON_SIZE)
             else:
                 self['abs_time'] = int(time.time() * 10**9)
                 self['tz_offset'] = 2
@@ -1072,6 +1413,8 @@ class ProgramBlock(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -1085,13 +1428,12 @@ class ProgramBlock(dict):
         super(ProgramBlock, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
-             self['block_len']) = unpack('<2sH', stream.read(4))
-            self['data'] = stream.read(self['block_len'] - 4)
+             self['block_len']) = unpack_block_header(block, offset)
+            self['data'] = block[offset + 4: offset + self['block_len']]
 
         except KeyError:
             pass
@@ -1119,6 +1461,8 @@ class SampleReduction(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -1132,16 +1476,15 @@ class SampleReduction(dict):
         super(SampleReduction, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, SR_BLOCK_SIZE)
 
             (self['id'],
              self['block_len'],
              self['next_sr_addr'],
              self['data_block_addr'],
              self['cycles_nr'],
-             self['time_interval']) = unpack(FMT_SAMPLE_REDUCTION_BLOCK, stream.read(SR_BLOCK_SIZE))
+             self['time_interval']) = unpack_from(FMT_SAMPLE_REDUCTION_BLOCK, block, offset)
 
         except KeyError:
             pass
@@ -1168,6 +1511,8 @@ class TextBlock(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
     text : bytes
@@ -1192,14 +1537,12 @@ class TextBlock(dict):
     def __init__(self, **kargs):
         super(TextBlock, self).__init__()
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
+            block, offset = read_block(kargs, address)
 
-            stream.seek(address, SEEK_START)
             (self['id'],
-             self['block_len']) = unpack('<2sH', stream.read(4))
-            size = self['block_len'] - 4
-            self['text'] = text = stream.read(size)
+             self['block_len']) = unpack_block_header(block, offset)
+            self['text'] = text = block[offset + 4: offset + self['block_len']]
 
             self.text_str = text.decode('latin-1').strip('\x00')
         except KeyError:
@@ -1259,6 +1602,8 @@ class TriggerBlock(dict):
     ----------
     file_stream : file handle
         mdf file handle
+    buffer : bytes | mmap
+        buffer holding the whole mdf file; used instead of *file_stream* if given
     address : int
         block address inside mdf file
 
@@ -1273,21 +1618,16 @@ class TriggerBlock(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-
-            stream.seek(address + 2, SEEK_START)
-            size = unpack('<H', stream.read(2))[0]
-            stream.seek(address, SEEK_START)
-            block = stream.read(size)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['block_len'],
              self['text_addr'],
-             self['trigger_events_nr']) = unpack('<2sHIH', block[:10])
+             self['trigger_events_nr']) = unpack_from('<2sHIH', block, offset)
 
             nr = self['trigger_events_nr']
             if nr:
-                values = unpack('<{}d'.format(3*nr), block[10:])
+                values = unpack_from('<{}d'.format(3*nr), block, offset + 10)
             for i in range(nr):
                 (self['trigger_{}_time'.format(i)],
                  self['trigger_{}_pretime'.format(i)],
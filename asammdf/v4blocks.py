@@ -2,30 +2,43 @@ from __future__ import print_function, division
 import sys
 PYVERSION = sys.version_info[0]
 
+import re
 import time
 import warnings
 import zlib
 
 from hashlib import md5
-from struct import unpack, pack, unpack_from
+from struct import unpack, pack, unpack_from, Struct
 from functools import partial
 
 try:
     from blosc import compress, decompress
     compress = partial(compress, clevel=7)
 
+    def compress_records(data, record_size):
+        """ compress records; the record size is used as blosc type size so
+        the byte shuffle groups the same byte of all the records """
+        return compress(data, typesize=record_size if 0 < record_size <= 255 else 1)
+
 except ImportError:
     from zlib import compress, decompress
 
+    def compress_records(data, record_size):
+        """ compress records """
+        return compress(data)
+
 import numpy as np
 
 from .v4constants import *
+from .utils import (MdfException, shift_mask, get_raw_expression, evaluate_conversion, transpose_bytes,
+                    COMPRESSION_CHUNK_SIZE)
 
 
 __all__ = ['AttachmentBlock',
            'Channel',
            'ChannelGroup',
            'ChannelConversion',
+           'CompiledConversion',
            'DataBlock',
            'DataZippedBlock',
            'FileIdentificationBlock',
@@ -39,6 +52,54 @@ __all__ = ['AttachmentBlock',
            'TextBlock']
 
 
+# precompiled parsers for the fixed size blocks
+unpack_common = Struct(FMT_COMMON).unpack_from
+unpack_channel = Struct(FMT_CHANNEL).unpack_from
+unpack_channel_group = Struct(FMT_CHANNEL_GROUP).unpack_from
+unpack_data_group = Struct(FMT_DATA_GROUP).unpack_from
+unpack_identification = Struct(FMT_IDENTIFICATION_BLOCK).unpack_from
+unpack_file_history = Struct(FMT_FILE_HISTORY).unpack_from
+unpack_header = Struct(FMT_HEADER_BLOCK).unpack_from
+unpack_header_list = Struct(FMT_HL_BLOCK).unpack_from
+unpack_source_information = Struct(FMT_SOURCE_INFORMATION).unpack_from
+
+
+def read_block(kargs, address, size=None):
+    """get the buffer that holds the raw bytes of a block loaded from file
+
+    If the *buffer* keyword argument is given (bytes, bytearray or mmap of the
+    whole file) the block is parsed in place. Otherwise the block is read
+    from the *file_stream*.
+
+    Parameters
+    ----------
+    kargs : dict
+        block keyword arguments
+    address : int
+        block address inside the file
+    size : int
+        block size; if *None* the *block_len* field of the block is used
+
+    Returns
+    -------
+    block, offset : bytes | mmap, int
+        buffer and the block offset inside the buffer
+
+    """
+    if 'buffer' in kargs:
+        return kargs['buffer'], address
+    else:
+        stream = kargs['file_stream']
+        stream.seek(address, SEEK_START)
+        if size is None:
+            block = stream.read(COMMON_SIZE)
+            size = unpack_common(block)[2]
+            block += stream.read(size - COMMON_SIZE)
+        else:
+            block = stream.read(size)
+        return block, 0
+
+
 class AttachmentBlock(dict):
     """ ATBLOCK class
 
@@ -144,8 +205,7 @@ class Channel(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, CN_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -175,7 +235,7 @@ class Channel(dict):
              self['lower_limit'],
              self['upper_limit'],
              self['lower_ext_limit'],
-             self['upper_ext_limit']) = unpack(FMT_CHANNEL, stream.read(CN_BLOCK_SIZE))
+             self['upper_ext_limit']) = unpack_channel(block, offset)
 
         except KeyError:
 
@@ -222,8 +282,7 @@ class ChannelGroup(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, CG_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -241,7 +300,7 @@ class ChannelGroup(dict):
              self['path_separator'],
              self['reserved1'],
              self['samples_byte_nr'],
-             self['invalidation_bytes_nr']) = unpack(FMT_CHANNEL_GROUP, stream.read(CG_BLOCK_SIZE))
+             self['invalidation_bytes_nr']) = unpack_channel_group(block, offset)
 
         except KeyError:
             self.address = 0
@@ -274,15 +333,14 @@ class ChannelConversion(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['reserved0'],
              self['block_len'],
-             self['links_nr']) = unpack(FMT_COMMON, stream.read(COMMON_SIZE))
+             self['links_nr']) = unpack_common(block, offset)
 
-            block = stream.read(self['block_len'] - COMMON_SIZE)
+            block = block[offset + COMMON_SIZE: offset + self['block_len']]
 
             conv = unpack_from('B', block, self['links_nr'] * 8)[0]
 
@@ -678,6 +736,263 @@ class ChannelConversion(dict):
 
         return pack(fmt, *[self[key] for key in keys])
 
+    def __setitem__(self, item, value):
+        # the compiled conversion is rebuilt after the block fields change
+        self.__dict__.pop('_compiled', None)
+        super(ChannelConversion, self).__setitem__(item, value)
+
+    def compile(self, texts=None, conversion_texts=None):
+        """get the array backed form of the conversion. It is built on the
+        first call and reused afterwards, so the conversion parameters are
+        collected from the block keys only once. Changing the block fields
+        discards the compiled conversion.
+
+        Parameters
+        ----------
+        texts : dict
+            TextBlock objects of the TABX, RTABX, TTAB and TRANS conversion
+            texts
+        conversion_texts : dict
+            TextBlock objects of the conversion; the *formula_addr* text is
+            used by the algebraic conversion
+
+        Returns
+        -------
+        compiled : CompiledConversion
+            compiled conversion
+
+        Raises
+        ------
+        MdfException : if the conversion was compiled with other texts
+
+        """
+        texts = texts or {}
+        conversion_texts = conversion_texts or {}
+        try:
+            compiled_texts, compiled_conversion_texts, compiled = self._compiled
+        except AttributeError:
+            compiled = CompiledConversion(self, texts, conversion_texts)
+            self._compiled = texts, conversion_texts, compiled
+            return compiled
+        # the shared conversion blocks must be compiled with the same texts
+        # for all the channels
+        if texts != compiled_texts or conversion_texts != compiled_conversion_texts:
+            raise MdfException('The conversion is already compiled with other conversion texts')
+        return compiled
+
+
+class CompiledConversion(object):
+    """ array backed form of a ChannelConversion; the conversion parameters
+    are collected once and the conversion is applied to the raw channel
+    values with the *apply* method
+
+    The algebraic conversions (linear, rational and algebraic) are compiled
+    together with the bit shift and mask of the raw values into a single
+    numexpr expression that is evaluated multithreaded without full length
+    temporaries.
+
+    Parameters
+    ----------
+    conversion : ChannelConversion
+        channel conversion; *None* for channels without conversion
+    texts : dict
+        TextBlock objects of the TABX, RTABX, TTAB and TRANS conversion texts
+    conversion_texts : dict
+        TextBlock objects of the conversion (*formula_addr* key)
+
+    Attributes
+    ----------
+    conversion_type : int
+        conversion type
+    expression : str | None
+        numexpr expression of the algebraic conversions
+    info : dict | None
+        TABX, RTABX, TTAB and TRANS conversion information returned by
+        *MDF4.get*; *None* for the other conversion types
+
+    Examples
+    --------
+    >>> compiled = conversion.compile()
+    >>> phys = compiled.apply(raw)
+    >>> phys = compiled.apply(raw, dtype=np.float32)
+
+    """
+    def __init__(self, conversion=None, texts=None, conversion_texts=None):
+        self.info = None
+        self.expression = None
+        self.params = {}
+        if conversion is None:
+            self.conversion_type = CONVERSION_TYPE_NON
+            return
+
+        conv_type = self.conversion_type = conversion['conversion_type']
+        texts = texts or {}
+
+        def get_text(key):
+            return texts.get(key, {}).get('text', b'')
+
+        if conv_type == CONVERSION_TYPE_LIN:
+            a, b = conversion['a'], conversion['b']
+            if (a, b) == (1, 0):
+                self.expression = 'X'
+            else:
+                self.expression = 'X * a + b'
+                self.params = {'a': float(a), 'b': float(b)}
+
+        elif conv_type == CONVERSION_TYPE_RAT:
+            # the parameters are multiplied first to avoid integer overflows
+            self.params = {'P{}'.format(i): float(conversion['P{}'.format(i)]) for i in range(1, 7)}
+            self.expression = '(P1 * X * X + P2 * X + P3) / (P4 * X * X + P5 * X + P6)'
+
+        elif conv_type == CONVERSION_TYPE_ALG:
+            self.expression = conversion_texts['formula_addr'].text_str
+
+        elif conv_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TAB):
+            nr = conversion['val_param_nr'] // 2
+            self.raw = np.array([conversion['raw_{}'.format(i)] for i in range(nr)])
+            self.phys = np.array([conversion['phys_{}'.format(i)] for i in range(nr)])
+
+        elif conv_type == CONVERSION_TYPE_RTAB:
+            nr = (conversion['val_param_nr'] - 1) // 3
+            self.lower = lower = np.array([conversion['lower_{}'.format(i)] for i in range(nr)])
+            self.upper = upper = np.array([conversion['upper_{}'.format(i)] for i in range(nr)])
+            self.phys = np.array([conversion['phys_{}'.format(i)] for i in range(nr)])
+            self.default = conversion['default']
+            # sorted and disjoint ranges can be found with a binary search
+            self.sorted_ranges = bool(nr) and (lower <= upper).all() and (lower[1:] > upper[:-1]).all()
+
+        elif conv_type == CONVERSION_TYPE_TABX:
+            nr = conversion['val_param_nr']
+            raw = np.array([conversion['val_{}'.format(i)] for i in range(nr)])
+            phys = np.array([get_text('text_{}'.format(i)) for i in range(nr)])
+            default = get_text('default_addr')
+            self.info = {'raw': raw, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_TABX}
+
+        elif conv_type == CONVERSION_TYPE_RTABX:
+            nr = conversion['val_param_nr'] // 2
+            phys = np.array([get_text('text_{}'.format(i)) for i in range(nr)])
+            lower = np.array([conversion['lower_{}'.format(i)] for i in range(nr)])
+            upper = np.array([conversion['upper_{}'.format(i)] for i in range(nr)])
+            default = get_text('default_addr')
+            self.info = {'lower': lower, 'upper': upper, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_RTABX}
+
+        elif conv_type == CONVERSION_TYPE_TTAB:
+            nr = conversion['val_param_nr'] - 1
+            raw = np.array([get_text('text_{}'.format(i)) for i in range(nr)])
+            phys = np.array([conversion['val_{}'.format(i)] for i in range(nr)])
+            default = conversion['val_default']
+            self.info = {'raw': raw, 'phys': phys, 'default': default, 'type': CONVERSION_TYPE_TTAB}
+
+        elif conv_type == CONVERSION_TYPE_TRANS:
+            nr = (conversion['ref_param_nr'] - 1 ) // 2
+            in_ = np.array([get_text('input_{}_addr'.format(i)) for i in range(nr)])
+            out_ = np.array([get_text('output_{}_addr'.format(i)) for i in range(nr)])
+            self.default = default = get_text('default_addr')
+            # the first matching input wins
+            self.table = {}
+            for i, o in zip(in_, out_):
+                self.table.setdefault(i, o)
+            self.info = {'input': in_, 'output': out_, 'default': default, 'type': CONVERSION_TYPE_TRANS}
+
+    def apply(self, raw, bit_offset=0, bits=0, out=None, dtype=None):
+        """ convert the raw channel values to physical values
+
+        Parameters
+        ----------
+        raw : numpy.array
+            raw channel values
+        bit_offset : int
+            bit offset of the channel value inside the raw values
+        bits : int
+            channel bit count; the raw values are masked if it is not a
+            multiple of 8
+        out : numpy.array
+            optional output array for the physical values; the result is cast
+            to the *out* dtype
+        dtype : numpy.dtype
+            optional physical values dtype (for example float32 or float64);
+            ignored if *out* is given; by default the algebraic conversions
+            keep the dtype of float channels and return float64 values for
+            integer channels
+
+        Returns
+        -------
+        phys : numpy.array
+            physical values; the raw values are returned for the TABX, RTABX
+            and TTAB conversions and for channels without conversion
+
+        """
+        conv_type = self.conversion_type
+        expression = self.expression
+
+        if expression is not None:
+            if expression == 'X' and out is None and dtype is None:
+                return shift_mask(raw, bit_offset, bits)
+            if out is None and dtype is None and raw.dtype.kind == 'f':
+                # the parameters are float64 scalars; float32 channels keep
+                # their dtype instead of being upcast
+                dtype = raw.dtype.newbyteorder('=')
+            if raw.dtype.kind == 'u' and raw.dtype.itemsize == 8:
+                # numexpr has no uint64 support
+                raw = shift_mask(raw, bit_offset, bits).astype(np.float64)
+                raw_expression = 'X'
+            else:
+                raw_expression = get_raw_expression('X', raw, bit_offset, bits)
+                if raw_expression is None:
+                    raw = shift_mask(raw, bit_offset, bits)
+                    raw_expression = 'X'
+            if raw_expression != 'X':
+                expression = re.sub(r'\bX\b', raw_expression, expression)
+            local_dict = dict(self.params)
+            local_dict['X'] = raw
+            return evaluate_conversion(expression, local_dict, len(raw), out, dtype)
+
+        raw = shift_mask(raw, bit_offset, bits)
+
+        if conv_type == CONVERSION_TYPE_TABI:
+            vals = np.interp(raw, self.raw, self.phys)
+
+        elif conv_type == CONVERSION_TYPE_TAB:
+            idx = np.searchsorted(self.raw, raw)
+            idx = np.clip(idx, 0, len(self.raw) - 1)
+            vals = self.phys[idx]
+
+        elif conv_type == CONVERSION_TYPE_RTAB:
+            lower, upper, phys = self.lower, self.upper, self.phys
+            if self.sorted_ranges:
+                idx = np.searchsorted(lower, raw, side='right') - 1
+                in_range = idx >= 0
+                idx = np.clip(idx, 0, len(lower) - 1)
+                in_range &= raw <= upper[idx]
+                res = np.where(in_range, phys[idx], self.default)
+            else:
+                # the first matching range wins so the ranges are applied in
+                # reversed order
+                res = np.full(len(raw), self.default, dtype=np.float64)
+                for l, u, p in reversed(list(zip(lower, upper, phys))):
+                    res[(raw >= l) & (raw <= u)] = p
+            vals = res.astype(raw.dtype)
+
+        elif conv_type == CONVERSION_TYPE_TRANS:
+            if len(raw):
+                # each distinct input is looked up only once
+                uniques, inverse = np.unique(raw, return_inverse=True)
+                vals = np.array([self.table.get(v, self.default) for v in uniques])[inverse]
+            else:
+                vals = np.array([])
+
+        else:
+            vals = raw
+
+        if conv_type in (CONVERSION_TYPE_TABI, CONVERSION_TYPE_TAB, CONVERSION_TYPE_RTAB):
+            if out is not None:
+                out[:] = vals
+                vals = out
+            elif dtype is not None:
+                vals = vals.astype(dtype)
+
+        return vals
+
 
 class DataBlock(dict):
     """DTBLOCK class
@@ -686,7 +1001,12 @@ class DataBlock(dict):
     Parameters
     ----------
     compression : bool
-        enable raw channel data compression in RAM
+        enable raw channel data compression in RAM; the data is compressed in
+        chunks of whole records so that a range of records can be
+        decompressed without the rest of the data
+    record_size : int
+        record size in bytes used for the compression chunks and the byte
+        shuffle; default 0
     address : int
         DTBLOCK address inside the file
     file_stream : int
@@ -697,6 +1017,11 @@ class DataBlock(dict):
         super(DataBlock, self).__init__()
 
         self.compression = kargs.get('compression', False)
+        self.record_size = record_size = kargs.get('record_size', 0)
+        if record_size:
+            self.chunk_size = max(COMPRESSION_CHUNK_SIZE // record_size, 1) * record_size
+        else:
+            self.chunk_size = COMPRESSION_CHUNK_SIZE
 
         try:
             self.address = address = kargs['address']
@@ -719,8 +1044,14 @@ class DataBlock(dict):
 
     def __setitem__(self, item, value):
         if item == 'data':
+            self.size = len(value)
             if self.compression:
-                super(DataBlock, self).__setitem__(item, compress(value))
+                # each chunk is compressed on its own
+                view = memoryview(value)
+                chunk_size = self.chunk_size
+                chunks = [compress_records(bytes(view[i: i + chunk_size]), self.record_size)
+                          for i in range(0, self.size, chunk_size)]
+                super(DataBlock, self).__setitem__(item, chunks)
             else:
                 super(DataBlock, self).__setitem__(item, value)
         else:
@@ -728,10 +1059,55 @@ class DataBlock(dict):
 
     def __getitem__(self, item):
         if item == 'data' and self.compression:
-            return decompress(super(DataBlock, self).__getitem__(item))
+            return b''.join([decompress(chunk) for chunk in super(DataBlock, self).__getitem__(item)])
         else:
             return super(DataBlock, self).__getitem__(item)
 
+    def get_data(self, start=0, stop=None, cache=None):
+        """ get the data bytes *start* to *stop*; if the data is compressed
+        only the chunks that cover the range are decompressed
+
+        Parameters
+        ----------
+        start : int
+            first byte
+        stop : int
+            end of the range (exclusive); default *None* means up to the end
+            of the data
+        cache : DataCache
+            optional cache of the decompressed chunks
+
+        Returns
+        -------
+        data : bytes
+            data range
+
+        """
+        if not self.compression:
+            return super(DataBlock, self).__getitem__('data')[start: stop]
+
+        stop = self.size if stop is None else min(stop, self.size)
+        if stop <= start:
+            return b''
+
+        chunks = super(DataBlock, self).__getitem__('data')
+        chunk_size = self.chunk_size
+        first = start // chunk_size
+        last = (stop - 1) // chunk_size + 1
+        data = []
+        for i in range(first, last):
+            chunk = chunks[i]
+            if cache is None:
+                data.append(decompress(chunk))
+            else:
+                data.append(cache.get((id(self), i), chunk, partial(decompress, chunk)))
+        data = b''.join(data)
+
+        offset = first * chunk_size
+        if start > offset or stop - offset < len(data):
+            data = data[start - offset: stop - offset]
+        return data
+
     def __bytes__(self):
         return pack(FMT_DATA_BLOCK.format(self['block_len'] - COMMON_SIZE), *[self[key] for key in KEYS_DATA_BLOCK])
 
@@ -754,6 +1130,8 @@ class DataZippedBlock(dict):
     def __init__(self, **kargs):
         super(DataZippedBlock, self).__init__()
 
+        # decompressed data kept after the first access
+        self._unzipped = None
         self.prevent_data_setitem = True
         try:
             self.address = address = kargs['address']
@@ -782,8 +1160,8 @@ class DataZippedBlock(dict):
             self['reserved0'] = 0
 
             self['links_nr'] = 0
-            self['original_type'] = kargs.get('original_type', 'DT')
-            self['zip_type'] = karg.get('zip_type', FLAG_DZ_DEFLATE)
+            self['original_type'] = kargs.get('original_type', b'DT')
+            self['zip_type'] = kargs.get('zip_type', FLAG_DZ_DEFLATE)
             self['reserved1'] = 0
             self['param'] = 0 if self['zip_type'] == FLAG_DZ_DEFLATE else kargs['param']
 
@@ -794,6 +1172,8 @@ class DataZippedBlock(dict):
         self.return_unzipped = True
 
     def __setitem__(self, item, value):
+        if item == 'data':
+            self._unzipped = None
         if item == 'data' and self.prevent_data_setitem == False:
             data = value
             self['original_size'] = len(data)
@@ -804,10 +1184,7 @@ class DataZippedBlock(dict):
                 cols = self['param']
                 lines = self['original_size'] // cols
 
-                nd = np.fromstring(data[:lines*cols], dtype=np.uint8).reshape((lines, cols))
-                data = nd.transpose().tostring() + data[lines*cols:]
-
-                data = zlib.compress(data)
+                data = zlib.compress(transpose_bytes(data, lines, cols))
 
             self['zip_size'] = len(data)
             self['block_len'] = self['zip_size'] + DZ_COMMON_SIZE
@@ -818,23 +1195,48 @@ class DataZippedBlock(dict):
     def __getitem__(self, item):
         if item == 'data':
             if self.return_unzipped:
-                data = super(DataZippedBlock, self).__getitem__(item)
-                data = zlib.decompress(data)
-                if self['zip_type'] == FLAG_DZ_DEFLATE:
-                    return data
-                else:
-                    cols = self['param']
-                    lines = self['original_size'] // cols
-
-                    nd = np.fromstring(data[:lines*cols], dtype=np.uint8).reshape((cols, lines))
-                    data = nd.transpose().tostring() + data[lines*cols:]
-
-                    return data
+                if self._unzipped is None:
+                    self._unzipped = self.unzip()
+                return self._unzipped
             else:
                 return super(DataZippedBlock, self).__getitem__(item)
         else:
             return super(DataZippedBlock, self).__getitem__(item)
 
+    def unzip(self, out=None):
+        """ decompress the block data; zlib and the numpy copies release the
+        GIL so several blocks can be decompressed in parallel threads
+
+        Parameters
+        ----------
+        out : bytearray | memoryview
+            optional writable buffer of *original_size* bytes that receives
+            the data
+
+        Returns
+        -------
+        data : bytes | bytearray | memoryview
+            decompressed data; *out* if it was given
+
+        """
+        if self._unzipped is not None:
+            if out is None:
+                return self._unzipped
+            out[:] = self._unzipped
+            return out
+
+        data = zlib.decompress(super(DataZippedBlock, self).__getitem__('data'))
+        if self['zip_type'] == FLAG_DZ_DEFLATE:
+            if out is None:
+                return data
+            out[:] = data
+            return out
+        else:
+            cols = self['param']
+            lines = self['original_size'] // cols
+            # the columns are transposed back straight into the output
+            return transpose_bytes(data, cols, lines, out)
+
     def __bytes__(self):
         fmt = FMT_DZ_COMMON + '{}s'.format(self['zip_size'])
         self.return_unzipped = False
@@ -850,8 +1252,7 @@ class DataGroup(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, DG_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -862,7 +1263,7 @@ class DataGroup(dict):
              self['data_block_addr'],
              self['comment_addr'],
              self['record_id_len'],
-             self['reserved1']) = unpack(FMT_DATA_GROUP, stream.read(DG_BLOCK_SIZE))
+             self['reserved1']) = unpack_data_group(block, offset)
 
         except KeyError:
 
@@ -889,25 +1290,25 @@ class DataList(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address)
 
             (self['id'],
              self['reserved0'],
              self['block_len'],
-             self['links_nr']) = unpack(FMT_COMMON, stream.read(COMMON_SIZE))
-
-            self['next_dl_addr'] = unpack('<Q', stream.read(8))[0]
+             self['links_nr']) = unpack_common(block, offset)
+            offset += COMMON_SIZE
 
-            links = unpack('<{}Q'.format(self['links_nr'] - 1), stream.read( (self['links_nr'] - 1) * 8 ))
+            links = unpack_from('<{}Q'.format(self['links_nr']), block, offset)
+            offset += self['links_nr'] * 8
 
-            for i, addr in enumerate(links):
+            self['next_dl_addr'] = links[0]
+            for i, addr in enumerate(links[1:]):
                 self['data_block_addr{}'.format(i)] = addr
 
             (self['flags'],
              self['reserved1'],
              self['data_block_nr'],
-             self['data_block_len']) = unpack('<B3sIQ', stream.read(16))
+             self['data_block_len']) = unpack_from('<B3sIQ', block, offset)
 
         except KeyError:
 
@@ -943,8 +1344,7 @@ class FileIdentificationBlock(dict):
 
         try:
 
-            stream = kargs['file_stream']
-            stream.seek(self.address, SEEK_START)
+            block, offset = read_block(kargs, self.address, IDENTIFICATION_BLOCK_SIZE)
 
             (self['file_identification'],
              self['version_str'],
@@ -956,7 +1356,7 @@ class FileIdentificationBlock(dict):
              self['check_block'],
              self['fill'],
              self['unfinalized_standard_flags'],
-             self['unfinalized_custom_flags']) = unpack(FMT_IDENTIFICATION_BLOCK, stream.read(IDENTIFICATION_BLOCK_SIZE))
+             self['unfinalized_custom_flags']) = unpack_identification(block, offset)
 
         except KeyError:
 
@@ -984,8 +1384,7 @@ class FileHistory(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, FH_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -997,7 +1396,7 @@ class FileHistory(dict):
              self['tz_offset'],
              self['daylight_save_time'],
              self['time_flags'],
-             self['reserved1']) = unpack(FMT_FILE_HISTORY, stream.read(FH_BLOCK_SIZE))
+             self['reserved1']) = unpack_file_history(block, offset)
 
         except KeyError:
             self['id'] = kargs.get('id', '##FH'.encode('utf-8'))
@@ -1023,8 +1422,7 @@ class HeaderBlock(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, HEADER_BLOCK_SIZE)
 
             (self['id'],
              self['reserved3'],
@@ -1044,7 +1442,7 @@ class HeaderBlock(dict):
              self['flags'],
              self['reserved4'],
              self['start_angle'],
-             self['start_distance']) = unpack(FMT_HEADER_BLOCK, stream.read(HEADER_BLOCK_SIZE))
+             self['start_distance']) = unpack_header(block, offset)
 
         except KeyError:
 
@@ -1079,8 +1477,7 @@ class HeaderList(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, HL_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -1089,7 +1486,7 @@ class HeaderList(dict):
              self['first_dl_addr'],
              self['flags'],
              self['zip_type'],
-             self['reserved1']) = unpack(FMT_HL_BLOCK, stream.read(HL_BLOCK_SIZE))
+             self['reserved1']) = unpack_header_list(block, offset)
 
         except KeyError:
 
@@ -1114,8 +1511,7 @@ class SourceInformation(dict):
 
         try:
             self.address = address = kargs['address']
-            stream = kargs['file_stream']
-            stream.seek(address, SEEK_START)
+            block, offset = read_block(kargs, address, SI_BLOCK_SIZE)
 
             (self['id'],
              self['reserved0'],
@@ -1127,7 +1523,7 @@ class SourceInformation(dict):
              self['source_type'],
              self['bus_type'],
              self['flags'],
-             self['reserved1']) = unpack(FMT_SOURCE_INFORMATION, stream.read(SI_BLOCK_SIZE))
+             self['reserved1']) = unpack_source_information(block, offset)
 
         except KeyError:
             self.address = 0
@@ -1189,18 +1585,15 @@ class TextBlock(dict):
         super(TextBlock, self).__init__()
 
         try:
-            stream = kargs['file_stream']
             self.address = address = kargs['address']
+            block, offset = read_block(kargs, address)
 
-            stream.seek(address, SEEK_START)
             (self['id'],
              self['reserved0'],
              self['block_len'],
-             self['links_nr']) = unpack(FMT_COMMON, stream.read(COMMON_SIZE))
-
-            size = self['block_len'] - COMMON_SIZE
+             self['links_nr']) = unpack_common(block, offset)
 
-            self['text'] = text = stream.read(size)
+            self['text'] = text = block[offset + COMMON_SIZE: offset + self['block_len']]
 
             self.text_str = text.decode('utf-8').strip('\x00')
 
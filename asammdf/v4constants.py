@@ -76,6 +76,8 @@ FLAG_AT_COMPRESSED_EMBEDDED = 2
 FLAG_AT_MD5_VALID = 4
 FLAG_DZ_DEFLATE = 0
 FLAG_DZ_TRANPOSED_DEFLATE = 1
+FLAG_HD_LOCAL_TIME = 1
+FLAG_HD_TIME_OFFSET_VALID = 2
 
 FMT_CHANNEL = '<4sI10Q4B4I2BH6d'
 KEYS_CHANNEL = ('id',
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import unittest
+import warnings
+
+import numpy as np
+
+from asammdf.v4constants import FLAG_HD_LOCAL_TIME, FLAG_HD_TIME_OFFSET_VALID
+
+from utils import get_test_signals, new_mdf
+
+
+START = np.datetime64('2017-06-01T12:00:00', 'ns')
+
+
+class TestAbsoluteTime(unittest.TestCase):
+
+    def get_mdf(self, time_flags, tz_offset=0, daylight_save_time=0):
+        mdf = new_mdf('4.10')
+        mdf.append(get_test_signals(), 'test')
+        mdf.header['abs_time'] = int(START.astype('int64'))
+        mdf.header['time_flags'] = time_flags
+        # the header block stores the signed offsets as unsigned values
+        mdf.header['tz_offset'] = tz_offset % 2**16
+        mdf.header['daylight_save_time'] = daylight_save_time % 2**16
+        return mdf
+
+    def test_utc_time(self):
+        t = get_test_signals()[0].timestamps
+        mdf = self.get_mdf(FLAG_HD_TIME_OFFSET_VALID, 120, 60)
+        result = mdf.get_master_data(group=0, absolute_time=True)
+        self.assertEqual(result.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(result[0], START)
+        self.assertEqual(result[-1], START + np.timedelta64(int(round(t[-1] * 1000)), 'ms'))
+
+    def test_local_time(self):
+        for tz_offset, dst, expected in ((120, 60, 180), (-300, 60, -240)):
+            mdf = self.get_mdf(FLAG_HD_TIME_OFFSET_VALID, tz_offset, dst)
+            result = mdf.get_master_data(group=0, absolute_time=True, local_time=True)
+            self.assertEqual(result[0], START + np.timedelta64(expected, 'm'))
+
+    def test_invalid_offsets(self):
+        mdf = self.get_mdf(0, 120)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            result = mdf.get_master_data(group=0, absolute_time=True, local_time=True)
+        self.assertEqual(result[0], START)
+        self.assertEqual(len(caught), 1)
+
+    def test_local_start_time(self):
+        mdf = self.get_mdf(FLAG_HD_LOCAL_TIME)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(mdf.get_master_data(group=0, absolute_time=True, local_time=True)[0], START)
+            self.assertEqual(len(caught), 0)
+            self.assertEqual(mdf.get_master_data(group=0, absolute_time=True)[0], START)
+            self.assertEqual(len(caught), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from asammdf.utils import get_bitfield_values, get_packed_values
+
+
+RECORD_SIZE = 13
+RECORDS = np.random.RandomState(0).randint(0, 256, RECORD_SIZE * 200).astype(np.uint8)
+
+
+def reference(byte_offset, bit_offset, bits, signed=False, big_endian=False):
+    """ bit field values computed record by record """
+    size = (bit_offset + bits + 7) // 8
+    result = []
+    for i in range(0, len(RECORDS), RECORD_SIZE):
+        field = bytearray(RECORDS[i + byte_offset: i + byte_offset + size].tobytes())
+        if big_endian:
+            field = field[::-1]
+        value = sum(byte << (8 * j) for j, byte in enumerate(field))
+        value = (value >> bit_offset) & ((1 << bits) - 1)
+        if signed and value >> (bits - 1):
+            value -= 1 << bits
+        result.append(value)
+    return result
+
+
+class TestBitfields(unittest.TestCase):
+
+    def check(self, byte_offset, bit_offset, bits, signed=False, big_endian=False):
+        vals = get_bitfield_values(RECORDS.tobytes(), RECORD_SIZE, byte_offset, bit_offset, bits, signed, big_endian)
+        self.assertEqual(vals.tolist(), reference(byte_offset, bit_offset, bits, signed, big_endian),
+                         (byte_offset, bit_offset, bits, signed, big_endian))
+        self.assertEqual(vals.dtype.kind, 'i' if signed else 'u')
+        self.assertGreaterEqual(vals.dtype.itemsize * 8, bits)
+
+    def test_byte_sizes(self):
+        # including the byte sizes without numpy dtype
+        for size in range(1, 9):
+            for byte_offset in (0, 1, RECORD_SIZE - size):
+                for signed in (False, True):
+                    for big_endian in (False, True):
+                        self.check(byte_offset, 0, size * 8, signed, big_endian)
+
+    def test_bit_offsets(self):
+        for bits in (1, 3, 7, 12, 17, 24, 31, 33, 45, 57):
+            for bit_offset in (0, 1, 5, 7):
+                if bit_offset + bits > 64:
+                    continue
+                for signed in (False, True):
+                    for big_endian in (False, True):
+                        self.check(2, bit_offset, bits, signed, big_endian)
+
+    def test_array_input(self):
+        vals = get_bitfield_values(RECORDS, RECORD_SIZE, 3, 2, 20, True)
+        self.assertEqual(vals.tolist(), reference(3, 2, 20, True))
+
+    def test_packed_values(self):
+        fields = [(0, 0, 1, False, False),
+                  (0, 1, 3, True, False),
+                  (0, 4, 12, False, False),
+                  (1, 7, 20, True, False),
+                  (4, 0, 16, False, True),
+                  (5, 3, 45, True, False),
+                  (6, 0, 56, False, False),
+                  (12, 0, 8, True, False),
+                  (2, 0, 1, False, False)]
+        for data in (RECORDS.tobytes(), RECORDS):
+            values = get_packed_values(data, RECORD_SIZE, fields)
+            self.assertEqual(len(values), len(fields))
+            for field, vals in zip(fields, values):
+                self.assertEqual(vals.tolist(), reference(*field), field)
+                self.assertTrue(np.array_equal(vals, get_bitfield_values(data, RECORD_SIZE, *field)))
+        self.assertEqual(get_packed_values(RECORDS, RECORD_SIZE, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from asammdf.utils import canopen_date_to_datetime64, canopen_time_to_datetime64
+
+
+DATE_TYPES = [('ms', '<u2'), ('min', '<u1'), ('hour', '<u1'), ('day', '<u1'), ('month', '<u1'), ('year', '<u1')]
+TIME_TYPES = [('ms', '<u4'), ('days', '<u2')]
+
+
+class TestCANopen(unittest.TestCase):
+
+    def test_date(self):
+        dates = np.array([(30500, 45, 13, 15, 6, 17),
+                          # summer time, day of week and reserved bits are ignored
+                          (30500, 45 | 0xC0, 13 | 0x80, 15 | 0x40, 6 | 0xC0, 17 | 0x80),
+                          (0, 0, 0, 1, 1, 0),
+                          (59999, 59, 23, 31, 12, 99),
+                          # zero day or month fields are invalid dates
+                          (0, 0, 0, 0, 1, 10),
+                          (0, 0, 0, 1, 0, 10)],
+                         dtype=DATE_TYPES)
+        expected = np.array(['2017-06-15T13:45:30.500',
+                             '2017-06-15T13:45:30.500',
+                             '2000-01-01T00:00:00.000',
+                             '2099-12-31T23:59:59.999',
+                             'NaT',
+                             'NaT'],
+                            dtype='datetime64[ms]')
+        result = canopen_date_to_datetime64(dates)
+        self.assertEqual(result.dtype, np.dtype('datetime64[ms]'))
+        self.assertTrue(np.array_equal(result[:4], expected[:4]))
+        self.assertTrue(np.isnat(result[4:]).all())
+
+    def test_time(self):
+        times = np.array([(0, 0),
+                          (49530500, 12219),
+                          # the upper 4 bits of the milliseconds are reserved
+                          (49530500 | 0xF0000000, 12219)],
+                         dtype=TIME_TYPES)
+        expected = np.array(['1984-01-01T00:00:00.000',
+                             '2017-06-15T13:45:30.500',
+                             '2017-06-15T13:45:30.500'],
+                            dtype='datetime64[ms]')
+        self.assertTrue(np.array_equal(canopen_time_to_datetime64(times), expected))
+
+    def test_empty(self):
+        self.assertEqual(len(canopen_date_to_datetime64(np.zeros(0, dtype=DATE_TYPES))), 0)
+        self.assertEqual(len(canopen_time_to_datetime64(np.zeros(0, dtype=TIME_TYPES))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
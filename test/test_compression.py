@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF, v3blocks, v4blocks
+from asammdf.utils import DataCache
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+DATA = np.arange(25000, dtype=np.uint32).tobytes()
+RECORD_SIZE = 12
+
+
+class TestCompression(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_chunks(self):
+        for module in (v3blocks, v4blocks):
+            with mock.patch.object(module, 'COMPRESSION_CHUNK_SIZE', 1000):
+                block = module.DataBlock(data=DATA, compression=True, record_size=RECORD_SIZE)
+            # the chunks hold whole records
+            self.assertEqual(block.chunk_size, 996)
+            self.assertEqual(len(dict.__getitem__(block, 'data')), -(-len(DATA) // 996))
+            self.assertEqual(block['data'], DATA)
+
+            with mock.patch.object(module, 'decompress', wraps=module.decompress) as decompress:
+                for start, stop in ((0, 10), (990, 1000), (5000, 7000), (99000, None), (0, None), (500, 500)):
+                    decompress.reset_mock()
+                    self.assertEqual(block.get_data(start, stop), DATA[start: stop], (start, stop))
+                    stop = len(DATA) if stop is None else stop
+                    chunks = 0 if stop <= start else (stop - 1) // 996 - start // 996 + 1
+                    # only the chunks that cover the range are decompressed
+                    self.assertEqual(decompress.call_count, chunks, (start, stop))
+
+                cache = DataCache()
+                decompress.reset_mock()
+                block.get_data(1000, 3000, cache=cache)
+                self.assertEqual(decompress.call_count, 3)
+                # the cached chunks are not decompressed again
+                self.assertEqual(block.get_data(2000, 2500, cache=cache), DATA[2000: 2500])
+                self.assertEqual(decompress.call_count, 3)
+
+    def test_uncompressed(self):
+        for module in (v3blocks, v4blocks):
+            block = module.DataBlock(data=DATA)
+            self.assertEqual(block['data'], DATA)
+            self.assertEqual(block.get_data(100, 200), DATA[100: 200])
+
+    def test_compressed_file(self):
+        signals = get_test_signals() + get_test_signals2()
+        for name in self.files:
+            # several chunks per data block
+            with mock.patch.object(v3blocks, 'COMPRESSION_CHUNK_SIZE', 1000), \
+                    mock.patch.object(v4blocks, 'COMPRESSION_CHUNK_SIZE', 1000):
+                mdf = MDF(name, compression=True)
+            with mdf:
+                self.assertGreater(len(dict.__getitem__(mdf.groups[0]['data_block'], 'data')), 1)
+                for signal in signals:
+                    result = mdf.get(signal.name, start=1.05, stop=3.9)
+                    mask = (signal.timestamps >= 1.05) & (signal.timestamps <= 3.9)
+                    self.assertTrue(np.array_equal(result.samples, signal.samples[mask]))
+                    self.assertTrue(np.array_equal(mdf.get(signal.name).samples, signal.samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
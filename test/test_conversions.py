@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from asammdf import v3blocks, v3constants, v4blocks
+from asammdf.v4blocks import CompiledConversion
+from asammdf.utils import MdfException, get_raw_expression
+from asammdf.v4constants import CONVERSION_TYPE_LIN, CONVERSION_TYPE_RTAB, CONVERSION_TYPE_TRANS
+
+from utils import get_test_signals2, new_mdf
+
+
+def rtab_conversion(ranges, default):
+    conversion = {'conversion_type': CONVERSION_TYPE_RTAB,
+                  'val_param_nr': len(ranges) * 3 + 1,
+                  'default': default}
+    for i, (lower, upper, phys) in enumerate(ranges):
+        conversion['lower_{}'.format(i)] = lower
+        conversion['upper_{}'.format(i)] = upper
+        conversion['phys_{}'.format(i)] = phys
+    return conversion
+
+
+def rtab_reference(raw, ranges, default):
+    result = []
+    for value in raw:
+        for lower, upper, phys in ranges:
+            if lower <= value <= upper:
+                result.append(phys)
+                break
+        else:
+            result.append(default)
+    return np.array(result).astype(raw.dtype)
+
+
+class TestConversions(unittest.TestCase):
+
+    def test_rtab(self):
+        raw = np.random.RandomState(0).randint(0, 70, 1000).astype('<u4')
+        for ranges in ([(0, 10, 1), (11, 20, 2), (30, 40, 3)],
+                       # overlapping ranges: the first matching range wins
+                       [(0, 10, 1), (10, 20, 2), (5, 40, 3)],
+                       [(50, 60, 1), (0, 10, 2)],
+                       []):
+            compiled = CompiledConversion(rtab_conversion(ranges, 99))
+            for values in (raw, raw[:0]):
+                result = compiled.apply(values)
+                self.assertEqual(result.dtype, values.dtype)
+                self.assertTrue(np.array_equal(result, rtab_reference(values, ranges, 99)))
+
+    def test_trans(self):
+        pairs = [(b'a', b'A'), (b'bb', b'B'), (b'a', b'X'), (b'ccc', b'CC')]
+        conversion = {'conversion_type': CONVERSION_TYPE_TRANS, 'ref_param_nr': len(pairs) * 2 + 1}
+        texts = {'default_addr': {'text': b'def\0'}}
+        for i, (input_, output) in enumerate(pairs):
+            texts['input_{}_addr'.format(i)] = {'text': input_ + b'\0\0'}
+            texts['output_{}_addr'.format(i)] = {'text': output + b'\0'}
+        compiled = CompiledConversion(conversion, texts)
+        raw = np.array([b'a', b'bb', b'zz', b'ccc', b'a', b''], dtype='S4')
+        # the first matching input wins and unknown inputs get the default
+        self.assertEqual(compiled.apply(raw).tolist(), [b'A', b'B', b'def', b'CC', b'A', b'def'])
+        self.assertEqual(compiled.info['type'], CONVERSION_TYPE_TRANS)
+        self.assertEqual(len(compiled.apply(raw[:0])), 0)
+
+    def test_compile_once(self):
+        for conversion in (v3blocks.ChannelConversion(conversion_type=v3constants.CONVERSION_TYPE_LINEAR, a=0.5, b=2),
+                           v4blocks.ChannelConversion(conversion_type=CONVERSION_TYPE_LIN, a=0.5, b=2)):
+            compiled = conversion.compile()
+            self.assertIs(conversion.compile(), compiled)
+            raw = np.arange(100, dtype='<i2') - 50
+            self.assertTrue(np.allclose(compiled.apply(raw), raw * 0.5 + 2))
+
+    def test_compile_invalidated(self):
+        for conversion in (v3blocks.ChannelConversion(conversion_type=v3constants.CONVERSION_TYPE_LINEAR, a=0.5, b=2),
+                           v4blocks.ChannelConversion(conversion_type=CONVERSION_TYPE_LIN, a=0.5, b=2)):
+            compiled = conversion.compile()
+            conversion['a'] = 3
+            recompiled = conversion.compile()
+            self.assertIsNot(recompiled, compiled)
+            raw = np.arange(10, dtype='<u1')
+            self.assertTrue(np.allclose(recompiled.apply(raw), raw * 3 + 2))
+
+    def test_compile_other_texts(self):
+        for conversion in (v3blocks.ChannelConversion(conversion_type=v3constants.CONVERSION_TYPE_LINEAR, a=0.5, b=2),
+                           v4blocks.ChannelConversion(conversion_type=CONVERSION_TYPE_LIN, a=0.5, b=2)):
+            compiled = conversion.compile({})
+            self.assertIs(conversion.compile(None), compiled)
+            with self.assertRaises(MdfException):
+                conversion.compile({'text_0': b'A'})
+
+    def test_v3_algebraic(self):
+        # the exponential and logarithmic conversions are defined for X > 7.5
+        raw = np.arange(8, 100, dtype='<u2')
+        x = raw.astype(np.float64)
+        params = {'P{}'.format(i): float(i) for i in range(1, 8)}
+        for conv_type, kargs, expected in (
+                (v3constants.CONVERSION_TYPE_POLY, {},
+                 (2 - 4 * (x - 5 - 6)) / (3 * (x - 5 - 6) - 1)),
+                (v3constants.CONVERSION_TYPE_RAT, {},
+                 (x * x + 2 * x + 3) / (4 * x * x + 5 * x + 6)),
+                (v3constants.CONVERSION_TYPE_EXPO, {'P4': 0.0},
+                 np.log(((x - 7) * 6 - 3) / 1) / 2),
+                (v3constants.CONVERSION_TYPE_LOGH, {'P4': 0.0},
+                 np.exp(((x - 7) * 6 - 3) / 1) / 2),
+                (v3constants.CONVERSION_TYPE_FORMULA, {'formula': b'X1 * 2 + 1\x00'},
+                 x * 2 + 1)):
+            conversion = dict(params, conversion_type=conv_type, ref_param_nr=len(params), **kargs)
+            result = v3blocks.CompiledConversion(conversion).apply(raw)
+            self.assertTrue(np.allclose(result, expected), conv_type)
+
+    def test_v3_tabi(self):
+        conversion = {'conversion_type': v3constants.CONVERSION_TYPE_TABI, 'ref_param_nr': 3,
+                      'raw_0': 0, 'phys_0': 0., 'raw_1': 10, 'phys_1': 100., 'raw_2': 20, 'phys_2': 50.}
+        raw = np.array([-5, 0, 5, 10, 15, 20, 25], dtype='<i4')
+        result = v3blocks.CompiledConversion(conversion).apply(raw)
+        self.assertEqual(result.tolist(), [0, 0, 50, 100, 75, 50, 50])
+
+    def test_fused_bit_fields(self):
+        raw = np.arange(0, 5000, 7, dtype='<u2')
+        expected = ((raw >> 3) & 0x1F) * 0.5 + 2
+        for compiled in (v3blocks.CompiledConversion({'conversion_type': v3constants.CONVERSION_TYPE_LINEAR,
+                                                      'ref_param_nr': 2, 'a': 0.5, 'b': 2.0}),
+                         CompiledConversion({'conversion_type': CONVERSION_TYPE_LIN, 'a': 0.5, 'b': 2.0})):
+            for values in (raw, raw.astype('>u2'), raw.astype('<u8')):
+                self.assertTrue(np.allclose(compiled.apply(values, 3, 5), expected))
+
+            out = np.empty(len(raw), dtype=np.float32)
+            self.assertIs(compiled.apply(raw, 3, 5, out=out), out)
+            self.assertTrue(np.allclose(out, expected))
+            self.assertEqual(compiled.apply(raw, 3, 5, dtype=np.float32).dtype, np.float32)
+            self.assertEqual(len(compiled.apply(raw[:0], 3, 5)), 0)
+
+    def test_identity(self):
+        compiled = CompiledConversion({'conversion_type': CONVERSION_TYPE_LIN, 'a': 1, 'b': 0})
+        raw = np.arange(100, dtype='<u2')
+        result = compiled.apply(raw, 3, 5)
+        # the raw values keep their dtype
+        self.assertEqual(result.dtype, raw.dtype)
+        self.assertTrue(np.array_equal(result, (raw >> 3) & 0x1F))
+        self.assertEqual(compiled.apply(raw, dtype=np.float64).dtype, np.float64)
+
+    def test_raw_expression(self):
+        raw = np.zeros(1, dtype='<u2')
+        self.assertEqual(get_raw_expression('X', raw), 'X')
+        self.assertEqual(get_raw_expression('X', raw, 0, 16), 'X')
+        self.assertEqual(get_raw_expression('X', raw, 3, 5), '((X >> 3) % 32)')
+        # no fused masking for signed and 64 bit integers
+        self.assertIsNone(get_raw_expression('X', raw.astype('<i2'), 3, 5))
+        self.assertIsNone(get_raw_expression('X', raw.astype('<u8'), 3, 5))
+
+    def test_float_dtype(self):
+        raw = np.linspace(-1, 1, 101)
+        for compiled in (v3blocks.CompiledConversion({'conversion_type': v3constants.CONVERSION_TYPE_LINEAR,
+                                                      'ref_param_nr': 2, 'a': 0.5, 'b': 2.0}),
+                         CompiledConversion({'conversion_type': CONVERSION_TYPE_LIN, 'a': 0.5, 'b': 2.0})):
+            # float channels keep their dtype, integer channels become float64
+            for values, expected in ((raw.astype('<f4'), np.float32),
+                                     (raw.astype('>f4'), np.float32),
+                                     (raw, np.float64),
+                                     (np.arange(10, dtype='<i2'), np.float64)):
+                result = compiled.apply(values)
+                self.assertEqual(result.dtype, np.dtype(expected), values.dtype)
+                self.assertTrue(np.allclose(result, values.astype(np.float64) * 0.5 + 2, atol=1e-6))
+            self.assertEqual(compiled.apply(raw.astype('<f4'), dtype=np.float64).dtype, np.float64)
+
+    def test_float32_channel(self):
+        for version in ('3.20', '4.10'):
+            mdf = new_mdf(version)
+            mdf.append(get_test_signals2(), 'test')
+            gp_nr, ch_nr = mdf.channels_db['Cos']
+            if version == '3.20':
+                conversion = v3blocks.ChannelConversion(conversion_type=v3constants.CONVERSION_TYPE_LINEAR, a=2, b=1)
+            else:
+                conversion = v4blocks.ChannelConversion(conversion_type=CONVERSION_TYPE_LIN, a=2, b=1)
+            mdf.groups[gp_nr]['channel_conversions'][ch_nr] = conversion
+            samples = mdf.get('Cos').samples
+            self.assertEqual(samples.dtype, np.float32)
+            self.assertTrue(np.allclose(samples, get_test_signals2()[0].samples * 2 + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import DataCache
+
+from utils import generate_test_file, get_test_signals
+
+
+class TestDataCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_lru(self):
+        cache = DataCache(10)
+        token = object()
+        loads = []
+
+        def loader(data):
+            def load():
+                loads.append(data)
+                return data
+            return load
+
+        self.assertEqual(cache.get(1, token, loader(b'aaaa')), b'aaaa')
+        self.assertEqual(cache.get(1, token, loader(b'xxxx')), b'aaaa')
+        self.assertEqual(cache.get(2, token, loader(b'bbbb')), b'bbbb')
+        cache.get(1, token, loader(b'xxxx'))
+        # the least recently used item is dropped to stay in the byte budget
+        cache.get(3, token, loader(b'cccc'))
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 3, 'items': 2, 'size': 8, 'max_size': 10})
+        self.assertEqual(cache.get(2, token, loader(b'BBBB')), b'BBBB')
+
+        # items larger than the budget are not cached
+        cache.get(4, token, loader(b'd' * 11))
+        self.assertEqual(len(cache), 2)
+        # the cached item is reloaded if the source data changed
+        self.assertEqual(cache.get(2, object(), loader(b'2222')), b'2222')
+        self.assertEqual(loads, [b'aaaa', b'bbbb', b'cccc', b'BBBB', b'd' * 11, b'2222'])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(cache.misses, 6)
+
+    def test_compressed_data(self):
+        signals = get_test_signals()
+        for name in self.files:
+            with MDF(name, compression=True) as mdf:
+                for signal in signals:
+                    self.assertTrue(np.array_equal(mdf.get(signal.name).samples, signal.samples))
+                stats = mdf.data_cache.stats()
+                # the group data is decompressed once for the three channels
+                self.assertGreater(stats['hits'], 0)
+                self.assertGreater(stats['items'], 0)
+            self.assertEqual(mdf.data_cache.stats()['items'], 0)
+
+            with MDF(name, compression=True, data_cache_size=0) as mdf:
+                for signal in signals:
+                    self.assertTrue(np.array_equal(mdf.get(signal.name).samples, signal.samples))
+                self.assertEqual(mdf.data_cache.stats()['items'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
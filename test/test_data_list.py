@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import build_data_block_index, get_data_block_range
+
+from utils import generate_test_file, get_test_signals, get_test_signals2, make_data_list
+
+
+class TestDataList(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        src = generate_test_file(os.path.join(cls.tempdir, 'src.mf4'), '4.10')
+        # the blocks boundaries split records
+        cls.name = make_data_list(src, os.path.join(cls.tempdir, 'test.mf4'),
+                                  [5000, 7001, 4999], [None, 0, 1, None])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_read(self):
+        for kargs in ({}, {'load_measured_data': False}, {'load_measured_data': False, 'memory_map': True},
+                      {'compression': True}):
+            with MDF(self.name, **kargs) as mdf:
+                for signal in get_test_signals() + get_test_signals2():
+                    result = mdf.get(signal.name)
+                    self.assertTrue(np.array_equal(result.samples, signal.samples))
+                    self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+
+    def test_block_index(self):
+        with MDF(self.name, load_measured_data=False) as mdf:
+            gp = mdf.groups[0]
+            index = gp['data_block_index']
+            self.assertEqual(index['type'].tolist(), [b'DT', b'DZ', b'DZ', b'DT'])
+            self.assertEqual(index['size'][:3].tolist(), [5000, 7001, 4999])
+            self.assertEqual(index['offset'].tolist(), [0, 5000, 12001, 17000])
+            record_size = gp['channel_group']['samples_byte_nr']
+            self.assertEqual(int(index['size'].sum()), record_size * gp['channel_group']['cycles_nr'])
+
+    def test_build_index(self):
+        blocks = [(100, b'DT', 10), (200, b'DZ', 25), (300, b'DT', 5), (400, b'DT', 0), (500, b'DZ', 20)]
+        index = build_data_block_index(blocks, record_size=10)
+        self.assertEqual(index['offset'].tolist(), [0, 10, 35, 40, 40])
+        self.assertEqual(index['first_record'].tolist(), [0, 1, 3, 4, 4])
+        # records split between blocks are counted for both blocks
+        self.assertEqual(index['record_count'].tolist(), [1, 3, 1, 0, 2])
+        self.assertEqual(build_data_block_index(blocks)['record_count'].tolist(), [0] * 5)
+        self.assertEqual(len(build_data_block_index([])), 0)
+
+        for start, stop, addresses in ((0, 10, [100]), (5, 15, [100, 200]), (10, 35, [200]),
+                                       (34, 39, [200, 300]), (59, 60, [500]), (60, 60, [])):
+            self.assertEqual(get_data_block_range(index, start, stop)['address'].tolist(), addresses,
+                             (start, stop))
+
+
+if __name__ == '__main__':
+    unittest.main()
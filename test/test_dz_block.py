@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+import io
+import unittest
+import zlib
+
+import numpy as np
+
+from asammdf.utils import transpose_bytes
+from asammdf.v4blocks import DataZippedBlock
+from asammdf.v4constants import FLAG_DZ_DEFLATE, FLAG_DZ_TRANPOSED_DEFLATE
+
+
+def reference_transpose(data, rows, cols):
+    size = rows * cols
+    matrix = np.frombuffer(data[:size], dtype=np.uint8).reshape((rows, cols))
+    return matrix.T.tobytes() + data[size:]
+
+
+class TestDZBlock(unittest.TestCase):
+
+    def test_transpose_bytes(self):
+        rng = np.random.RandomState(0)
+        # small matrices, matrices larger than a tile and trailing bytes
+        for rows, cols, trailing in ((1, 1, 0), (7, 3, 2), (1000, 13, 5), (70000, 9, 0), (3, 50000, 7)):
+            data = rng.randint(0, 256, rows * cols + trailing).astype(np.uint8).tobytes()
+            result = transpose_bytes(data, rows, cols)
+            self.assertEqual(bytes(result), reference_transpose(data, rows, cols))
+
+            out = bytearray(len(data))
+            self.assertIs(transpose_bytes(memoryview(data), rows, cols, out), out)
+            self.assertEqual(bytes(out), reference_transpose(data, rows, cols))
+            # transposing back restores the data
+            self.assertEqual(bytes(transpose_bytes(bytes(result), cols, rows)), data)
+
+    def test_round_trip(self):
+        data = np.arange(10007, dtype=np.uint16).tobytes()
+        for zip_type, param in ((FLAG_DZ_DEFLATE, 0), (FLAG_DZ_TRANPOSED_DEFLATE, 14)):
+            block = DataZippedBlock(data=data, zip_type=zip_type, param=param)
+            self.assertEqual(block['original_size'], len(data))
+            if zip_type == FLAG_DZ_TRANPOSED_DEFLATE:
+                self.assertEqual(zlib.decompress(dict.__getitem__(block, 'data')),
+                                 reference_transpose(data, len(data) // param, param))
+            self.assertEqual(bytes(block['data']), data)
+
+            stream = io.BytesIO(bytes(block))
+            read = DataZippedBlock(address=0, file_stream=stream)
+            self.assertEqual(read['zip_type'], zip_type)
+            self.assertEqual(bytes(read['data']), data)
+            # the decompressed data is kept after the first access
+            self.assertIs(read['data'], read['data'])
+
+            out = bytearray(len(data))
+            read = DataZippedBlock(address=0, file_stream=stream)
+            self.assertIs(read.unzip(out), out)
+            self.assertEqual(bytes(out), data)
+            # the original data is decompressed into a view of a larger buffer
+            out = bytearray(len(data) + 10)
+            read.unzip(memoryview(out)[5: 5 + len(data)])
+            self.assertEqual(bytes(out[5: -5]), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
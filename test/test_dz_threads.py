@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+from multiprocessing.pool import ThreadPool
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF
+
+from utils import generate_test_file, get_test_signals, get_test_signals2, make_data_list
+
+
+class TestDZThreads(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        src = generate_test_file(os.path.join(cls.tempdir, 'src.mf4'), '4.10')
+        cls.name = make_data_list(src, os.path.join(cls.tempdir, 'test.mf4'),
+                                  [3001, 2000, 4000, 999, 5000], [0, 1, None, 0, 1, 1])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def check_signals(self, mdf):
+        for signal in get_test_signals() + get_test_signals2():
+            result = mdf.get(signal.name)
+            self.assertTrue(np.array_equal(result.samples, signal.samples))
+            self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+
+    def test_parallel_unzip(self):
+        for cpus, parallel in ((1, False), (4, True)):
+            for kargs in ({}, {'load_measured_data': False}):
+                with mock.patch('asammdf.mdf4.cpu_count', return_value=cpus), \
+                        mock.patch('asammdf.mdf4.ThreadPool', wraps=ThreadPool) as pool:
+                    with MDF(self.name, **kargs) as mdf:
+                        self.check_signals(mdf)
+                        # partial reads of the ##DZ blocks
+                        sin = mdf.get('Sin', start=0.1, stop=5.5)
+                        self.assertTrue(np.array_equal(sin.samples, get_test_signals()[1].samples[10: 551]))
+                    self.assertEqual(pool.called, parallel, (cpus, kargs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import MdfException
+
+from utils import generate_test_file, get_test_signals
+
+
+class TestFileHandle(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_read_after_close(self):
+        for name in self.files:
+            mdf = MDF(name, load_measured_data=False)
+            signal = get_test_signals()[1]
+            self.assertTrue(np.array_equal(mdf.get(signal.name).samples, signal.samples))
+            mdf.close()
+            self.assertRaises(MdfException, mdf.get, signal.name)
+
+    def test_unclosed_file_is_released(self):
+        options = [{'load_measured_data': False},
+                   {'load_measured_data': False, 'memory_map': True}]
+        for name in self.files:
+            for kargs in options:
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    mdf = MDF(name, **kargs)
+                    mdf.get('Sin')
+                    handle = mdf.file._file
+                    del mdf
+                    gc.collect()
+                self.assertTrue(handle.closed)
+                self.assertFalse([item for item in caught if issubclass(item.category, ResourceWarning)])
+
+    def test_unclosed_lazy_metadata_file_is_released(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            mdf = MDF(self.files[1], lazy_metadata=True)
+            handle = mdf.file._file
+            del mdf
+            gc.collect()
+        self.assertTrue(handle.closed)
+        self.assertFalse([item for item in caught if issubclass(item.category, ResourceWarning)])
+
+
+if __name__ == '__main__':
+    unittest.main()
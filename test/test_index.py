@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+import hmac
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from hashlib import sha256
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+import asammdf.mdf3
+import asammdf.mdf4
+from asammdf import MDF
+from asammdf.utils import (load_index, save_index, get_index_key, get_index_secret,
+                           INDEX_FORMAT_VERSION, INDEX_HEADER, INDEX_MAGIC)
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+class TestIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+        # the index files are signed with a secret of the test folder
+        cls.secret_patch = mock.patch('asammdf.utils.INDEX_SECRET_FILE',
+                                      os.path.join(cls.tempdir, 'secret', 'index.key'))
+        cls.secret_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.secret_patch.stop()
+        shutil.rmtree(cls.tempdir)
+
+    def tearDown(self):
+        for name in self.files:
+            if os.path.exists(name + '.idx'):
+                os.remove(name + '.idx')
+
+    def check_signals(self, mdf):
+        for signal in get_test_signals() + get_test_signals2():
+            result = mdf.get(signal.name)
+            self.assertTrue(np.array_equal(result.samples, signal.samples))
+            self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+            self.assertEqual(result.unit, signal.unit)
+
+    def open_counting_loads(self, name, **kargs):
+        """ open *name* with *use_index* and return the number of metadata
+        states loaded from the index """
+        module = asammdf.mdf4 if name.endswith('.mf4') else asammdf.mdf3
+        loaded = []
+
+        def counting_load_index(*args):
+            state = load_index(*args)
+            if state is not None:
+                loaded.append(state)
+            return state
+
+        with mock.patch.object(module, 'load_index', counting_load_index):
+            with MDF(name, use_index=True, **kargs) as mdf:
+                self.check_signals(mdf)
+        return len(loaded)
+
+    def test_index_reuse(self):
+        for name in self.files:
+            for load_measured_data in (True, False):
+                self.assertEqual(self.open_counting_loads(name, load_measured_data=load_measured_data), 0)
+                self.assertTrue(os.path.isfile(name + '.idx'))
+                self.assertEqual(self.open_counting_loads(name, load_measured_data=load_measured_data), 1)
+            # the index of the last option is rebuilt for the other option
+            self.assertEqual(self.open_counting_loads(name, load_measured_data=True), 0)
+
+    def test_stale_index(self):
+        for name in self.files:
+            self.open_counting_loads(name)
+            stat = os.stat(name)
+            os.utime(name, (stat.st_atime, stat.st_mtime + 10))
+            self.assertEqual(self.open_counting_loads(name), 0)
+            self.assertEqual(self.open_counting_loads(name), 1)
+
+    def test_corrupt_index(self):
+        for name in self.files:
+            self.open_counting_loads(name)
+            with open(name + '.idx', 'r+b') as index:
+                index.seek(os.path.getsize(name + '.idx') // 2)
+                index.truncate()
+            self.assertEqual(self.open_counting_loads(name), 0)
+            self.assertEqual(self.open_counting_loads(name), 1)
+
+    def test_options(self):
+        for name in self.files:
+            self.open_counting_loads(name)
+            for kargs in ({'memory_map': True}, {'compression': True}):
+                # an index saved under one mode is not used for another mode
+                self.assertEqual(self.open_counting_loads(name, **kargs), 0)
+                self.assertEqual(self.open_counting_loads(name, **kargs), 1)
+        name = self.files[1]
+        self.open_counting_loads(name, lazy_metadata=True)
+        self.assertEqual(self.open_counting_loads(name), 0)
+
+    def test_planted_index(self):
+        name = self.files[1]
+        executed = os.path.join(self.tempdir, 'executed')
+
+        class Payload(object):
+            def __reduce__(self):
+                return open, (executed, 'w')
+
+        key = get_index_key(name, load_measured_data=True, compression=False, memory_map=False, lazy_metadata=False)
+        state = pickle.dumps(Payload(), 2)
+        save_index(name, key, {})
+        # unsigned and validly signed payloads that call arbitrary callables
+        for signature in (b'\0' * 32, hmac.new(get_index_secret(), key + state, sha256).digest()):
+            with open(name + '.idx', 'wb') as index:
+                index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, signature, len(key), len(state)))
+                index.write(key)
+                index.write(state)
+            self.assertIsNone(load_index(name, key))
+            self.assertFalse(os.path.exists(executed))
+            self.assertEqual(self.open_counting_loads(name), 0)
+
+    def test_other_secret(self):
+        name = self.files[1]
+        self.open_counting_loads(name)
+        with mock.patch('asammdf.utils.INDEX_SECRET_FILE', os.path.join(self.tempdir, 'other', 'index.key')):
+            # an index signed by another user is rebuilt
+            self.assertEqual(self.open_counting_loads(name), 0)
+            self.assertEqual(self.open_counting_loads(name), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import LazyList, NOT_LOADED
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+class TestLazyMetadata(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.name = generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def tearDown(self):
+        if os.path.exists(self.name + '.idx'):
+            os.remove(self.name + '.idx')
+
+    def test_index_with_lazy_metadata(self):
+        for load_measured_data in (True, False):
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                with MDF(self.name, load_measured_data=load_measured_data, use_index=True, lazy_metadata=True):
+                    pass
+            self.assertTrue(os.path.isfile(self.name + '.idx'))
+
+            with MDF(self.name, load_measured_data=load_measured_data, use_index=True, lazy_metadata=True) as mdf:
+                for signal in get_test_signals() + get_test_signals2():
+                    result = mdf.get(signal.name)
+                    self.assertTrue(np.array_equal(result.samples, signal.samples))
+                    self.assertEqual(result.unit, signal.unit)
+            os.remove(self.name + '.idx')
+
+    def test_index_keeps_metadata_lazy(self):
+        for _ in range(2):
+            # the first open writes the index and the second one reads it
+            with MDF(self.name, use_index=True, lazy_metadata=True) as mdf:
+                for gp in mdf.groups:
+                    conversions = gp['channel_conversions']
+                    self.assertTrue(all(item is NOT_LOADED for item in list.__iter__(conversions)))
+
+                self.assertEqual(mdf.get('Sin').unit, 'v')
+                gp_nr, ch_nr = mdf.channels_db['Sin']
+                conversions = mdf.groups[gp_nr]['channel_conversions']
+                self.assertIsNot(list.__getitem__(conversions, ch_nr), NOT_LOADED)
+
+    def test_lazy_list_pickle(self):
+        loaded = []
+        items = LazyList(loaded.append, [1, NOT_LOADED])
+        items = pickle.loads(pickle.dumps(items, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(loaded, [])
+        self.assertIsInstance(items, LazyList)
+        self.assertIs(list.__getitem__(items, 1), NOT_LOADED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF
+
+from utils import generate_test_file, get_test_signals, get_test_signals2, new_mdf
+
+
+class TestMasterCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_cached_master(self):
+        for name in self.files:
+            for kargs in ({}, {'load_measured_data': False}):
+                with MDF(name, **kargs) as mdf:
+                    t = mdf.get_master_data(group=0)
+                    self.assertIs(mdf.get_master_data(group=0), t)
+                    self.assertIs(mdf.get_master_data(name='Sin'), t)
+                    self.assertTrue(np.array_equal(t, get_test_signals()[0].timestamps))
+                    # the cached timestamps are shared by the signals of the group
+                    self.assertFalse(t.flags.writeable)
+                    for signal in get_test_signals():
+                        self.assertTrue(np.array_equal(mdf.get(signal.name).timestamps, t))
+                mdf.close()
+                self.assertEqual(len(mdf._master_channel_cache), 0)
+
+    def test_cache_size(self):
+        for name in self.files:
+            module = 'asammdf.mdf4' if name.endswith('.mf4') else 'asammdf.mdf3'
+            with mock.patch(module + '.MASTER_CACHE_SIZE', 1):
+                with MDF(name) as mdf:
+                    t = mdf.get_master_data(group=0)
+                    t2 = mdf.get_master_data(group=1)
+                    self.assertEqual(list(mdf._master_channel_cache), [1])
+                    self.assertIsNot(mdf.get_master_data(group=0), t)
+                    self.assertTrue(np.array_equal(mdf.get_master_data(group=0), t))
+                    self.assertTrue(np.array_equal(t2, get_test_signals2()[0].timestamps))
+
+    def test_cache_cleared(self):
+        for version in ('3.20', '4.10'):
+            mdf = new_mdf(version)
+            mdf.append(get_test_signals(), 'test')
+            t = mdf.get_master_data(group=0)
+            mdf.append(get_test_signals2(), 'test2')
+            self.assertEqual(len(mdf._master_channel_cache), 0)
+            mdf.get_master_data(group=1)
+            mdf.remove(group=1)
+            self.assertEqual(len(mdf._master_channel_cache), 0)
+            self.assertTrue(np.array_equal(mdf.get_master_data(group=0), t))
+
+if __name__ == '__main__':
+    unittest.main()
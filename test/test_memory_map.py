@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+class TestMemoryMap(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+        cls.signals = get_test_signals() + get_test_signals2()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_mapped_views(self):
+        for name in self.files:
+            with MDF(name, load_measured_data=False, memory_map=True) as mdf:
+                for signal in self.signals:
+                    result = mdf.get(signal.name)
+                    self.assertTrue(np.array_equal(result.samples, signal.samples))
+                    self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+                    # zero-copy views into the memory map
+                    self.assertFalse(result.samples.flags.writeable)
+
+    def test_in_ram_data_is_writable(self):
+        # memory_map only applies to files opened with load_measured_data False
+        for name in self.files:
+            for kargs in ({'memory_map': True}, {'load_measured_data': False}):
+                with MDF(name, **kargs) as mdf:
+                    for signal in self.signals:
+                        result = mdf.get(signal.name)
+                        self.assertTrue(np.array_equal(result.samples, signal.samples))
+                        self.assertTrue(result.samples.flags.writeable)
+                        result.samples[0] = result.samples[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
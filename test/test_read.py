@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+class TestRead(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_read(self):
+        for name in self.files:
+            for kargs in ({}, {'load_measured_data': False}, {'compression': True}):
+                with MDF(name, **kargs) as mdf:
+                    self.assertEqual(len(mdf.groups), 2)
+                    for signal in get_test_signals() + get_test_signals2():
+                        result = mdf.get(signal.name)
+                        self.assertTrue(np.array_equal(result.samples, signal.samples))
+                        self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+                        self.assertEqual(result.unit, signal.unit)
+
+    def test_stream_fallback(self):
+        # the metadata blocks are parsed from the file stream if the file
+        # cannot be memory mapped
+        for name in self.files:
+            module = 'asammdf.mdf4' if name.endswith('.mf4') else 'asammdf.mdf3'
+            for kargs in ({}, {'load_measured_data': False}):
+                with MDF(name, **kargs) as mdf:
+                    with mock.patch(module + '.map_file', return_value=None):
+                        fallback = MDF(name, **kargs)
+                    with fallback:
+                        self.assertEqual(sorted(mdf.channels_db), sorted(fallback.channels_db))
+                        for gp, fallback_gp in zip(mdf.groups, fallback.groups):
+                            self.assertEqual(gp['channel_group'], fallback_gp['channel_group'])
+                            self.assertEqual(gp['channels'], fallback_gp['channels'])
+                        for channel_name in mdf.channels_db:
+                            result, expected = fallback.get(channel_name), mdf.get(channel_name)
+                            self.assertTrue(np.array_equal(result.samples, expected.samples))
+                            self.assertTrue(np.array_equal(result.timestamps, expected.timestamps))
+                            self.assertEqual(result.unit, expected.unit)
+
+
+if __name__ == '__main__':
+    unittest.main()
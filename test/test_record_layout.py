@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import RecordLayout
+
+from utils import generate_test_file, get_test_signals
+
+
+class TestRecordLayout(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_views(self):
+        records = np.zeros(10, dtype=[('a', '<u2'), ('b', '<f8'), ('c', '<u1'), ('d', 'S3')])
+        records['a'] = np.arange(10)
+        records['b'] = np.arange(10) * 0.5
+        records['c'] = np.arange(10) + 100
+        records['d'] = b'abc'
+        data = records.tobytes()
+        # the third channel is a bit field and the fourth one has no numpy dtype
+        layout = RecordLayout(records.itemsize,
+                              ['<u2', '<f8', '<u1', 'V3'],
+                              [0, 2, 10, 11],
+                              [None, None, (10, 0, 4, False, False), None],
+                              [None, None, (10, 0, 4, False, False), None])
+        self.assertEqual(layout.dtype.names, ('ch0', 'ch1', 'ch3'))
+        self.assertEqual(layout.dtype.itemsize, records.itemsize)
+
+        view = layout.get_records(data)
+        self.assertFalse(view.flags.writeable)
+        self.assertTrue(np.array_equal(layout.get_channel_view(data, 0), records['a']))
+        self.assertTrue(np.array_equal(layout.get_channel_view(data, 1), records['b']))
+        self.assertEqual(len(layout.get_records(data[:-1])), 9)
+
+    def test_group_layout(self):
+        for name in self.files:
+            for kargs in ({}, {'load_measured_data': False}):
+                with MDF(name, **kargs) as mdf:
+                    gp_nr, ch_nr = mdf.channels_db['Sin']
+                    layout = mdf.groups[gp_nr]['record_layout']
+                    self.assertIsInstance(layout, RecordLayout)
+                    self.assertEqual(layout.record_size, mdf.groups[gp_nr]['channel_group']['samples_byte_nr'])
+                    mdf.get('Sin')
+                    # the layout is built once when the file is opened
+                    self.assertIs(mdf.groups[gp_nr]['record_layout'], layout)
+
+        mdf = MDF(self.files[1])
+        mdf.append(get_test_signals(), 'appended')
+        self.assertIsInstance(mdf.groups[-1]['record_layout'], RecordLayout)
+        self.assertTrue(np.array_equal(mdf.get(group=len(mdf.groups) - 1, index=2).samples,
+                                       get_test_signals()[1].samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
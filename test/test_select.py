@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import MdfException
+
+from utils import generate_test_file, get_test_signals, get_test_signals2
+
+
+class TestSelect(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = [generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20'),
+                     generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_select(self):
+        expected = get_test_signals2() + get_test_signals()[::-1]
+        for name in self.files:
+            for kargs in ({}, {'load_measured_data': False}, {'compression': True}):
+                with MDF(name, **kargs) as mdf:
+                    channels = [signal.name for signal in expected]
+                    # channels can also be given as (group index, channel index) pairs
+                    channels[1] = mdf.channels_db['U8']
+                    signals = mdf.select(channels)
+                    self.assertEqual([signal.name for signal in signals], [signal.name for signal in expected])
+                    for signal, result in zip(expected, signals):
+                        single = mdf.get(signal.name)
+                        self.assertTrue(np.array_equal(result.samples, signal.samples))
+                        self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+                        self.assertEqual(result.samples.dtype, single.samples.dtype)
+                        self.assertEqual(result.unit, single.unit)
+
+    def test_select_master(self):
+        for name in self.files:
+            with MDF(name) as mdf:
+                gp_nr = mdf.channels_db['Sin'][0]
+                master, sin = mdf.select([(gp_nr, mdf.masters_db[gp_nr]), 'Sin'])
+                self.assertTrue(np.array_equal(master.samples, sin.timestamps))
+
+    def test_select_errors(self):
+        for name in self.files:
+            with MDF(name) as mdf:
+                self.assertRaises(MdfException, mdf.select, ['Sin', 'Missing'])
+                self.assertRaises(MdfException, mdf.select, [(len(mdf.groups), 0)])
+                self.assertRaises(MdfException, mdf.select, [(0, 100)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from asammdf import MDF
+
+from utils import generate_test_file
+
+
+def text_block(text):
+    text = text.encode('utf-8') + b'\0'
+    text += b'\0' * (-len(text) % 8)
+    return struct.pack('<4sI2Q', b'##TX', 0, 24 + len(text), 0) + text
+
+
+def add_shared_default_conversion(src, dst, names):
+    """ write a copy of *src* where the channels *names* use their own ##CC
+    value to text blocks that share the same default ##CC block; the unit
+    of the default conversion is the unit of its parents """
+    mdf = MDF(src)
+    with open(src, 'rb') as f:
+        raw = bytearray(f.read())
+
+    def append(block):
+        raw.extend(b'\0' * (-len(raw) % 8))
+        address = len(raw)
+        raw.extend(block)
+        return address
+
+    unit = append(text_block('km'))
+    default = append(struct.pack('<4sI2Q4Q2B3H4d', b'##CC', 0, 96, 4, 0, unit, 0, 0,
+                                 1, 0, 0, 0, 2, 0, 0, 0, 2))
+    for name in names:
+        text = append(text_block('zero'))
+        conv = append(struct.pack('<4sI2Q6Q2B3H3d', b'##CC', 0, 24 + 48 + 24 + 8, 6, 0, 0, 0, 0, text, default,
+                                  7, 0, 0, 2, 1, 0, 0, 0))
+        gp_nr, ch_nr = mdf.channels_db[name]
+        struct.pack_into('<Q', raw, mdf.groups[gp_nr]['channels'][ch_nr].address + 56, conv)
+
+    with open(dst, 'wb') as f:
+        f.write(bytes(raw))
+    return dst
+
+
+class TestSharedBlocks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.name = add_shared_default_conversion(generate_test_file(os.path.join(cls.tempdir, 'src.mf4'), '4.10'),
+                                                 os.path.join(cls.tempdir, 'test.mf4'),
+                                                 ['Int', 'U8'])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_shared_default_conversion_unit(self):
+        for kargs in ({}, {'load_measured_data': False}, {'lazy_metadata': True}):
+            with MDF(self.name, **kargs) as mdf:
+                for name in ('Int', 'U8'):
+                    self.assertEqual(mdf.get(name).unit, 'km')
+                self.assertEqual(mdf.get('Sin').unit, 'v')
+
+                # both parents reference the same default conversion object
+                defaults = []
+                for name in ('Int', 'U8'):
+                    gp_nr, ch_nr = mdf.channels_db[name]
+                    defaults.append(mdf.groups[gp_nr]['texts']['conversion_tab'][ch_nr]['default_addr'])
+                self.assertIs(defaults[0], defaults[1])
+                self.assertEqual(defaults[0]['unit_addr'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from asammdf import MDF
+
+from utils import generate_test_file, get_test_signals, get_test_signals2, make_data_list, make_unsorted
+
+
+RANGES = ((None, None), (0.1, 0.5), (None, 0.3), (0.7, None), (-5, 1e9), (0.25, 0.25), (2e3, 3e3), (0.5, 0.1),
+          # timestamps between two samples
+          (0.105, 0.495))
+
+
+class TestTimeRange(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        v3 = generate_test_file(os.path.join(cls.tempdir, 'test.mdf'), '3.20')
+        v4 = generate_test_file(os.path.join(cls.tempdir, 'test.mf4'), '4.10')
+        cls.files = [v3, v4,
+                     make_unsorted(v3, os.path.join(cls.tempdir, 'unsorted.mdf')),
+                     make_unsorted(v4, os.path.join(cls.tempdir, 'unsorted.mf4')),
+                     make_data_list(v4, os.path.join(cls.tempdir, 'data_list.mf4'),
+                                    [5000, 7001, 4999], [None, 0, 1, None])]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_time_range(self):
+        signals = get_test_signals() + get_test_signals2()
+        names = [signal.name for signal in signals]
+        for name in self.files:
+            for kargs in ({}, {'compression': True}, {'load_measured_data': False},
+                          {'load_measured_data': False, 'memory_map': True}):
+                with MDF(name, **kargs) as mdf:
+                    for start, stop in RANGES:
+                        selected = mdf.select(names, start=start, stop=stop)
+                        for signal, result in zip(signals, selected):
+                            mask = np.ones(len(signal), dtype=bool)
+                            if start is not None:
+                                mask &= signal.timestamps >= start
+                            if stop is not None:
+                                mask &= signal.timestamps <= stop
+                            self.assertTrue(np.array_equal(result.timestamps, signal.timestamps[mask]),
+                                            (name, kargs, start, stop))
+                            self.assertTrue(np.array_equal(result.samples, signal.samples[mask]))
+
+                            single = mdf.get(signal.name, start=start, stop=stop)
+                            self.assertTrue(np.array_equal(single.samples, result.samples))
+                            self.assertTrue(np.array_equal(single.timestamps, result.timestamps))
+                        # the time range reads must also work without the
+                        # cached master channels
+                        mdf._master_channel_cache.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
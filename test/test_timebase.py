@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy as np
+
+from asammdf.utils import UniformTimebase
+from asammdf.v4blocks import ChannelConversion
+from asammdf.v4constants import CHANNEL_TYPE_VIRTUAL_MASTER, CONVERSION_TYPE_LIN
+
+from utils import get_test_signals, new_mdf
+
+
+class TestUniformTimebase(unittest.TestCase):
+
+    def test_values(self):
+        t = UniformTimebase(0.5, 0.01, 1000)
+        expected = np.arange(1000, dtype=np.float64) * 0.01 + 0.5
+        self.assertEqual(len(t), 1000)
+        self.assertEqual(t.shape, (1000, ))
+        self.assertTrue(np.array_equal(np.asarray(t), expected))
+        self.assertEqual(t[10], expected[10])
+        self.assertEqual(t[-1], expected[-1])
+        self.assertRaises(IndexError, t.__getitem__, 1000)
+        self.assertTrue(np.array_equal(t[[1, 5]], expected[[1, 5]]))
+
+    def test_slices(self):
+        t = UniformTimebase(0.5, 0.01, 1000)
+        expected = np.asarray(t)
+        for index in (slice(10, 20), slice(None, None, 3), slice(100, 10, -7), slice(990, 2000)):
+            part = t[index]
+            self.assertIsInstance(part, UniformTimebase)
+            # the slices are identical to the slices of the materialized time base
+            self.assertTrue(np.array_equal(np.asarray(part), expected[index]))
+        self.assertTrue(np.array_equal(np.asarray(t[10:500][::4][3:]), expected[10:500][::4][3:]))
+
+    def test_searchsorted(self):
+        t = UniformTimebase(0.5, 0.01, 1000)
+        expected = np.asarray(t)
+        values = np.concatenate((expected[::7], expected[::11] + 0.003, [-1, 0.5, 100]))
+        for side in ('left', 'right'):
+            self.assertTrue(np.array_equal(np.searchsorted(t, values, side=side),
+                                           np.searchsorted(expected, values, side=side)))
+            self.assertEqual(t.searchsorted(expected[100], side=side),
+                             np.searchsorted(expected, expected[100], side=side))
+            part = t[5::3]
+            self.assertTrue(np.array_equal(part.searchsorted(values, side=side),
+                                           np.searchsorted(np.asarray(part), values, side=side)))
+
+    def test_virtual_master(self):
+        mdf = new_mdf('4.10')
+        mdf.append(get_test_signals(), 'test')
+        gp = mdf.groups[0]
+        time_idx = mdf.masters_db[0]
+        gp['channels'][time_idx]['channel_type'] = CHANNEL_TYPE_VIRTUAL_MASTER
+        gp['channel_conversions'][time_idx] = ChannelConversion(conversion_type=CONVERSION_TYPE_LIN, a=0.02, b=1.)
+        expected = np.arange(len(get_test_signals()[0]), dtype=np.float64) * 0.02 + 1
+
+        t = mdf.get_master_data(group=0, lazy_timebase=True)
+        self.assertIsInstance(t, UniformTimebase)
+        self.assertTrue(np.array_equal(np.asarray(t), expected))
+        self.assertTrue(np.array_equal(mdf.get_master_data(group=0), expected))
+        self.assertTrue(np.array_equal(mdf.get('Sin').timestamps, expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF
+from asammdf.utils import split_records, get_record_offsets, gather_records
+
+from utils import generate_test_file, get_test_signals, get_test_signals2, make_unsorted
+
+
+class TestUnsorted(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.files = []
+        for version, extension, record_id_lengths in (('3.20', 'mdf', (1, )), ('4.10', 'mf4', (1, 2, 8))):
+            src = generate_test_file(os.path.join(cls.tempdir, 'sorted.' + extension), version)
+            for record_id_len in record_id_lengths:
+                dst = os.path.join(cls.tempdir, 'unsorted{}.{}'.format(record_id_len, extension))
+                cls.files.append(make_unsorted(src, dst, record_id_len))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def tearDown(self):
+        for name in self.files:
+            if os.path.exists(name + '.idx'):
+                os.remove(name + '.idx')
+
+    def check_signals(self, mdf):
+        self.assertEqual(len(mdf.groups), 2)
+        for signal in get_test_signals() + get_test_signals2():
+            result = mdf.get(signal.name)
+            self.assertTrue(np.array_equal(result.samples, signal.samples))
+            self.assertTrue(np.array_equal(result.timestamps, signal.timestamps))
+
+    def test_read(self):
+        for name in self.files:
+            for kargs in ({}, {'compression': True}):
+                with MDF(name, **kargs) as mdf:
+                    self.check_signals(mdf)
+
+    def test_record_offsets(self):
+        for name in self.files:
+            module = 'asammdf.mdf4' if name.endswith('.mf4') else 'asammdf.mdf3'
+            with MDF(name, load_measured_data=False) as mdf:
+                self.assertIn('record_offsets', mdf.groups[0])
+                self.check_signals(mdf)
+            # positional reads if the file cannot be memory mapped
+            with mock.patch(module + '.map_file', return_value=None):
+                with MDF(name, load_measured_data=False) as mdf:
+                    self.check_signals(mdf)
+
+    def test_record_offsets_index(self):
+        for name in self.files:
+            for _ in range(2):
+                with MDF(name, load_measured_data=False, use_index=True) as mdf:
+                    self.assertIn('record_offsets', mdf.groups[1])
+                    self.check_signals(mdf)
+
+    def test_gather_records(self):
+        data = b'\x01abc\x02de\x01fgh\x02ij'
+        offsets = get_record_offsets(data, {1: 3, 2: 2})
+        self.assertEqual(offsets[1].tolist(), [1, 8])
+        self.assertEqual(gather_records(data, offsets[1], 3), b'abcfgh')
+        self.assertEqual(gather_records(data, offsets[2], 2), b'deij')
+
+        # data block at an offset in a larger buffer
+        offsets = get_record_offsets(b'head' + data, {1: 3, 2: 2}, offset=4, size=len(data))
+        self.assertEqual(gather_records(b'head' + data, offsets[2], 2, offset=4), b'deij')
+
+    def test_split_records(self):
+        records = {1: [b'abc', b'def'], 2: [b'0123456', b'789ABCD', b'EFGHIJK']}
+        for record_id_size, fmt in ((1, '<B'), (2, '<H'), (4, '<I'), (8, '<Q')):
+            data = []
+            for i in range(3):
+                for record_id, items in sorted(records.items()):
+                    if i < len(items):
+                        data.append(struct.pack(fmt, record_id) + items[i])
+            result = split_records(b''.join(data), {1: 3, 2: 7}, record_id_size)
+            self.assertEqual(result[1], b'abcdef')
+            self.assertEqual(result[2], b'0123456789ABCDEFGHIJK')
+
+    def test_split_vlsd_records(self):
+        data = (b'\x01abc' + b'\x02' + struct.pack('<I', 2) + b'xy' +
+                b'\x01def' + b'\x02' + struct.pack('<I', 0))
+        result = split_records(data, {1: 3, 2: 0})
+        self.assertEqual(result[1], b'abcdef')
+        self.assertEqual(result[2], struct.pack('<I', 2) + b'xy' + struct.pack('<I', 0))
+
+    def test_split_trailing_record_id(self):
+        data = b'\x01abc\x01\x02de\x02\x01fgh\x01'
+        result = split_records(data, {1: 3, 2: 2}, trailing_record_id=True)
+        self.assertEqual(result[1], b'abcfgh')
+        self.assertEqual(result[2], b'de')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import struct
+import unittest
+
+import numpy as np
+
+from asammdf.utils import decode_signal_data, VariableLengthArray
+
+
+VALUES = [b'abc', b'', b'hello world', b'x\0', u'ünï'.encode('utf-8')]
+
+
+def signal_data(values):
+    """ signal data and value offsets of *values* """
+    data, offsets = b'', []
+    for value in values:
+        offsets.append(len(data))
+        data += struct.pack('<I', len(value)) + value
+    return data, offsets
+
+
+class TestVLSD(unittest.TestCase):
+
+    def test_decode(self):
+        data, offsets = signal_data(VALUES)
+        # in order, reversed, repeated and empty offsets
+        for indexes in (range(len(VALUES)), range(len(VALUES))[::-1], [2, 2, 0], []):
+            indexes = list(indexes)
+            for dtype in ('<u4', '<u8'):
+                vals = decode_signal_data(data, np.array([offsets[i] for i in indexes], dtype=dtype))
+                self.assertIsInstance(vals, VariableLengthArray)
+                self.assertEqual(len(vals), len(indexes))
+                self.assertEqual(list(vals), [VALUES[i] for i in indexes])
+                self.assertEqual(vals.lengths.tolist(), [len(VALUES[i]) for i in indexes])
+                self.assertEqual(np.asarray(vals).shape, (len(indexes), ))
+
+    def test_conversions(self):
+        data, offsets = signal_data(VALUES)
+        vals = decode_signal_data(data, np.array(offsets, dtype='<u8'))
+        self.assertEqual(vals.as_bytes().tolist(), [value.rstrip(b'\0') for value in VALUES])
+        self.assertIs(vals.as_bytes(), vals.as_bytes())
+        self.assertEqual(vals.as_str()[-1], u'ünï')
+        self.assertEqual(vals[2], b'hello world')
+
+    def test_indexing(self):
+        data, offsets = signal_data(VALUES)
+        vals = decode_signal_data(data, np.array(offsets, dtype='<u8'))
+        self.assertEqual(vals[-1], VALUES[-1])
+        self.assertEqual(vals[-len(VALUES)], VALUES[0])
+        for index in (len(VALUES), -len(VALUES) - 1):
+            with self.assertRaises(IndexError):
+                vals[index]
+
+        for index in (slice(1, 3), slice(None, None, -2), slice(3, 1), slice(-2, None), [4, -5, 2]):
+            part = vals[index]
+            self.assertIsInstance(part, VariableLengthArray)
+            expected = VALUES[index] if isinstance(index, slice) else [VALUES[i] for i in index]
+            self.assertEqual(list(part), expected)
+            self.assertEqual(part.lengths.tolist(), [len(value) for value in expected])
+        self.assertEqual(list(vals[np.array([True, False, True, False, False])]), [VALUES[0], VALUES[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+helpers that generate the measurement files used by the tests
+"""
+import struct
+import zlib
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import numpy as np
+
+from asammdf import MDF, Signal
+
+
+CYCLES = 1000
+
+
+def get_test_signals(cycles=CYCLES):
+    """ signals of the first test channel group (10ms raster) """
+    t = np.arange(cycles, dtype=np.float64) * 0.01
+    return [Signal(samples=np.arange(cycles, dtype=np.int32) % 77, timestamps=t, unit='u', name='Int'),
+            Signal(samples=np.sin(t), timestamps=t, unit='v', name='Sin'),
+            Signal(samples=np.arange(cycles, dtype=np.uint8), timestamps=t, unit='', name='U8')]
+
+
+def get_test_signals2(cycles=CYCLES // 2):
+    """ signals of the second test channel group (20ms raster) """
+    t = np.arange(cycles, dtype=np.float64) * 0.02
+    return [Signal(samples=np.cos(t).astype(np.float32), timestamps=t, unit='x', name='Cos')]
+
+
+def new_mdf(version, **kargs):
+    """ new MDF object; the MDF version 3 header blocks store the login name
+    which is not available without a controlling terminal """
+    with mock.patch('os.getlogin', return_value='asammdf'):
+        return MDF(version=version, **kargs)
+
+
+def generate_test_file(name, version, signals=None):
+    """ write a sorted file with the two test channel groups or with a single
+    channel group of *signals* """
+    mdf = new_mdf(version)
+    if signals is None:
+        mdf.append(get_test_signals(), 'test')
+        mdf.append(get_test_signals2(), 'test2')
+    else:
+        mdf.append(signals, 'test')
+    mdf.save(name)
+    return name
+
+
+def make_unsorted(src, dst, record_id_len=1):
+    """ write a copy of the two channel groups test file *src* with the
+    records of both channel groups interleaved in a single data block """
+    mdf = MDF(src)
+    v4 = mdf.version.startswith('4')
+    gp1, gp2 = mdf.groups[0], mdf.groups[1]
+    data1, data2 = gp1['data_block']['data'], gp2['data_block']['data']
+    size1 = gp1['channel_group']['samples_byte_nr']
+    size2 = gp2['channel_group']['samples_byte_nr']
+    records1 = [data1[i: i + size1] for i in range(0, len(data1), size1)]
+    records2 = [data2[i: i + size2] for i in range(0, len(data2), size2)]
+    fmt = {1: '<B', 2: '<H', 4: '<I', 8: '<Q'}[record_id_len]
+    data = []
+    for i in range(max(len(records1), len(records2))):
+        if i < len(records1):
+            data.append(struct.pack(fmt, 1) + records1[i])
+        if i < len(records2):
+            data.append(struct.pack(fmt, 2) + records2[i])
+    data = b''.join(data)
+
+    with open(src, 'rb') as f:
+        raw = bytearray(f.read())
+    cg1, cg2 = gp1['channel_group'].address, gp2['channel_group'].address
+    address = len(raw)
+    if v4:
+        dg1 = gp1['data_group'].address
+        struct.pack_into('<Q', raw, dg1 + 24, 0)
+        struct.pack_into('<Q', raw, dg1 + 40, address)
+        struct.pack_into('<B', raw, dg1 + 56, record_id_len)
+        struct.pack_into('<Q', raw, cg1 + 24, cg2)
+        struct.pack_into('<Q', raw, cg1 + 72, 1)
+        struct.pack_into('<Q', raw, cg2 + 72, 2)
+        raw += struct.pack('<4sI2Q', b'##DT', 0, 24 + len(data), 0) + data
+    else:
+        dg1 = mdf.header['first_dg_addr']
+        struct.pack_into('<I', raw, dg1 + 4, 0)
+        struct.pack_into('<I', raw, dg1 + 16, address)
+        struct.pack_into('<HH', raw, dg1 + 20, 2, 1)
+        struct.pack_into('<I', raw, cg1 + 4, cg2)
+        struct.pack_into('<H', raw, cg1 + 16, 1)
+        struct.pack_into('<H', raw, cg2 + 16, 2)
+        raw += data
+    with open(dst, 'wb') as f:
+        f.write(bytes(raw))
+    return dst
+
+
+def make_data_list(src, dst, sizes, zip_types):
+    """ write a copy of the MDF version 4 file *src* with the data of the
+    first channel group split in ##DT and ##DZ blocks linked by a ##HL block
+    and two ##DL blocks
+
+    Parameters
+    ----------
+    sizes : list
+        byte size of each data block; the last block holds the rest
+    zip_types : list
+        *None* for a ##DT block or the ##DZ zip type for each data block
+
+    """
+    mdf = MDF(src)
+    gp = mdf.groups[0]
+    data = gp['data_block']['data']
+    record_size = gp['channel_group']['samples_byte_nr']
+    dg_addr = gp['data_group'].address
+
+    with open(src, 'rb') as f:
+        raw = bytearray(f.read())
+
+    def align():
+        raw.extend(b'\0' * (-len(raw) % 8))
+        return len(raw)
+
+    addresses = []
+    position = 0
+    for i, zip_type in enumerate(zip_types):
+        end = len(data) if i == len(zip_types) - 1 else position + sizes[i]
+        block = data[position: end]
+        position = end
+        addresses.append(align())
+        if zip_type is None:
+            raw += struct.pack('<4sI2Q', b'##DT', 0, 24 + len(block), 0) + block
+        else:
+            if zip_type:
+                lines = len(block) // record_size
+                shuffled = np.frombuffer(block[:lines * record_size], dtype=np.uint8).reshape((lines, record_size))
+                block_data = zlib.compress(shuffled.T.tobytes() + block[lines * record_size:])
+                param = record_size
+            else:
+                block_data = zlib.compress(block)
+                param = 0
+            raw += struct.pack('<4sI2Q2s2BI2Q', b'##DZ', 0, 48 + len(block_data), 0, b'DT',
+                               zip_type, 0, param, len(block), len(block_data)) + block_data
+
+    def data_list(links, next_dl=0):
+        address = align()
+        links_nr = len(links) + 1
+        raw.extend(struct.pack('<4sI2Q{}QB3sIQ'.format(links_nr), b'##DL', 0, 24 + 8 * links_nr + 16,
+                               links_nr, next_dl, *(list(links) + [0, b'\0' * 3, len(links), 0])))
+        return address
+
+    half = len(addresses) // 2
+    second = data_list(addresses[half:])
+    first = data_list(addresses[:half], second)
+    header_list = align()
+    raw += struct.pack('<4sI2QQHB5s', b'##HL', 0, 40, 1, first, 1, 0, b'\0' * 5)
+    struct.pack_into('<Q', raw, dg_addr + 40, header_list)
+
+    with open(dst, 'wb') as f:
+        f.write(bytes(raw))
+    return dst